@@ -0,0 +1,80 @@
+"""hot_query_indexes
+
+선적/Debit Note 주요 조회 패턴에 맞춘 복합/부분 인덱스
+- create_debit_note: client_id + status='ACTIVE' + delivery_date 범위 (+ shipment_type)
+- detect_duplicates: client_id + hbl/mbl/invoice_no/cd_no (CANCELLED 제외)
+- 목록 정렬: shipments.delivery_date, debit_notes.created_at
+- FK 조회: fee_details/lines/workflows/exports 의 부모 ID
+
+Revision ID: 3f4f8525d495
+Revises: 19aac71a7784
+Create Date: 2026-10-17 18:51:33.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f4f8525d495'
+down_revision: Union[str, None] = '19aac71a7784'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DUPLICATE_KEY_COLUMNS = ['hbl', 'mbl', 'invoice_no', 'cd_no']
+
+
+def upgrade() -> None:
+    # shipments
+    op.create_index(
+        'ix_shipments_active_client_delivery', 'shipments',
+        ['client_id', 'delivery_date', 'shipment_type'],
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+    op.create_index(
+        'ix_shipments_client_status_delivery', 'shipments',
+        ['client_id', 'status', 'delivery_date'],
+    )
+    op.create_index('ix_shipments_delivery_date', 'shipments', ['delivery_date', 'shipment_id'])
+    for column in DUPLICATE_KEY_COLUMNS:
+        op.create_index(
+            f'ix_shipments_client_{column}', 'shipments',
+            ['client_id', column],
+            postgresql_where=sa.text(f"status <> 'CANCELLED' AND {column} IS NOT NULL"),
+        )
+
+    # shipment_fee_details (라인 계산 일괄 로드 - index-only scan)
+    op.create_index(
+        'ix_shipment_fee_details_shipment_id', 'shipment_fee_details',
+        ['shipment_id'],
+        postgresql_include=['fee_item_id', 'amount_usd'],
+    )
+
+    # debit_notes
+    op.create_index('ix_debit_notes_created_at', 'debit_notes', ['created_at', 'debit_note_id'])
+    op.create_index('ix_debit_notes_client_created_at', 'debit_notes', ['client_id', 'created_at'])
+    op.create_index('ix_debit_notes_status_created_at', 'debit_notes', ['status', 'created_at'])
+
+    # debit_note 하위 테이블
+    op.create_index('ix_debit_note_lines_debit_note_id', 'debit_note_lines', ['debit_note_id', 'line_no'])
+    op.create_index('ix_debit_note_lines_shipment_id', 'debit_note_lines', ['shipment_id'])
+    op.create_index('ix_debit_note_workflows_debit_note_id', 'debit_note_workflows', ['debit_note_id', 'created_at'])
+    op.create_index('ix_debit_note_exports_debit_note_id', 'debit_note_exports', ['debit_note_id', 'exported_at'])
+    op.create_index('ix_duplicate_detections_shipment_id', 'duplicate_detections', ['shipment_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_duplicate_detections_shipment_id', table_name='duplicate_detections')
+    op.drop_index('ix_debit_note_exports_debit_note_id', table_name='debit_note_exports')
+    op.drop_index('ix_debit_note_workflows_debit_note_id', table_name='debit_note_workflows')
+    op.drop_index('ix_debit_note_lines_shipment_id', table_name='debit_note_lines')
+    op.drop_index('ix_debit_note_lines_debit_note_id', table_name='debit_note_lines')
+    op.drop_index('ix_debit_notes_status_created_at', table_name='debit_notes')
+    op.drop_index('ix_debit_notes_client_created_at', table_name='debit_notes')
+    op.drop_index('ix_debit_notes_created_at', table_name='debit_notes')
+    op.drop_index('ix_shipment_fee_details_shipment_id', table_name='shipment_fee_details')
+    for column in DUPLICATE_KEY_COLUMNS:
+        op.drop_index(f'ix_shipments_client_{column}', table_name='shipments')
+    op.drop_index('ix_shipments_delivery_date', table_name='shipments')
+    op.drop_index('ix_shipments_client_status_delivery', table_name='shipments')
+    op.drop_index('ix_shipments_active_client_delivery', table_name='shipments')
@@ -0,0 +1,35 @@
+"""reference_data_versions
+
+기준 데이터(비용 카테고리/항목, 거래처 템플릿/비용 매핑) 캐시 무효화용 테이블별 버전
+
+Revision ID: 6c1e0b9d2f47
+Revises: ddd2426efafd
+Create Date: 2026-10-17 23:12:09.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1e0b9d2f47'
+down_revision: Union[str, None] = 'ddd2426efafd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REFERENCE_TABLES = ('fee_categories', 'fee_items', 'client_templates', 'client_fee_mappings')
+
+
+def upgrade() -> None:
+    table = op.create_table(
+        'reference_data_versions',
+        sa.Column('table_name', sa.String(length=100), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+    op.bulk_insert(table, [{'table_name': name, 'version': 0} for name in REFERENCE_TABLES])
+
+
+def downgrade() -> None:
+    op.drop_table('reference_data_versions')
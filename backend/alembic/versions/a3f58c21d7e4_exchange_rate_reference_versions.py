@@ -0,0 +1,34 @@
+"""exchange_rate_reference_versions
+
+환율 결정 인덱스용 - exchange_rates / client_exchange_rates 를 기준 데이터 버전 관리 대상에 추가
+
+Revision ID: a3f58c21d7e4
+Revises: 6c1e0b9d2f47
+Create Date: 2026-10-18 10:41:27.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f58c21d7e4'
+down_revision: Union[str, None] = '6c1e0b9d2f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RATE_TABLES = ('exchange_rates', 'client_exchange_rates')
+
+versions = sa.table(
+    'reference_data_versions',
+    sa.column('table_name', sa.String),
+    sa.column('version', sa.BigInteger),
+)
+
+
+def upgrade() -> None:
+    op.bulk_insert(versions, [{'table_name': name, 'version': 0} for name in RATE_TABLES])
+
+
+def downgrade() -> None:
+    op.execute(versions.delete().where(versions.c.table_name.in_(RATE_TABLES)))
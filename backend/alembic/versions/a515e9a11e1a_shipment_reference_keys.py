@@ -0,0 +1,65 @@
+"""shipment_reference_keys
+
+중복 감지용 정규화 참조번호 테이블 (client_id, key_type, key_value)
+- 기존 선적의 HBL/MBL/INV/CD 키 backfill (공백 제거 + 대문자)
+- 중복 감지가 더 이상 shipments 컬럼을 직접 조회하지 않으므로 컬럼별 부분 인덱스 제거
+
+Revision ID: a515e9a11e1a
+Revises: 3f4f8525d495
+Create Date: 2026-10-17 19:20:12.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a515e9a11e1a'
+down_revision: Union[str, None] = '3f4f8525d495'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REFERENCE_FIELDS = {'HBL': 'hbl', 'MBL': 'mbl', 'INV': 'invoice_no', 'CD': 'cd_no'}
+
+
+def upgrade() -> None:
+    op.create_table('shipment_reference_keys',
+    sa.Column('key_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('shipment_id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('key_type', sa.String(length=20), nullable=False),
+    sa.Column('key_value', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.client_id'], ),
+    sa.ForeignKeyConstraint(['shipment_id'], ['shipments.shipment_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('key_id'),
+    sa.UniqueConstraint('shipment_id', 'key_type', name='uq_shipment_reference_keys_shipment_type')
+    )
+
+    # 기존 선적 backfill
+    for key_type, column in REFERENCE_FIELDS.items():
+        op.execute(f"""
+            INSERT INTO shipment_reference_keys (shipment_id, client_id, key_type, key_value)
+            SELECT shipment_id, client_id, '{key_type}', upper(regexp_replace({column}, '\\s+', '', 'g'))
+            FROM shipments
+            WHERE {column} IS NOT NULL AND regexp_replace({column}, '\\s+', '', 'g') <> ''
+        """)
+
+    op.create_index(
+        'ix_shipment_reference_keys_lookup', 'shipment_reference_keys',
+        ['client_id', 'key_type', 'key_value'],
+        postgresql_include=['shipment_id'],
+    )
+
+    for column in REFERENCE_FIELDS.values():
+        op.drop_index(f'ix_shipments_client_{column}', table_name='shipments')
+
+
+def downgrade() -> None:
+    for column in REFERENCE_FIELDS.values():
+        op.create_index(
+            f'ix_shipments_client_{column}', 'shipments',
+            ['client_id', column],
+            postgresql_where=sa.text(f"status <> 'CANCELLED' AND {column} IS NOT NULL"),
+        )
+    op.drop_index('ix_shipment_reference_keys_lookup', table_name='shipment_reference_keys')
+    op.drop_table('shipment_reference_keys')
@@ -0,0 +1,66 @@
+"""debit_note_batch_runs
+
+월말 일괄 DN 생성 실행 (debit_note_batch_runs) + 거래처별 결과 (debit_note_batch_run_items)
+
+Revision ID: c7d2e94b1a60
+Revises: a3f58c21d7e4
+Create Date: 2026-10-19 09:12:45.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e94b1a60'
+down_revision: Union[str, None] = 'a3f58c21d7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('debit_note_batch_runs',
+    sa.Column('run_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('period_from', sa.Date(), nullable=False),
+    sa.Column('period_to', sa.Date(), nullable=False),
+    sa.Column('sheet_type', sa.String(length=20), nullable=True),
+    sa.Column('client_batch', sa.String(length=20), nullable=True),
+    sa.Column('exchange_rate', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('total_clients', sa.Integer(), nullable=True),
+    sa.Column('processed_clients', sa.Integer(), nullable=True),
+    sa.Column('created_count', sa.Integer(), nullable=True),
+    sa.Column('skipped_count', sa.Integer(), nullable=True),
+    sa.Column('failed_count', sa.Integer(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('run_id')
+    )
+    op.create_index('ix_debit_note_batch_runs_created_at', 'debit_note_batch_runs', ['created_at'])
+
+    op.create_table('debit_note_batch_run_items',
+    sa.Column('item_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('debit_note_id', sa.Integer(), nullable=True),
+    sa.Column('total_lines', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.client_id'], ),
+    sa.ForeignKeyConstraint(['debit_note_id'], ['debit_notes.debit_note_id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['run_id'], ['debit_note_batch_runs.run_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('item_id'),
+    sa.UniqueConstraint('run_id', 'client_id', name='uq_debit_note_batch_run_items_run_client')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('debit_note_batch_run_items')
+    op.drop_index('ix_debit_note_batch_runs_created_at', table_name='debit_note_batch_runs')
+    op.drop_table('debit_note_batch_runs')
@@ -0,0 +1,32 @@
+"""export_content_hash
+
+Excel 출력 캐시 - debit_note_exports.content_hash (DN 내용/템플릿/생성기 버전 해시)
+같은 해시의 COMPLETED 출력이 있으면 파일을 재사용하고 ETag 로 사용
+
+Revision ID: ddd2426efafd
+Revises: a515e9a11e1a
+Create Date: 2026-10-17 21:05:47.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ddd2426efafd'
+down_revision: Union[str, None] = 'a515e9a11e1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('debit_note_exports', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(
+        'ix_debit_note_exports_content_hash', 'debit_note_exports',
+        ['debit_note_id', 'content_hash'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_debit_note_exports_content_hash', table_name='debit_note_exports')
+    op.drop_column('debit_note_exports', 'content_hash')
@@ -0,0 +1,27 @@
+"""export_job_claimed_at
+
+비동기 출력 작업 선점 시각 - debit_note_exports.claimed_at
+GENERATING 인 채 EXPORT_JOB_STALE_SECONDS 가 지난 작업(worker 중단)은 재전달 시 다시 선점
+
+Revision ID: e4b8a2c95f13
+Revises: c7d2e94b1a60
+Create Date: 2026-10-19 14:03:26.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8a2c95f13'
+down_revision: Union[str, None] = 'c7d2e94b1a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('debit_note_exports', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('debit_note_exports', 'claimed_at')
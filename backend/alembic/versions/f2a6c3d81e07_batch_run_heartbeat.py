@@ -0,0 +1,27 @@
+"""batch_run_heartbeat
+
+월말 일괄 생성 실행 진행 시각 - debit_note_batch_runs.heartbeat_at
+RUNNING 인 채 BATCH_RUN_STALE_SECONDS 동안 갱신이 없는 실행(worker 중단)은 재전달 시 다시 선점
+
+Revision ID: f2a6c3d81e07
+Revises: e4b8a2c95f13
+Create Date: 2026-10-19 14:48:52.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c3d81e07'
+down_revision: Union[str, None] = 'e4b8a2c95f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('debit_note_batch_runs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('debit_note_batch_runs', 'heartbeat_at')
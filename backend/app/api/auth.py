@@ -7,8 +7,9 @@ from sqlalchemy.orm import selectinload
 from jose import jwt, JWTError
 
 from app.core.database import get_db
+from app.core.principal_cache import Principal
 from app.core.security import (
-    verify_password, create_access_token, create_refresh_token,
+    verify_password_async, create_access_token, create_refresh_token,
     get_current_user, SECRET_KEY, ALGORITHM,
 )
 from app.models.user import User
@@ -24,7 +25,7 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(request.password, user.hashed_password):
+    if not user or not await verify_password_async(request.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -83,7 +84,7 @@ async def refresh_token(request: RefreshRequest, db: AsyncSession = Depends(get_
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: Principal = Depends(get_current_user)):
     return UserResponse(
         user_id=current_user.user_id,
         username=current_user.username,
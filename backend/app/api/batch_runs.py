@@ -0,0 +1,123 @@
+"""월말 일괄 DN 생성 API (FR-015 ~ FR-020 일괄 실행)
+
+- POST /api/v1/batch-runs → 기간 + 거래처 그룹(Client.batch) 실행 등록 (worker 에서 생성), 즉시 202
+- GET /api/v1/batch-runs → 실행 목록 (최근 순, 항목 제외)
+- GET /api/v1/batch-runs/{run_id} → 진행률 + 거래처별 결과 (CREATED/SKIPPED/FAILED)
+"""
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.database import get_db
+from app.core.permissions import require_permission
+from app.core.principal_cache import Principal
+from app.core.security import get_current_user
+from app.models.client import Client
+from app.models.debit_note import DebitNoteBatchRun, DebitNoteBatchRunItem
+from app.schemas.debit_note import BatchRunCreate, BatchRunListResponse, BatchRunResponse
+from app.services.batch_runs import enqueue_batch_run
+
+router = APIRouter(prefix="/api/v1/batch-runs", tags=["batch-runs"])
+
+
+async def _get_run(db: AsyncSession, run_id: int) -> DebitNoteBatchRun:
+    result = await db.execute(
+        select(DebitNoteBatchRun)
+        .options(selectinload(DebitNoteBatchRun.items))
+        .where(DebitNoteBatchRun.run_id == run_id)
+    )
+    run = result.scalar_one_or_none()
+    if not run:
+        raise HTTPException(status_code=404, detail="Batch run not found")
+    return run
+
+
+@router.post("", response_model=BatchRunResponse, status_code=202)
+async def create_batch_run(
+    data: BatchRunCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_permission("debit_note:create")),
+):
+    """일괄 생성 등록 - 대상 거래처별 PENDING 항목 기록 후 worker 에 전달
+
+    대상: 활성 거래처 중 client_ids 지정 시 해당 거래처, 아니면 client_batch 그룹 (없으면 전체).
+    거래처마다 단건 생성과 같은 규칙으로 DRAFT DN 을 만들며, 기간 내 ACTIVE 거래가 없으면 SKIPPED.
+    """
+    if data.period_from > data.period_to:
+        raise HTTPException(status_code=400, detail="period_from must not be after period_to")
+
+    query = select(Client.client_id).where(Client.is_active.is_(True))
+    if data.client_ids:
+        query = query.where(Client.client_id.in_(data.client_ids))
+    elif data.client_batch:
+        query = query.where(Client.batch == data.client_batch)
+    client_ids = (await db.execute(query.order_by(Client.client_code))).scalars().all()
+    if not client_ids:
+        raise HTTPException(status_code=400, detail="No active clients found for the batch run")
+
+    run = DebitNoteBatchRun(
+        period_from=data.period_from,
+        period_to=data.period_to,
+        sheet_type=data.sheet_type,
+        client_batch=data.client_batch,
+        exchange_rate=data.exchange_rate,
+        notes=data.notes,
+        status="PENDING",
+        total_clients=len(client_ids),
+        processed_clients=0,
+        created_count=0,
+        skipped_count=0,
+        failed_count=0,
+        created_by=current_user.user_id,
+    )
+    db.add(run)
+    await db.flush()
+    await db.execute(insert(DebitNoteBatchRunItem), [
+        {"run_id": run.run_id, "client_id": client_id, "status": "PENDING"} for client_id in client_ids
+    ])
+    await db.commit()  # worker 가 읽기 전에 커밋
+
+    try:
+        enqueue_batch_run(run.run_id, background_tasks)
+    except Exception as e:
+        run.status = "FAILED"
+        run.error_message = f"Batch queue unavailable: {e}"
+        await db.commit()
+        raise HTTPException(status_code=503, detail="일괄 생성 작업 큐에 연결할 수 없습니다")
+
+    return await _get_run(db, run.run_id)
+
+
+@router.get("", response_model=BatchRunListResponse)
+async def list_batch_runs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    status: str = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """일괄 생성 실행 목록 (최근 순, 거래처별 결과는 GET /{run_id})"""
+    query = select(DebitNoteBatchRun)
+    count_query = select(func.count(DebitNoteBatchRun.run_id))
+    if status:
+        query = query.where(DebitNoteBatchRun.status == status)
+        count_query = count_query.where(DebitNoteBatchRun.status == status)
+
+    total = (await db.execute(count_query)).scalar()
+    result = await db.execute(
+        query.order_by(DebitNoteBatchRun.created_at.desc(), DebitNoteBatchRun.run_id.desc())
+        .offset(skip).limit(limit)
+    )
+    return BatchRunListResponse(total=total, items=result.scalars().all())
+
+
+@router.get("/{run_id}", response_model=BatchRunResponse)
+async def get_batch_run(
+    run_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """일괄 생성 진행률 (processed_clients / total_clients) + 거래처별 결과"""
+    return await _get_run(db, run_id)
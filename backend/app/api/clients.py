@@ -4,8 +4,9 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.permissions import require_permission
+from app.core.principal_cache import Principal
 from app.core.security import get_current_user, require_role
-from app.models.user import User
 from app.models.client import Client
 from app.schemas.client import ClientCreate, ClientUpdate, ClientResponse, ClientListResponse
 
@@ -19,7 +20,7 @@ async def list_clients(
     search: str = Query(None),
     is_active: bool = Query(None),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     query = select(Client)
     count_query = select(func.count(Client.client_id))
@@ -48,7 +49,7 @@ async def list_clients(
 async def get_client(
     client_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(select(Client).where(Client.client_id == client_id))
     client = result.scalar_one_or_none()
@@ -61,7 +62,7 @@ async def get_client(
 async def create_client(
     data: ClientCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "accountant")),
+    current_user: Principal = Depends(require_permission("client:create")),
 ):
     # Check duplicate code
     existing = await db.execute(select(Client).where(Client.client_code == data.client_code))
@@ -80,7 +81,7 @@ async def update_client(
     client_id: int,
     data: ClientUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "accountant")),
+    current_user: Principal = Depends(require_permission("client:update")),
 ):
     result = await db.execute(select(Client).where(Client.client_id == client_id))
     client = result.scalar_one_or_none()
@@ -100,7 +101,7 @@ async def update_client(
 async def delete_client(
     client_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
 ):
     result = await db.execute(select(Client).where(Client.client_id == client_id))
     client = result.scalar_one_or_none()
@@ -6,98 +6,53 @@
 - BE = SUM(Z:AT) * 환율 * 8% → vat_amount (현지비용만 VAT)
 - BF = BD + BE → grand_total_vnd
 """
-from datetime import date, datetime
-from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
-from app.core.security import get_current_user, require_role
-from app.models.user import User
+from app.core.pagination import (
+    COUNT_MODE_PATTERN, count_rows, decode_cursor, encode_cursor, keyset_after, keyset_order, parse_datetime,
+)
+from app.core.permissions import check_permission, require_permission
+from app.core.principal_cache import Principal
+from app.core.security import check_role, get_current_user, require_role
 from app.models.client import Client
-from app.models.shipment import Shipment, ShipmentFeeDetail
-from app.models.fee import FeeItem
 from app.models.debit_note import DebitNote, DebitNoteLine, DebitNoteWorkflow
 from app.schemas.debit_note import (
     DebitNoteCreate, DebitNoteResponse, DebitNoteListResponse,
-    DebitNoteLineResponse, WorkflowAction, DebitNoteWorkflowResponse,
+    DebitNoteLineResponse, DebitNoteLinePage, WorkflowAction, DebitNoteWorkflowResponse,
+    BulkWorkflowAction, BulkWorkflowResponse,
 )
+from app.services.debit_note_builder import build_debit_note
+from app.services.debit_note_workflow import apply_bulk_transition, apply_transition
 
 router = APIRouter(prefix="/api/v1/debit-notes", tags=["debit-notes"])
 
-VAT_RATE = Decimal("0.08")
-
-
-def generate_debit_note_number(debit_note_id: int) -> str:
-    """DN-YYYYMM-XXXXX 형식 자동 생성"""
-    now = date.today()
-    return f"DN-{now.strftime('%Y%m')}-{debit_note_id:05d}"
-
-
-async def calculate_line(
-    shipment: Shipment,
-    exchange_rate: Decimal,
-    db: AsyncSession,
-) -> dict:
-    """선적 1건의 비용 계산 (NEXCON 기술사양서 수식 체계)
-
-    IMPORT:
-      BC = SUM(M:AT)  → freight + local charges
-      BD = BC * 환율
-      BE = SUM(Z:AT) * 환율 * 8%   (현지비용만 VAT)
-      BF = BD + BE
-    """
-    # fee_details 로드
-    result = await db.execute(
-        select(ShipmentFeeDetail)
-        .options(selectinload(ShipmentFeeDetail.fee_item))
-        .where(ShipmentFeeDetail.shipment_id == shipment.shipment_id)
-    )
-    fee_details = result.scalars().all()
-
-    freight_usd = Decimal("0")
-    local_charges_usd = Decimal("0")
-    pay_on_behalf = Decimal("0")
-
-    for fd in fee_details:
-        amount = fd.amount_usd or Decimal("0")
-        if fd.fee_item and fd.fee_item.item_code == "PAY_ON_BEHALF":
-            pay_on_behalf += amount
-        elif fd.fee_item and not fd.fee_item.is_vat_applicable:
-            freight_usd += amount  # Freight (VAT 0%)
-        else:
-            local_charges_usd += amount  # Local charges (VAT 8%)
-
-    total_usd = freight_usd + local_charges_usd + pay_on_behalf  # BC
-    total_vnd = int(total_usd * exchange_rate)  # BD
-    vat_amount = int(local_charges_usd * exchange_rate * VAT_RATE)  # BE
-    grand_total_vnd = total_vnd + vat_amount  # BF
+# 응답 view (목록 / 워크플로우 전이) - summary 는 헤더만 (라인은 GET /{id}/lines)
+VIEW_PATTERN = "^(full|summary)$"
 
-    return {
-        "total_usd": total_usd,
-        "total_vnd": total_vnd,
-        "vat_amount": vat_amount,
-        "grand_total_vnd": grand_total_vnd,
-        "freight_usd": freight_usd,
-        "local_charges_usd": local_charges_usd,
-        "pay_on_behalf": pay_on_behalf,
-    }
+# 승인/거절 가능 역할 (단건/일괄 공통)
+APPROVER_ROLES = ("admin", "accountant", "pic")
+# 일괄 처리 동작 → 필요 권한 (없는 동작은 APPROVER_ROLES 로 확인)
+BULK_ACTION_PERMISSIONS = {"submit": "debit_note:submit_review"}
 
 
 @router.post("", response_model=DebitNoteResponse, status_code=201)
 async def create_debit_note(
     data: DebitNoteCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "accountant")),
+    current_user: Principal = Depends(require_permission("debit_note:create")),
 ):
     """Debit Note 생성 (FR-015, FR-020)
 
     1. 거래처별 거래 필터링
-    2. 환율 적용 및 계산
-    3. DRAFT 상태 생성
+    2. 환율 적용 및 계산 (환율 미지정 시 거래처 환율 → 일반 환율 순으로 period_to 기준 결정)
+    3. DRAFT 상태 생성, 라인 선적은 UPDATE 1회로 BILLED
+       (그 사이 다른 DN 이 선적을 청구했으면 409 - 다시 요청하면 남은 선적으로 생성)
+    생성 로직은 app.services.debit_note_builder (월말 일괄 생성과 공유)
     """
     # 거래처 확인
     client = (await db.execute(
@@ -106,81 +61,9 @@ async def create_debit_note(
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    # 거래처별 기간 내 ACTIVE 거래 필터링 (FR-015)
-    shipment_query = select(Shipment).where(
-        Shipment.client_id == data.client_id,
-        Shipment.status == "ACTIVE",
-        Shipment.delivery_date >= data.period_from,
-        Shipment.delivery_date <= data.period_to,
-    )
-    if data.sheet_type != "ALL":
-        shipment_query = shipment_query.where(Shipment.shipment_type == data.sheet_type)
-
-    result = await db.execute(shipment_query.order_by(Shipment.delivery_date))
-    shipments = result.scalars().all()
-
-    if not shipments:
+    debit_note = await build_debit_note(db, data, client, current_user.user_id)
+    if debit_note is None:
         raise HTTPException(status_code=400, detail="No active shipments found for the given period")
-
-    # Debit Note 헤더 생성
-    debit_note = DebitNote(
-        client_id=data.client_id,
-        period_from=data.period_from,
-        period_to=data.period_to,
-        exchange_rate=data.exchange_rate,
-        sheet_type=data.sheet_type,
-        status="DRAFT",
-        created_by=current_user.user_id,
-        notes=data.notes,
-    )
-    db.add(debit_note)
-    await db.flush()
-
-    # 자동 번호 생성
-    debit_note.debit_note_number = generate_debit_note_number(debit_note.debit_note_id)
-
-    # 라인별 계산 (FR-016 ~ FR-019)
-    sum_usd = Decimal("0")
-    sum_vnd = Decimal("0")
-    sum_vat = Decimal("0")
-    sum_grand = Decimal("0")
-
-    for idx, shipment in enumerate(shipments, 1):
-        calc = await calculate_line(shipment, data.exchange_rate, db)
-
-        line = DebitNoteLine(
-            debit_note_id=debit_note.debit_note_id,
-            shipment_id=shipment.shipment_id,
-            line_no=idx,
-            **calc,
-        )
-        db.add(line)
-
-        sum_usd += calc["total_usd"]
-        sum_vnd += calc["total_vnd"]
-        sum_vat += calc["vat_amount"]
-        sum_grand += calc["grand_total_vnd"]
-
-        # 거래 상태를 BILLED로 변경
-        shipment.status = "BILLED"
-
-    # 헤더 합계 업데이트 (FR-018)
-    debit_note.total_usd = sum_usd
-    debit_note.total_vnd = sum_vnd
-    debit_note.total_vat = sum_vat
-    debit_note.grand_total_vnd = sum_grand
-    debit_note.total_lines = len(shipments)
-
-    # 워크플로우 기록
-    workflow = DebitNoteWorkflow(
-        debit_note_id=debit_note.debit_note_id,
-        action="CREATED",
-        from_status=None,
-        to_status="DRAFT",
-        performed_by=current_user.user_id,
-    )
-    db.add(workflow)
-
     await db.commit()
 
     # Reload
@@ -202,39 +85,65 @@ async def list_debit_notes(
     status: str = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN),
+    view: str = Query("full", pattern=VIEW_PATTERN, description="summary: 라인 제외 헤더만"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    query = select(DebitNote).options(selectinload(DebitNote.lines))
-    count_query = select(func.count(DebitNote.debit_note_id))
+    """DN 목록 - (created_at, debit_note_id) 역순, cursor 로 keyset 페이지네이션
 
+    view=summary 는 debit_notes 헤더 컬럼 + 거래처명만 조회하고 lines=None 으로 응답한다.
+    라인은 GET /{id} 또는 GET /{id}/lines (페이지) 로 조회.
+    """
+    filters = []
     if client_id:
-        query = query.where(DebitNote.client_id == client_id)
-        count_query = count_query.where(DebitNote.client_id == client_id)
+        filters.append(DebitNote.client_id == client_id)
     if status:
-        query = query.where(DebitNote.status == status)
-        count_query = count_query.where(DebitNote.status == status)
+        filters.append(DebitNote.status == status)
 
-    total = (await db.execute(count_query)).scalar()
-    result = await db.execute(
-        query.order_by(DebitNote.created_at.desc()).offset(skip).limit(limit)
-    )
-    debit_notes = result.scalars().unique().all()
+    total = await count_rows(db, select(DebitNote.debit_note_id).where(*filters), "debit_notes", count)
+
+    if view == "summary":
+        query = (
+            select(*DebitNote.__table__.columns, Client.client_name)
+            .join(Client, Client.client_id == DebitNote.client_id)
+        )
+    else:
+        query = select(DebitNote).options(selectinload(DebitNote.lines))
+    query = query.where(*filters).order_by(*keyset_order(DebitNote.created_at, DebitNote.debit_note_id))
+    if cursor:
+        created_at, debit_note_id = decode_cursor(cursor, parse_datetime)
+        query = keyset_after(query, DebitNote.created_at, DebitNote.debit_note_id, created_at, debit_note_id)
+    else:
+        query = query.offset(skip)
+    # limit + 1 건 조회로 다음 페이지 존재 여부 확인
+    result = await db.execute(query.limit(limit + 1))
+    debit_notes = result.all() if view == "summary" else result.scalars().unique().all()
+
+    next_cursor = None
+    if len(debit_notes) > limit:
+        debit_notes = debit_notes[:limit]
+        last = debit_notes[-1]
+        next_cursor = encode_cursor(last.created_at, last.debit_note_id)
 
     items = []
     for dn in debit_notes:
         resp = DebitNoteResponse.model_validate(dn)
-        resp.lines = [DebitNoteLineResponse.model_validate(l) for l in dn.lines]
+        if view == "summary":
+            resp.lines = None
+        else:
+            resp.lines = [DebitNoteLineResponse.model_validate(l) for l in dn.lines]
         items.append(resp)
 
-    return DebitNoteListResponse(total=total, items=items)
+    return DebitNoteListResponse(total=total, items=items, next_cursor=next_cursor)
 
 
 @router.get("/{debit_note_id}", response_model=DebitNoteResponse)
 async def get_debit_note(
     debit_note_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(
         select(DebitNote).options(selectinload(DebitNote.lines))
@@ -249,136 +158,132 @@ async def get_debit_note(
     return resp
 
 
+async def _workflow_response(db: AsyncSession, header, view: str) -> DebitNoteResponse:
+    """전이 결과 헤더 행 → 응답 (view=full 이면 라인 조회)"""
+    resp = DebitNoteResponse.model_validate(header)
+    resp.lines = None
+    if view == "full":
+        lines = (await db.execute(
+            select(DebitNoteLine)
+            .where(DebitNoteLine.debit_note_id == header.debit_note_id)
+            .order_by(DebitNoteLine.line_no, DebitNoteLine.line_id)
+        )).scalars()
+        resp.lines = [DebitNoteLineResponse.model_validate(l) for l in lines]
+    return resp
+
+
 @router.post("/{debit_note_id}/submit-for-review", response_model=DebitNoteResponse)
 async def submit_for_review(
     debit_note_id: int,
     body: WorkflowAction = WorkflowAction(),
+    view: str = Query("summary", pattern=VIEW_PATTERN, description="full: 라인 포함"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "accountant")),
+    current_user: Principal = Depends(require_permission("debit_note:submit_review")),
 ):
     """검토 제출 (DRAFT → PENDING_REVIEW)"""
-    result = await db.execute(
-        select(DebitNote).options(selectinload(DebitNote.lines))
-        .where(DebitNote.debit_note_id == debit_note_id)
-    )
-    dn = result.scalar_one_or_none()
-    if not dn:
-        raise HTTPException(status_code=404, detail="Debit Note not found")
-    if dn.status != "DRAFT":
-        raise HTTPException(status_code=400, detail=f"Cannot submit: current status is {dn.status}")
-
-    dn.status = "PENDING_REVIEW"
-
-    workflow = DebitNoteWorkflow(
-        debit_note_id=dn.debit_note_id,
-        action="SUBMITTED",
-        from_status="DRAFT",
-        to_status="PENDING_REVIEW",
-        performed_by=current_user.user_id,
-        comment=body.comment,
-    )
-    db.add(workflow)
+    header = await apply_transition(db, debit_note_id, "submit", current_user.user_id, body.comment)
     await db.commit()
-    await db.refresh(dn)
-
-    resp = DebitNoteResponse.model_validate(dn)
-    resp.lines = [DebitNoteLineResponse.model_validate(l) for l in dn.lines]
-    return resp
+    return await _workflow_response(db, header, view)
 
 
 @router.post("/{debit_note_id}/approve", response_model=DebitNoteResponse)
 async def approve_debit_note(
     debit_note_id: int,
     body: WorkflowAction = WorkflowAction(),
+    view: str = Query("summary", pattern=VIEW_PATTERN, description="full: 라인 포함"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "accountant", "pic")),
+    current_user: Principal = Depends(require_role(*APPROVER_ROLES)),
 ):
     """승인 (PENDING_REVIEW → APPROVED) - 생성자 ≠ 승인자 (이중 승인)"""
-    result = await db.execute(
-        select(DebitNote).options(selectinload(DebitNote.lines))
-        .where(DebitNote.debit_note_id == debit_note_id)
-    )
-    dn = result.scalar_one_or_none()
-    if not dn:
-        raise HTTPException(status_code=404, detail="Debit Note not found")
-    if dn.status != "PENDING_REVIEW":
-        raise HTTPException(status_code=400, detail=f"Cannot approve: current status is {dn.status}")
-    if dn.created_by == current_user.user_id:
-        raise HTTPException(status_code=400, detail="Creator cannot approve their own Debit Note")
-
-    dn.status = "APPROVED"
-    dn.approved_by = current_user.user_id
-    dn.approved_at = datetime.utcnow()
-
-    workflow = DebitNoteWorkflow(
-        debit_note_id=dn.debit_note_id,
-        action="APPROVED",
-        from_status="PENDING_REVIEW",
-        to_status="APPROVED",
-        performed_by=current_user.user_id,
-        comment=body.comment,
-    )
-    db.add(workflow)
+    header = await apply_transition(db, debit_note_id, "approve", current_user.user_id, body.comment)
     await db.commit()
-    await db.refresh(dn)
-
-    resp = DebitNoteResponse.model_validate(dn)
-    resp.lines = [DebitNoteLineResponse.model_validate(l) for l in dn.lines]
-    return resp
+    return await _workflow_response(db, header, view)
 
 
 @router.post("/{debit_note_id}/reject", response_model=DebitNoteResponse)
 async def reject_debit_note(
     debit_note_id: int,
     body: WorkflowAction,
+    view: str = Query("summary", pattern=VIEW_PATTERN, description="full: 라인 포함"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "accountant", "pic")),
+    current_user: Principal = Depends(require_role(*APPROVER_ROLES)),
 ):
-    """거절 (PENDING_REVIEW → REJECTED)"""
-    result = await db.execute(
-        select(DebitNote).options(selectinload(DebitNote.lines))
-        .where(DebitNote.debit_note_id == debit_note_id)
+    """거절 (PENDING_REVIEW → REJECTED) - 라인 선적은 ACTIVE 로 복원"""
+    header = await apply_transition(db, debit_note_id, "reject", current_user.user_id, body.comment)
+    await db.commit()
+    return await _workflow_response(db, header, view)
+
+
+@router.post("/bulk-workflow", response_model=BulkWorkflowResponse)
+async def bulk_workflow_action(
+    data: BulkWorkflowAction,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """여러 DN 일괄 검토 제출/승인/거절 - DN 별 결과 반환 (월말 일괄 승인)
+
+    권한은 단건 API 와 같다. (submit: debit_note:submit_review, approve/reject: admin/accountant/pic)
+    적용할 수 없는 DN(상태 불일치, 자가 승인, 없음)은 FAILED 로 기록하고 나머지는 처리한다.
+    """
+    permission = BULK_ACTION_PERMISSIONS.get(data.action)
+    if permission:
+        await check_permission(db, current_user, permission)
+    else:
+        check_role(current_user, *APPROVER_ROLES)
+
+    results = await apply_bulk_transition(db, data.debit_note_ids, data.action, current_user.user_id, data.comment)
+    await db.commit()
+
+    applied = sum(1 for r in results if r.result == "APPLIED")
+    return BulkWorkflowResponse(
+        action=data.action,
+        total=len(results),
+        applied=applied,
+        failed=len(results) - applied,
+        results=results,
     )
-    dn = result.scalar_one_or_none()
+
+
+@router.get("/{debit_note_id}/lines", response_model=DebitNoteLinePage)
+async def list_debit_note_lines(
+    debit_note_id: int,
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: str = Query(None, description="이전 응답의 next_cursor"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """DN 라인 페이지 조회 - (debit_note_id, line_no) 인덱스 범위 스캔"""
+    dn = await db.get(DebitNote, debit_note_id)
     if not dn:
         raise HTTPException(status_code=404, detail="Debit Note not found")
-    if dn.status != "PENDING_REVIEW":
-        raise HTTPException(status_code=400, detail=f"Cannot reject: current status is {dn.status}")
-
-    dn.status = "REJECTED"
-    dn.rejection_reason = body.comment
 
-    # REJECTED 시 관련 거래를 다시 ACTIVE로 복원
-    for line in dn.lines:
-        shipment_result = await db.execute(
-            select(Shipment).where(Shipment.shipment_id == line.shipment_id)
-        )
-        shipment = shipment_result.scalar_one_or_none()
-        if shipment:
-            shipment.status = "ACTIVE"
-
-    workflow = DebitNoteWorkflow(
-        debit_note_id=dn.debit_note_id,
-        action="REJECTED",
-        from_status="PENDING_REVIEW",
-        to_status="REJECTED",
-        performed_by=current_user.user_id,
-        comment=body.comment,
+    query = (
+        select(DebitNoteLine)
+        .where(DebitNoteLine.debit_note_id == debit_note_id)
+        .order_by(DebitNoteLine.line_no, DebitNoteLine.line_id)
+    )
+    if cursor:
+        line_no, line_id = decode_cursor(cursor, int)
+        query = query.where(tuple_(DebitNoteLine.line_no, DebitNoteLine.line_id) > tuple_(line_no, line_id))
+    lines = (await db.execute(query.limit(limit + 1))).scalars().all()
+
+    next_cursor = None
+    if len(lines) > limit:
+        lines = lines[:limit]
+        next_cursor = encode_cursor(lines[-1].line_no, lines[-1].line_id)
+
+    return DebitNoteLinePage(
+        total=dn.total_lines or 0,
+        items=[DebitNoteLineResponse.model_validate(l) for l in lines],
+        next_cursor=next_cursor,
     )
-    db.add(workflow)
-    await db.commit()
-    await db.refresh(dn)
-
-    resp = DebitNoteResponse.model_validate(dn)
-    resp.lines = [DebitNoteLineResponse.model_validate(l) for l in dn.lines]
-    return resp
 
 
 @router.get("/{debit_note_id}/workflows", response_model=list[DebitNoteWorkflowResponse])
 async def get_workflows(
     debit_note_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """워크플로우 이력 조회 (FR-032)"""
     result = await db.execute(
@@ -2,45 +2,69 @@
 
 - POST /api/v1/debit-notes/{id}/export-excel → Excel 생성 + 다운로드
 - GET /api/v1/debit-notes/{id}/download → 최근 생성된 Excel 다운로드
+- POST /api/v1/debit-notes/{id}/export-jobs → 비동기 출력 작업 등록 (worker 에서 생성)
+- GET /api/v1/debit-notes/{id}/export-jobs/{export_id} → 작업 상태 (PENDING/GENERATING/COMPLETED/FAILED)
+- GET /api/v1/debit-notes/{id}/export-jobs/{export_id}/download → 완료된 파일 다운로드
 """
 import os
-from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import get_current_user, require_role
-from app.models.user import User
-from app.models.debit_note import DebitNote, DebitNoteWorkflow
+from app.core.permissions import require_permission
+from app.core.principal_cache import Principal
+from app.core.security import get_current_user
+from app.models.debit_note import DebitNote
 from app.models.audit import DebitNoteExport
-from app.services.excel_generator import generate_debit_note_excel
+from app.schemas.debit_note import ExportJobResponse
+from app.services.export_jobs import enqueue_export_job, get_export_file, mark_exported
 
 router = APIRouter(prefix="/api/v1/debit-notes", tags=["excel-export"])
 
-EXPORT_DIR = "/app/exports"
+EXPORT_DIR = settings.EXPORT_DIR
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
-@router.post("/{debit_note_id}/export-excel")
-async def export_excel(
-    debit_note_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "accountant")),
-):
-    """Debit Note를 Excel로 생성 및 다운로드 (FR-021)
+def _file_stream(file_path: str):
+    with open(file_path, "rb") as f:
+        yield from f
 
-    - APPROVED 상태의 DN만 출력 가능
-    - 출력 기록을 debit_note_exports 테이블에 저장
-    - 상태를 EXPORTED로 변경
-    """
-    # DN 조회
+
+def _etag(content_hash: Optional[str]) -> Optional[str]:
+    return f'"{content_hash}"' if content_hash else None
+
+
+def _not_modified(request: Request, content_hash: Optional[str]) -> Optional[Response]:
+    """If-None-Match 가 현재 ETag 와 같으면 304 응답"""
+    etag = _etag(content_hash)
+    if_none_match = request.headers.get("if-none-match")
+    if not etag or not if_none_match:
+        return None
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    if "*" in tags or etag in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def _file_response(file_path: str, filename: str, content_hash: Optional[str] = None, **headers) -> StreamingResponse:
+    headers.update({
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Content-Length": str(os.path.getsize(file_path)),
+    })
+    if content_hash:
+        headers["ETag"] = _etag(content_hash)
+    return StreamingResponse(_file_stream(file_path), media_type=XLSX_MEDIA_TYPE, headers=headers)
+
+
+async def _get_exportable_dn(db: AsyncSession, debit_note_id: int) -> DebitNote:
     result = await db.execute(
-        select(DebitNote)
-        .options(selectinload(DebitNote.lines))
-        .where(DebitNote.debit_note_id == debit_note_id)
+        select(DebitNote).where(DebitNote.debit_note_id == debit_note_id)
     )
     dn = result.scalar_one_or_none()
     if not dn:
@@ -51,10 +75,29 @@ async def export_excel(
             status_code=400,
             detail=f"Excel 출력은 승인(APPROVED) 상태에서만 가능합니다. 현재 상태: {dn.status}",
         )
+    return dn
 
-    # Excel 생성
+
+@router.post("/{debit_note_id}/export-excel")
+async def export_excel(
+    debit_note_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_permission("debit_note:export")),
+):
+    """Debit Note를 Excel로 생성 및 다운로드 (FR-021)
+
+    - APPROVED 상태의 DN만 출력 가능
+    - 출력 기록을 debit_note_exports 테이블에 저장
+    - 상태를 EXPORTED로 변경
+    - 라인 수가 EXCEL_WRITE_ONLY_MIN_LINES 이상이면 write_only 모드로 파일에 직접 생성
+    - 내용 해시가 같은 이전 출력이 있으면 재생성 없이 저장된 파일 전송 (X-Export-Cache: HIT)
+    - 요청 안에서 생성하므로 대용량 DN은 export-jobs 사용
+    """
+    dn = await _get_exportable_dn(db, debit_note_id)
+
+    # Excel 생성 + 파일 저장 (이력 보관용)
     try:
-        buffer, filename = await generate_debit_note_excel(debit_note_id, db)
+        export_file = await get_export_file(db, dn)
     except Exception as e:
         # 실패 기록
         export_record = DebitNoteExport(
@@ -68,58 +111,115 @@ async def export_excel(
         await db.commit()
         raise HTTPException(status_code=500, detail=f"Excel 생성 실패: {str(e)}")
 
-    # 파일 저장 (선택적 - 이력 보관용)
-    os.makedirs(EXPORT_DIR, exist_ok=True)
-    file_path = os.path.join(EXPORT_DIR, filename)
-    with open(file_path, "wb") as f:
-        f.write(buffer.getvalue())
-    file_size = buffer.getbuffer().nbytes
-
-    # 출력 기록 저장
+    # 출력 기록 저장 (캐시 적중 시에도 출력 이력은 남김)
     export_record = DebitNoteExport(
         debit_note_id=debit_note_id,
-        file_name=filename,
-        file_path=file_path,
-        file_size=file_size,
+        file_name=export_file.file_name,
+        file_path=export_file.file_path,
+        file_size=os.path.getsize(export_file.file_path),
+        content_hash=export_file.content_hash,
         export_status="COMPLETED",
         exported_by=current_user.user_id,
     )
     db.add(export_record)
 
     # 상태 변경: APPROVED → EXPORTED (최초 출력 시)
-    if dn.status == "APPROVED":
-        dn.status = "EXPORTED"
-        workflow = DebitNoteWorkflow(
-            debit_note_id=dn.debit_note_id,
-            action="EXPORTED",
-            from_status="APPROVED",
-            to_status="EXPORTED",
-            performed_by=current_user.user_id,
-            comment=f"Excel exported: {filename}",
-        )
-        db.add(workflow)
+    mark_exported(db, dn, current_user.user_id, export_file.file_name)
 
     await db.commit()
 
     # 스트리밍 응답
-    buffer.seek(0)
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-            "Content-Length": str(file_size),
-        },
+    return _file_response(
+        export_file.file_path, export_file.file_name, export_file.content_hash,
+        **{"X-Export-Cache": "HIT" if export_file.cached else "MISS"},
     )
 
 
+# ── 비동기 출력 작업 ─────────────────────────────────────────
+
+@router.post("/{debit_note_id}/export-jobs", response_model=ExportJobResponse, status_code=202)
+async def create_export_job(
+    debit_note_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_permission("debit_note:export")),
+):
+    """Excel 출력 작업 등록 (FR-021) - PENDING 기록 후 worker 에 전달, 즉시 202 응답"""
+    dn = await _get_exportable_dn(db, debit_note_id)
+
+    export = DebitNoteExport(
+        debit_note_id=dn.debit_note_id,
+        file_name=f"PENDING_{debit_note_id}",
+        export_status="PENDING",
+        exported_by=current_user.user_id,
+    )
+    db.add(export)
+    await db.commit()  # worker 가 읽기 전에 커밋
+
+    try:
+        enqueue_export_job(export.export_id, background_tasks)
+    except Exception as e:
+        export.export_status = "FAILED"
+        export.error_message = f"Export queue unavailable: {e}"
+        await db.commit()
+        raise HTTPException(status_code=503, detail="출력 작업 큐에 연결할 수 없습니다")
+
+    return export
+
+
+async def _get_export_job(db: AsyncSession, debit_note_id: int, export_id: int) -> DebitNoteExport:
+    result = await db.execute(
+        select(DebitNoteExport).where(
+            DebitNoteExport.export_id == export_id,
+            DebitNoteExport.debit_note_id == debit_note_id,
+        )
+    )
+    export = result.scalar_one_or_none()
+    if not export:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return export
+
+
+@router.get("/{debit_note_id}/export-jobs/{export_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    debit_note_id: int,
+    export_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """출력 작업 상태 조회"""
+    return await _get_export_job(db, debit_note_id, export_id)
+
+
+@router.get("/{debit_note_id}/export-jobs/{export_id}/download")
+async def download_export_job(
+    debit_note_id: int,
+    export_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """완료된 출력 작업 파일 다운로드 (완료 전이면 409, If-None-Match 일치 시 304)"""
+    export = await _get_export_job(db, debit_note_id, export_id)
+    if export.export_status != "COMPLETED":
+        raise HTTPException(status_code=409, detail=f"Export job is {export.export_status}")
+    not_modified = _not_modified(request, export.content_hash)
+    if not_modified:
+        return not_modified
+    if not export.file_path or not os.path.exists(export.file_path):
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다. 다시 생성해주세요.")
+
+    return _file_response(export.file_path, export.file_name, export.content_hash)
+
+
 @router.get("/{debit_note_id}/download")
 async def download_latest_excel(
     debit_note_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    """최근 생성된 Excel 다운로드"""
+    """최근 생성된 Excel 다운로드 (If-None-Match 일치 시 304)"""
     # 최신 성공 기록 조회
     result = await db.execute(
         select(DebitNoteExport)
@@ -134,27 +234,21 @@ async def download_latest_excel(
     if not export or not export.file_path:
         raise HTTPException(status_code=404, detail="생성된 Excel 파일이 없습니다")
 
+    not_modified = _not_modified(request, export.content_hash)
+    if not_modified:
+        return not_modified
+
     if not os.path.exists(export.file_path):
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다. 다시 생성해주세요.")
 
-    def file_stream():
-        with open(export.file_path, "rb") as f:
-            yield from f
-
-    return StreamingResponse(
-        file_stream(),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f'attachment; filename="{export.file_name}"',
-        },
-    )
+    return _file_response(export.file_path, export.file_name, export.content_hash)
 
 
 @router.get("/{debit_note_id}/exports")
 async def list_exports(
     debit_note_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Excel 출력 이력 조회"""
     result = await db.execute(
@@ -168,6 +262,7 @@ async def list_exports(
             "export_id": e.export_id,
             "file_name": e.file_name,
             "file_size": e.file_size,
+            "content_hash": e.content_hash,
             "export_status": e.export_status,
             "error_message": e.error_message,
             "exported_by": e.exported_by,
@@ -3,14 +3,16 @@ from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_user, require_role
-from app.models.user import User
+from app.core.permissions import require_permission
+from app.core.principal_cache import Principal
+from app.core.security import get_current_user
 from app.models.exchange_rate import ExchangeRate
+from app.services.exchange_rate_resolver import exchange_rate_resolver
 
 router = APIRouter(prefix="/api/v1/exchange-rates", tags=["exchange-rates"])
 
@@ -35,35 +37,80 @@ class ExchangeRateResponse(BaseModel):
         from_attributes = True
 
 
+class ResolvedRateResponse(BaseModel):
+    client_id: Optional[int] = None
+    on_date: date
+    rate: Decimal
+    source: str  # CLIENT, GENERAL
+    rate_id: int
+    currency_from: str
+    currency_to: str
+    effective_from: date
+    effective_to: Optional[date] = None
+
+
+class RateLookup(BaseModel):
+    client_id: Optional[int] = None
+    on_date: date
+
+
+class RateResolveRequest(BaseModel):
+    currency_from: str = "USD"
+    currency_to: str = "VND"
+    lookups: List[RateLookup]
+
+
 @router.get("/latest", response_model=ExchangeRateResponse)
 async def get_latest_rate(
     currency_from: str = "USD",
     currency_to: str = "VND",
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(ExchangeRate)
-        .where(
-            ExchangeRate.currency_from == currency_from,
-            ExchangeRate.currency_to == currency_to,
-            ExchangeRate.is_active == True,
-        )
-        .order_by(ExchangeRate.rate_date.desc())
-        .limit(1)
-    )
-    rate = result.scalar_one_or_none()
+    rate = (await exchange_rate_resolver.index(db)).latest(currency_from, currency_to)
     if not rate:
         raise HTTPException(status_code=404, detail="Exchange rate not found")
     return rate
 
 
+@router.get("/resolve", response_model=ResolvedRateResponse)
+async def resolve_rate(
+    on_date: date,
+    client_id: Optional[int] = None,
+    currency_from: str = "USD",
+    currency_to: str = "VND",
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """거래처/일자별 적용 환율 (FR-006) - 거래처 환율 우선, 없으면 일반 환율"""
+    resolved = await exchange_rate_resolver.resolve(db, client_id, on_date, currency_from, currency_to)
+    if not resolved:
+        raise HTTPException(status_code=404, detail="Exchange rate not found")
+    return ResolvedRateResponse(client_id=client_id, on_date=on_date, **vars(resolved))
+
+
+@router.post("/resolve", response_model=List[Optional[ResolvedRateResponse]])
+async def resolve_rates(
+    data: RateResolveRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """여러 (거래처, 일자) 환율 일괄 결정 - 요청 순서대로, 환율이 없으면 null"""
+    results = await exchange_rate_resolver.resolve_many(
+        db, [(item.client_id, item.on_date) for item in data.lookups], data.currency_from, data.currency_to,
+    )
+    return [
+        ResolvedRateResponse(client_id=item.client_id, on_date=item.on_date, **vars(resolved)) if resolved else None
+        for item, resolved in zip(data.lookups, results)
+    ]
+
+
 @router.get("", response_model=list[ExchangeRateResponse])
 async def list_rates(
     skip: int = Query(0),
     limit: int = Query(30),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(
         select(ExchangeRate).order_by(ExchangeRate.rate_date.desc()).offset(skip).limit(limit)
@@ -75,7 +122,7 @@ async def list_rates(
 async def create_rate(
     data: ExchangeRateCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "accountant")),
+    current_user: Principal = Depends(require_permission("exchange_rate:create")),
 ):
     rate = ExchangeRate(**data.model_dump(), created_by=current_user.user_id)
     db.add(rate)
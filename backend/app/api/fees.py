@@ -3,14 +3,12 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from typing import Optional, List
 from decimal import Decimal
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.principal_cache import Principal
 from app.core.security import get_current_user
-from app.models.user import User
-from app.models.fee import FeeCategory, FeeItem
+from app.services.reference_data import reference_cache
 
 router = APIRouter(prefix="/api/v1", tags=["fees"])
 
@@ -45,24 +43,15 @@ class FeeCategoryResponse(BaseModel):
 @router.get("/fee-categories", response_model=List[FeeCategoryResponse])
 async def list_fee_categories(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(FeeCategory)
-        .options(selectinload(FeeCategory.fee_items))
-        .where(FeeCategory.is_active == True)
-        .order_by(FeeCategory.sort_order)
-    )
-    categories = result.scalars().unique().all()
-    return categories
+    # 기준 데이터 캐시 (버전 변경 시에만 DB 재조회)
+    return await reference_cache.fee_categories(db)
 
 
 @router.get("/fee-items", response_model=List[FeeItemResponse])
 async def list_fee_items(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(FeeItem).where(FeeItem.is_active == True).order_by(FeeItem.sort_order)
-    )
-    return result.scalars().all()
+    return await reference_cache.fee_items(db)
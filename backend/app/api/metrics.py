@@ -0,0 +1,45 @@
+"""운영 지표 API
+
+- /api/v1/metrics/*: 관리자 전용 JSON
+- /metrics: Prometheus scrape 용 text format (METRICS_ENABLED + METRICS_TOKEN 필수)
+"""
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.database import engine, pool_status
+from app.core.metrics import render_metrics
+from app.core.principal_cache import Principal
+from app.core.security import require_role
+
+router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
+prometheus_router = APIRouter(tags=["metrics"])
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics(
+    reset: bool = Query(False, description="응답 후 누적 통계(대기 시간/최대 사용량) 초기화"),
+    current_user: Principal = Depends(require_role("admin")),
+):
+    """DB 커넥션 풀 상태 - 월말 부하 기준 풀 크기 산정용
+
+    checked_out/overflow 는 현재 값, 나머지는 since 이후 누적 (wait = 풀 대기 + 신규 연결 + pre-ping)
+    """
+    status = pool_status()
+    if reset and hasattr(engine.sync_engine.pool, "reset_stats"):
+        engine.sync_engine.pool.reset_stats()
+    return status
+
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """API 응답 시간, DB 시간, DN 생성/Excel 출력 시간, 캐시 적중 (app.core.metrics)"""
+    # 경로별 지연시간 / 거래처 코드 라벨이 노출되므로 토큰 없이는 열지 않음
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not secrets.compare_digest(request.headers.get("authorization", ""), expected):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -2,71 +2,40 @@
 
 중복 HBL/MBL/INV/CD 감지 포함
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import ValidationError
+from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.pagination import (
+    COUNT_MODE_PATTERN, count_rows, decode_cursor, encode_cursor, keyset_after, keyset_order, parse_date,
+)
+from app.core.principal_cache import Principal
 from app.core.security import get_current_user
-from app.models.user import User
-from app.models.shipment import Shipment, ShipmentFeeDetail, DuplicateDetection
-from app.models.fee import FeeItem
+from app.models.shipment import Shipment, ShipmentFeeDetail
 from app.schemas.shipment import (
     ShipmentCreate, ShipmentUpdate, ShipmentResponse,
     ShipmentListResponse, FeeDetailResponse, DuplicateWarning,
+    ShipmentBulkCreate, ShipmentBulkResult, ShipmentBulkResponse,
+    FeeDetailCreate, FeeDetailUpdate, FeeDetailChangeResponse,
+)
+from app.services.duplicate_detector import (
+    REFERENCE_FIELDS, detect_duplicates_batch, insert_reference_keys, sync_reference_keys,
 )
+from app.services.line_recalculator import lock_shipment_lines, locked_by, recalculate_shipment_lines
+from app.services.reference_data import reference_cache
+from app.services.shipment_ingest import BULK_CHUNK_SIZE, ingest_shipments, pre_tax_amount
 
 router = APIRouter(prefix="/api/v1/shipments", tags=["shipments"])
 
 
 async def detect_duplicates(db: AsyncSession, shipment: Shipment) -> list[DuplicateWarning]:
-    """중복 HBL, MBL, INV, CD 감지 (FR-009)"""
-    warnings = []
-    checks = [
-        ("HBL", shipment.hbl),
-        ("MBL", shipment.mbl),
-        ("INV", shipment.invoice_no),
-        ("CD", shipment.cd_no),
-    ]
-
-    for dup_type, value in checks:
-        if not value:
-            continue
-        field = getattr(Shipment, {
-            "HBL": "hbl", "MBL": "mbl", "INV": "invoice_no", "CD": "cd_no"
-        }[dup_type])
-
-        query = select(Shipment).where(
-            field == value,
-            Shipment.client_id == shipment.client_id,
-            Shipment.status != "CANCELLED",
-        )
-        if shipment.shipment_id:
-            query = query.where(Shipment.shipment_id != shipment.shipment_id)
-
-        result = await db.execute(query)
-        duplicates = result.scalars().all()
-
-        for dup in duplicates:
-            warnings.append(DuplicateWarning(
-                duplicate_type=dup_type,
-                duplicate_value=value,
-                existing_shipment_id=dup.shipment_id,
-            ))
-
-            # 기록 저장
-            detection = DuplicateDetection(
-                shipment_id=shipment.shipment_id,
-                duplicate_shipment_id=dup.shipment_id,
-                duplicate_type=dup_type,
-                duplicate_value=value,
-            )
-            db.add(detection)
-
+    """중복 HBL, MBL, INV, CD 감지 (FR-009) - 정규화 키 테이블 1회 조회"""
+    warnings = (await detect_duplicates_batch(db, [shipment]))[shipment.shipment_id]
     if warnings:
         shipment.is_duplicate = True
-
     return warnings
 
 
@@ -77,27 +46,40 @@ async def list_shipments(
     status: str = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    query = select(Shipment).options(selectinload(Shipment.fee_details))
-    count_query = select(func.count(Shipment.shipment_id))
-
+    """거래 목록 - (delivery_date, shipment_id) 역순, cursor 로 keyset 페이지네이션"""
+    filters = []
     if client_id:
-        query = query.where(Shipment.client_id == client_id)
-        count_query = count_query.where(Shipment.client_id == client_id)
+        filters.append(Shipment.client_id == client_id)
     if shipment_type:
-        query = query.where(Shipment.shipment_type == shipment_type)
-        count_query = count_query.where(Shipment.shipment_type == shipment_type)
+        filters.append(Shipment.shipment_type == shipment_type)
     if status:
-        query = query.where(Shipment.status == status)
-        count_query = count_query.where(Shipment.status == status)
+        filters.append(Shipment.status == status)
 
-    total = (await db.execute(count_query)).scalar()
-    result = await db.execute(
-        query.order_by(Shipment.delivery_date.desc()).offset(skip).limit(limit)
+    total = await count_rows(db, select(Shipment.shipment_id).where(*filters), "shipments", count)
+
+    query = (
+        select(Shipment).options(selectinload(Shipment.fee_details))
+        .where(*filters)
+        .order_by(*keyset_order(Shipment.delivery_date, Shipment.shipment_id))
     )
-    shipments = result.scalars().unique().all()
+    if cursor:
+        delivery_date, shipment_id = decode_cursor(cursor, parse_date)
+        query = keyset_after(query, Shipment.delivery_date, Shipment.shipment_id, delivery_date, shipment_id)
+    else:
+        query = query.offset(skip)
+    # limit + 1 건 조회로 다음 페이지 존재 여부 확인
+    shipments = (await db.execute(query.limit(limit + 1))).scalars().unique().all()
+
+    next_cursor = None
+    if len(shipments) > limit:
+        shipments = shipments[:limit]
+        last = shipments[-1]
+        next_cursor = encode_cursor(last.delivery_date, last.shipment_id)
 
     items = []
     for s in shipments:
@@ -105,14 +87,14 @@ async def list_shipments(
         resp.fee_details = [FeeDetailResponse.model_validate(fd) for fd in s.fee_details]
         items.append(resp)
 
-    return ShipmentListResponse(total=total, items=items)
+    return ShipmentListResponse(total=total, items=items, next_cursor=next_cursor)
 
 
 @router.get("/{shipment_id}", response_model=ShipmentResponse)
 async def get_shipment(
     shipment_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(
         select(Shipment).options(selectinload(Shipment.fee_details))
@@ -131,7 +113,7 @@ async def get_shipment(
 async def create_shipment(
     data: ShipmentCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     shipment_data = data.model_dump(exclude={"fee_details"})
     shipment = Shipment(**shipment_data, created_by=current_user.user_id)
@@ -140,18 +122,18 @@ async def create_shipment(
 
     # Fee details
     for fd in data.fee_details or []:
+        # 세후→세전 자동 변환 (FR-017: Handling/D/O ÷1.08)
         fee_detail = ShipmentFeeDetail(
             shipment_id=shipment.shipment_id,
             **fd.model_dump(),
+            pre_tax_amount=pre_tax_amount(fd),
         )
-        # 세후→세전 자동 변환 (FR-017: Handling/D/O ÷1.08)
-        if fd.is_tax_inclusive and fd.amount_usd > 0:
-            fee_detail.pre_tax_amount = fd.amount_usd / 1.08
         db.add(fee_detail)
 
     await db.flush()
 
     # 중복 감지
+    await insert_reference_keys(db, [shipment])
     warnings = await detect_duplicates(db, shipment)
 
     await db.commit()
@@ -170,12 +152,85 @@ async def create_shipment(
     return resp
 
 
+def _bulk_response(results: list[ShipmentBulkResult]) -> ShipmentBulkResponse:
+    created = sum(1 for r in results if r.status == "CREATED")
+    return ShipmentBulkResponse(
+        total=len(results),
+        created=created,
+        failed=len(results) - created,
+        duplicates=sum(1 for r in results if r.is_duplicate),
+        results=results,
+    )
+
+
+@router.post("/bulk", response_model=ShipmentBulkResponse)
+async def bulk_create_shipments(
+    data: ShipmentBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """선적 대량 등록 (JSON 배열) - 행별 결과 반환"""
+    results = await ingest_shipments(db, list(enumerate(data.items)), current_user.user_id)
+    return _bulk_response(results)
+
+
+@router.post("/bulk/ndjson", response_model=ShipmentBulkResponse)
+async def bulk_create_shipments_ndjson(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """선적 대량 등록 (NDJSON 스트림, 한 줄에 ShipmentCreate 1건)
+
+    요청 본문을 읽는 대로 BULK_CHUNK_SIZE 건씩 등록하므로 건수 제한이 없다.
+    파싱/검증 실패 행은 FAILED 로 기록하고 나머지는 계속 처리한다.
+    """
+    results: list[ShipmentBulkResult] = []
+    pending: list[tuple[int, ShipmentCreate]] = []
+    index = 0
+
+    async def flush():
+        results.extend(await ingest_shipments(db, pending, current_user.user_id))
+        pending.clear()
+
+    async def lines():
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *complete, buffer = buffer.split(b"\n")
+            for line in complete:
+                yield line
+        yield buffer
+
+    async for line in lines():
+        if not line.strip():
+            continue
+        try:
+            pending.append((index, ShipmentCreate.model_validate_json(line)))
+        except ValidationError as e:
+            error = e.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            results.append(ShipmentBulkResult(
+                index=index,
+                status="FAILED",
+                error=f"{location}: {error['msg']}" if location else error["msg"],
+            ))
+        index += 1
+        if len(pending) >= BULK_CHUNK_SIZE:
+            await flush()
+    if pending:
+        await flush()
+
+    results.sort(key=lambda r: r.index)
+    return _bulk_response(results)
+
+
 @router.put("/{shipment_id}", response_model=ShipmentResponse)
 async def update_shipment(
     shipment_id: int,
     data: ShipmentUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(
         select(Shipment).options(selectinload(Shipment.fee_details))
@@ -191,6 +246,10 @@ async def update_shipment(
     for key, value in update_data.items():
         setattr(shipment, key, value)
 
+    # 참조번호 변경 시 중복 감지 키 갱신
+    if update_data.keys() & set(REFERENCE_FIELDS.values()):
+        await sync_reference_keys(db, [shipment])
+
     await db.commit()
     await db.refresh(shipment)
 
@@ -199,11 +258,126 @@ async def update_shipment(
     return resp
 
 
+# ── 비용 상세 수정 (DRAFT/REJECTED DN 라인 증분 재계산) ──
+
+async def _lock_fee_lines(db: AsyncSession, shipment_id: int) -> list:
+    """선적 + DN 라인 잠금 - 검토/승인/출력된 DN 에 포함된 선적이면 400
+
+    선적 행을 먼저 잠가서 DN 생성(build_debit_note)과 직렬화한다 - 생성 중인 DN 의 라인은
+    아직 보이지 않으므로, 생성이 커밋된 뒤 그 라인까지 잠그고 재계산한다.
+    """
+    exists = (await db.execute(
+        select(Shipment.shipment_id).where(Shipment.shipment_id == shipment_id).with_for_update()
+    )).scalar_one_or_none()
+    if exists is None:
+        raise HTTPException(status_code=404, detail="Shipment not found")
+
+    lines = await lock_shipment_lines(db, shipment_id)
+    locked = locked_by(lines)
+    if locked:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot modify fees: shipment is in {locked.status} Debit Note {locked.debit_note_id}",
+        )
+    return lines
+
+
+async def _check_fee_item(db: AsyncSession, fee_item_id: int):
+    if fee_item_id not in await reference_cache.fee_items_by_id(db):
+        raise HTTPException(status_code=400, detail=f"Fee item not found: {fee_item_id}")
+
+
+async def _get_fee_detail(db: AsyncSession, shipment_id: int, detail_id: int) -> ShipmentFeeDetail:
+    result = await db.execute(
+        select(ShipmentFeeDetail).where(
+            ShipmentFeeDetail.detail_id == detail_id,
+            ShipmentFeeDetail.shipment_id == shipment_id,
+        )
+    )
+    fee_detail = result.scalar_one_or_none()
+    if not fee_detail:
+        raise HTTPException(status_code=404, detail="Fee detail not found")
+    return fee_detail
+
+
+@router.post("/{shipment_id}/fee-details", response_model=FeeDetailChangeResponse, status_code=201)
+async def add_fee_detail(
+    shipment_id: int,
+    data: FeeDetailCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """비용 항목 추가 - 선적이 DRAFT/REJECTED DN 에 있으면 그 라인만 재계산, 헤더는 delta 반영"""
+    lines = await _lock_fee_lines(db, shipment_id)
+    await _check_fee_item(db, data.fee_item_id)
+
+    fee_detail = ShipmentFeeDetail(
+        shipment_id=shipment_id,
+        **data.model_dump(),
+        pre_tax_amount=pre_tax_amount(data),
+    )
+    db.add(fee_detail)
+    await db.flush()
+
+    recalculated = await recalculate_shipment_lines(db, shipment_id, lines)
+    await db.commit()
+    return FeeDetailChangeResponse(fee_detail=FeeDetailResponse.model_validate(fee_detail), recalculated=recalculated)
+
+
+@router.put("/{shipment_id}/fee-details/{detail_id}", response_model=FeeDetailChangeResponse)
+async def update_fee_detail(
+    shipment_id: int,
+    detail_id: int,
+    data: FeeDetailUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """비용 항목 수정 - 선적이 DRAFT/REJECTED DN 에 있으면 그 라인만 재계산, 헤더는 delta 반영"""
+    lines = await _lock_fee_lines(db, shipment_id)
+    fee_detail = await _get_fee_detail(db, shipment_id, detail_id)
+
+    update_data = data.model_dump(exclude_unset=True)
+    if "fee_item_id" in update_data:
+        await _check_fee_item(db, update_data["fee_item_id"])
+    for key, value in update_data.items():
+        setattr(fee_detail, key, value)
+    if update_data.keys() & {"amount_usd", "is_tax_inclusive"}:
+        # 세후→세전 자동 변환 (FR-017: Handling/D/O ÷1.08)
+        fee_detail.pre_tax_amount = pre_tax_amount(FeeDetailCreate(
+            fee_item_id=fee_detail.fee_item_id,
+            amount_usd=fee_detail.amount_usd or 0,
+            is_tax_inclusive=bool(fee_detail.is_tax_inclusive),
+        ))
+    await db.flush()
+
+    recalculated = await recalculate_shipment_lines(db, shipment_id, lines)
+    await db.commit()
+    return FeeDetailChangeResponse(fee_detail=FeeDetailResponse.model_validate(fee_detail), recalculated=recalculated)
+
+
+@router.delete("/{shipment_id}/fee-details/{detail_id}", response_model=FeeDetailChangeResponse)
+async def delete_fee_detail(
+    shipment_id: int,
+    detail_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """비용 항목 삭제 - 선적이 DRAFT/REJECTED DN 에 있으면 그 라인만 재계산, 헤더는 delta 반영"""
+    lines = await _lock_fee_lines(db, shipment_id)
+    fee_detail = await _get_fee_detail(db, shipment_id, detail_id)
+    await db.delete(fee_detail)
+    await db.flush()
+
+    recalculated = await recalculate_shipment_lines(db, shipment_id, lines)
+    await db.commit()
+    return FeeDetailChangeResponse(recalculated=recalculated)
+
+
 @router.delete("/{shipment_id}", status_code=204)
 async def delete_shipment(
     shipment_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     result = await db.execute(select(Shipment).where(Shipment.shipment_id == shipment_id))
     shipment = result.scalar_one_or_none()
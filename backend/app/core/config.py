@@ -7,9 +7,57 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = "postgresql+asyncpg://eximuni:eximuni_pass@db:5432/eximuni_db"
     DATABASE_URL_SYNC: str = "postgresql://eximuni:eximuni_pass@db:5432/eximuni_db"
+    # SQL 로그 (DEBUG 와 별도 - 운영에서 켜지 않음)
+    DB_ECHO: bool = False
+    # 커넥션 풀 (프로세스당 최대 DB_POOL_SIZE + DB_MAX_OVERFLOW 개)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # 풀이 가득 찼을 때 커넥션 대기 상한 (초)
+    DB_POOL_RECYCLE: int = 1800  # 이 시간(초)보다 오래된 커넥션은 재연결
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement 캐시 크기 (PgBouncer transaction 모드면 0)
+    DB_STATEMENT_CACHE_SIZE: int = 100
 
     REDIS_URL: str = "redis://redis:6379/0"
 
+    # 인증 사용자 캐시 (get_current_user) - 0 이면 매 요청 DB 조회
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_REDIS: bool = False  # true 면 Redis(REDIS_URL) 를 2차 캐시로 공유
+    # 기준 데이터(비용 항목/템플릿/매핑) 캐시 버전 확인 주기 - 다른 프로세스의 변경 반영 지연 상한
+    REFERENCE_CACHE_CHECK_SECONDS: int = 5
+    # 권한 비트마스크 재계산 주기 (다른 프로세스의 역할/권한 변경 반영)
+    PERMISSION_REFRESH_SECONDS: int = 300
+    # bcrypt 해싱/검증 전용 스레드 수 (이벤트 루프 밖에서 실행, 동시 실행 상한)
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # 요청별 SQL 쿼리 집계 (app.core.query_stats)
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_STATS_HEADERS: bool = True  # X-DB-Query-Count / X-DB-Time-Ms / X-DB-Repeated-Queries
+    QUERY_REPEAT_THRESHOLD: int = 5  # 같은 문장이 이 횟수 이상이면 N+1 의심으로 로그
+    QUERY_BUDGET: int = 0  # 요청당 쿼리 수 상한 (0 = 없음, 요청 헤더 X-Query-Budget 으로 지정 가능)
+    QUERY_BUDGET_ENFORCE: bool = False  # 테스트 모드 - 예산 초과 응답을 500 으로
+
+    # GET /metrics (Prometheus text format) - 기본 비활성. 켜려면 METRICS_ENABLED=true + METRICS_TOKEN 지정
+    # (요청에 Authorization: Bearer <token> 필요, 토큰이 비어 있으면 활성화해도 404)
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""
+
+    # Excel 출력
+    EXPORT_DIR: str = "/app/exports"
+    # DN 라인 수가 이 값 이상이면 Excel 을 write_only(스트리밍) 모드로 생성
+    EXCEL_WRITE_ONLY_MIN_LINES: int = 1000
+    # 비동기 작업(출력 작업, 월말 일괄 생성) 실행 방식: celery (Redis 브로커 + worker) / thread (API 프로세스 내 스레드, 로컬/테스트용)
+    EXPORT_QUEUE: str = "celery"
+    CELERY_BROKER_URL: str = ""  # 비어 있으면 REDIS_URL 사용
+    # 선점 후 이 시간(초) 안에 끝나지 않은 출력 작업은 worker 중단으로 보고 재전달 시 다시 선점 (최대 생성 시간보다 길게)
+    EXPORT_JOB_STALE_SECONDS: int = 900
+
+    # 월말 일괄 DN 생성 - 동시에 생성하는 거래처 수 (DB_POOL_SIZE 이하로 제한, SQLite 는 1)
+    BATCH_RUN_CONCURRENCY: int = 4
+    # RUNNING 인 채 이 시간(초) 동안 항목 기록이 없는 실행은 worker 중단으로 보고 재전달 시 다시 선점
+    BATCH_RUN_STALE_SECONDS: int = 600
+
     class Config:
         env_file = ".env"
 
@@ -1,9 +1,91 @@
+"""DB 엔진 / 세션
+
+커넥션 풀 (PostgreSQL): 프로세스당 최대 커넥션 = DB_POOL_SIZE + DB_MAX_OVERFLOW
+- 풀이 가득 차면 DB_POOL_TIMEOUT 초 대기 후 TimeoutError
+- 대기 시간/최대 사용량은 InstrumentedQueuePool 이 기록 → GET /api/v1/metrics/db-pool
+SQLite(로컬/테스트)는 드라이버 기본 풀을 그대로 사용한다.
+"""
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from app.core import metrics
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+SLOW_CHECKOUT_SECONDS = 0.1
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    slow_checkouts: int = 0  # SLOW_CHECKOUT_SECONDS 이상 대기
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    peak_checked_out: int = 0
+    since: datetime = field(default_factory=datetime.utcnow)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """커넥션 획득 시간(풀 대기 + 신규 연결 + pre-ping)을 기록하는 큐 풀"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+
+        stats = self.stats
+        stats.checkouts += 1
+        stats.wait_seconds_total += waited
+        stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+        if waited >= SLOW_CHECKOUT_SECONDS:
+            stats.slow_checkouts += 1
+        stats.peak_checked_out = max(stats.peak_checked_out, self.checkedout())
+        return connection
+
+    def reset_stats(self):
+        self.stats = PoolStats()
+
+
+def engine_options(database_url: str) -> dict:
+    """create_async_engine 인자 (풀 / asyncpg 설정)"""
+    url = make_url(database_url)
+    options = {"echo": settings.DB_ECHO}
+    if url.get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if url.get_driver_name() == "asyncpg":
+        # asyncpg 자체 캐시 + SQLAlchemy 어댑터의 prepared statement 캐시 (PgBouncer transaction 모드면 0)
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -14,3 +96,50 @@ class Base(DeclarativeBase):
 async def get_db() -> AsyncSession:
     async with async_session() as session:
         yield session
+
+
+def pool_status() -> dict:
+    """현재 풀 상태 + InstrumentedQueuePool 누적 통계"""
+    pool = engine.sync_engine.pool
+    status = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, InstrumentedQueuePool):
+        stats = pool.stats
+        status.update(
+            pool_size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            capacity=pool.size() + max(pool._max_overflow, 0),
+            timeout_seconds=pool.timeout(),
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            slow_checkouts=stats.slow_checkouts,
+            wait_seconds_avg=stats.wait_seconds_total / stats.checkouts if stats.checkouts else 0.0,
+            wait_seconds_max=stats.wait_seconds_max,
+            peak_checked_out=stats.peak_checked_out,
+            since=stats.since,
+        )
+    return status
+
+
+# ── /metrics ──
+
+DB_POOL_CONNECTIONS = metrics.Gauge("db_pool_connections", "DB 커넥션 풀 현재 상태", ("state",))
+DB_POOL_CHECKOUTS = metrics.Gauge("db_pool_checkouts", "풀 커넥션 획득 횟수 (since 이후, 결과별)", ("result",))
+DB_POOL_WAIT_SECONDS = metrics.Gauge("db_pool_wait_seconds", "풀 커넥션 획득 대기 시간 합계 (since 이후)")
+
+
+@metrics.on_collect
+def _collect_pool_metrics():
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return
+    DB_POOL_CONNECTIONS.set(pool.checkedout(), state="checked_out")
+    DB_POOL_CONNECTIONS.set(pool.checkedin(), state="checked_in")
+    DB_POOL_CONNECTIONS.set(max(pool.overflow(), 0), state="overflow")
+    DB_POOL_CONNECTIONS.set(pool.size() + max(pool._max_overflow, 0), state="capacity")
+    DB_POOL_CHECKOUTS.set(pool.stats.checkouts, result="ok")
+    DB_POOL_CHECKOUTS.set(pool.stats.slow_checkouts, result="slow")
+    DB_POOL_CHECKOUTS.set(pool.stats.timeouts, result="timeout")
+    DB_POOL_WAIT_SECONDS.set(pool.stats.wait_seconds_total)
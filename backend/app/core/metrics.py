@@ -0,0 +1,211 @@
+"""성능 지표 (Prometheus text format - GET /metrics)
+
+외부 서비스/라이브러리 없이 프로세스 메모리에 누적한다.
+- 값은 프로세스별 (uvicorn worker 가 여럿이면 worker 마다 따로 수집됨)
+- Celery worker 에서 실행된 출력 작업은 API 프로세스의 /metrics 에 포함되지 않는다
+- client 라벨은 client_code (거래처 수만큼만 늘어남) - 월말 거래처별 DN 생성/출력 시간 비교용
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+from app.core.query_stats import current_query_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+BYTES_BUCKETS = (10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000, 50_000_000)
+
+_metrics: list["_Metric"] = []
+_collect_hooks: list[Callable[[], None]] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), *, register: bool = True):
+        """register=False: /metrics 출력에 포함하지 않음 (테스트용)"""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()  # 출력 작업 스레드(EXPORT_QUEUE=thread)에서도 기록됨
+        if register:
+            _metrics.append(self)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return super().render() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    """현재 값 - on_collect 훅에서 갱신"""
+    type_name = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS, *, register: bool = True):
+        super().__init__(name, documentation, labelnames, register=register)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: dict[tuple, list] = {}  # 라벨 → [버킷별 개수..., 합계]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = super().render()
+        names = self.labelnames + ("le",)
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def on_collect(hook: Callable[[], None]) -> Callable[[], None]:
+    """/metrics 출력 직전에 호출할 Gauge 갱신 함수 등록 (데코레이터)"""
+    _collect_hooks.append(hook)
+    return hook
+
+
+def render_metrics() -> str:
+    for hook in _collect_hooks:
+        hook()
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ── 지표 정의 ──
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "API 응답 시간 (라우트 경로 템플릿별)", ("method", "route", "status"),
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "요청 1건의 SQL 실행 시간 합계", ("method", "route"),
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "요청 1건의 SQL 쿼리 수", ("method", "route"), buckets=COUNT_BUCKETS,
+)
+DEBIT_NOTE_CREATE_SECONDS = Histogram(
+    "debit_note_create_seconds", "Debit Note 생성(라인 계산 포함) 시간", ("client",),
+)
+DEBIT_NOTE_LINES = Histogram(
+    "debit_note_lines", "생성된 Debit Note 의 라인 수", ("client",), buckets=COUNT_BUCKETS,
+)
+EXPORT_GENERATION_SECONDS = Histogram(
+    "export_generation_seconds", "Excel 출력 파일 생성 시간 (캐시 적중 제외)", ("client", "mode"),
+)
+EXPORT_FILE_BYTES = Histogram(
+    "export_file_bytes", "생성된 Excel 파일 크기", ("client",), buckets=BYTES_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "캐시 조회 결과 (hit/miss)", ("cache", "result"),
+)
+
+
+# ── 미들웨어 ──
+
+class MetricsMiddleware:
+    """요청별 응답 시간 / DB 시간 기록 (순수 ASGI)
+
+    QueryStatsMiddleware 안쪽에 두어야 요청의 쿼리 집계를 읽을 수 있다.
+    route 라벨은 경로 템플릿 (/api/v1/debit-notes/{debit_note_id}) - 매칭 안 된 요청은 "unmatched"
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, method=scope["method"], route=route_path, status=status_code,
+            )
+            stats = current_query_stats()
+            if stats is not None:
+                HTTP_REQUEST_DB_SECONDS.observe(stats.db_seconds, method=scope["method"], route=route_path)
+                HTTP_REQUEST_DB_QUERIES.observe(stats.count, method=scope["method"], route=route_path)
@@ -0,0 +1,91 @@
+"""목록 API 페이지네이션 - keyset 커서 + count 모드
+
+offset 방식은 깊은 페이지일수록 건너뛴 행을 모두 읽으므로 커서(마지막 행의 정렬 키)로 이어서 조회한다.
+- 정렬: (정렬 컬럼 DESC NULLS FIRST, PK DESC) - (정렬 컬럼, PK) 인덱스 역방향 스캔과 일치
+  (DN 라인처럼 오름차순 목록은 호출 측에서 행 값 비교로 처리)
+- cursor: 마지막 행의 (정렬 값, PK) 를 base64url(JSON) 로 인코딩한 불투명 문자열
+- count: exact(count(*)) / estimated(PostgreSQL 통계 추정) / none(생략)
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, func, or_, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+COUNT_MODE_PATTERN = "^(exact|estimated|none)$"
+
+
+def encode_cursor(sort_value: Any, key: int) -> str:
+    if isinstance(sort_value, date):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, key])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parse: Callable[[str], Any]) -> tuple[Any, int]:
+    """cursor → (정렬 값, PK). 형식이 잘못되면 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, key = json.loads(raw)
+        return (parse(sort_value) if sort_value is not None else None), int(key)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def keyset_order(sort_col, key_col) -> tuple:
+    return sort_col.desc().nulls_first(), key_col.desc()
+
+
+def keyset_after(query: Select, sort_col, key_col, sort_value, key: int) -> Select:
+    """keyset_order 기준으로 (sort_value, key) 다음 행부터"""
+    if sort_value is None:
+        # NULL 구간 안: 같은 NULL 중 PK 가 작은 행 + NULL 이 아닌 모든 행
+        return query.where(or_(
+            and_(sort_col.is_(None), key_col < key),
+            sort_col.is_not(None),
+        ))
+    # 행 값 비교 - PostgreSQL 은 (sort_col, key_col) 인덱스 범위 스캔으로 처리
+    return query.where(tuple_(sort_col, key_col) < tuple_(sort_value, key))
+
+
+async def count_rows(db: AsyncSession, count_query: Select, table_name: str, mode: str) -> Optional[int]:
+    """count 모드별 전체 건수 (none → None)
+
+    estimated: PostgreSQL 에서 필터가 없으면 pg_class.reltuples, 있으면 EXPLAIN 예상 행 수.
+    통계가 없거나(ANALYZE 전) 다른 DB 이면 exact 로 계산한다.
+    """
+    if mode == "none":
+        return None
+    if mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        estimate = await _estimate_count(db, count_query, table_name)
+        if estimate is not None:
+            return estimate
+    return (await db.execute(
+        count_query.with_only_columns(func.count(), maintain_column_froms=True)
+    )).scalar()
+
+
+async def _estimate_count(db: AsyncSession, count_query: Select, table_name: str) -> Optional[int]:
+    if count_query.whereclause is None:
+        reltuples = (await db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"), {"name": table_name}
+        )).scalar()
+        return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+    # 필터 값은 Query 검증을 거친 int/str 이므로 리터럴로 컴파일해 EXPLAIN
+    sql = str(count_query.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+    plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
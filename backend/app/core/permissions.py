@@ -0,0 +1,106 @@
+"""권한 비트마스크 (FR-002)
+
+roles → role_permissions → permissions 를 역할별 정수 비트마스크로 미리 계산해 두고,
+require_permission("debit_note:approve") 는 요청마다 DB 조회 없이 비트 연산으로 판정한다.
+- 비트 위치 = permission_id (프로세스 간 동일)
+- 비활성 역할(is_active=False)은 권한 없음
+- 갱신: 역할/권한/매핑 변경 커밋 시 stale 표시 → 다음 권한 확인 때 재계산.
+  다른 프로세스의 변경은 PERMISSION_REFRESH_SECONDS 주기로 반영
+- 시작 시 로드하지 않는다 (seed 전 빈 DB 로도 기동). 첫 권한 확인 때 로드하고,
+  권한이 하나도 없으면(seed 전) 매번 다시 로드
+"""
+import time
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.principal_cache import Principal
+from app.core.security import get_current_user
+from app.models.user import Permission, Role, RolePermission
+
+
+class PermissionRegistry:
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self.bits: dict[str, int] = {}  # permission_name → 1 << permission_id
+        self.role_masks: dict[int, int] = {}  # role_id → 보유 권한 비트 OR
+        self.stale = True
+        self._loaded_at = 0.0
+
+    def needs_reload(self) -> bool:
+        return self.stale or not self.bits or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    async def load(self, db: AsyncSession):
+        """권한/역할-권한 매핑 2회 조회로 전체 재계산"""
+        self.stale = False  # 조회 중 변경 커밋되면 다시 stale
+        permissions = (await db.execute(select(Permission.permission_id, Permission.permission_name))).all()
+        mappings = (await db.execute(
+            select(RolePermission.role_id, RolePermission.permission_id)
+            .join(Role, Role.role_id == RolePermission.role_id)
+            .where(Role.is_active.is_(True))
+        )).all()
+
+        role_masks: dict[int, int] = {}
+        for role_id, permission_id in mappings:
+            role_masks[role_id] = role_masks.get(role_id, 0) | (1 << permission_id)
+        self.bits = {name: 1 << permission_id for permission_id, name in permissions}
+        self.role_masks = role_masks
+        self._loaded_at = time.monotonic()
+
+    def has_permission(self, role_id: int, permission_name: str) -> bool:
+        bit = self.bits.get(permission_name)
+        return bit is not None and bool(self.role_masks.get(role_id, 0) & bit)
+
+    def permissions_of(self, role_id: int) -> list[str]:
+        mask = self.role_masks.get(role_id, 0)
+        return sorted(name for name, bit in self.bits.items() if mask & bit)
+
+
+permission_registry = PermissionRegistry(refresh_seconds=settings.PERMISSION_REFRESH_SECONDS)
+
+
+async def check_permission(db: AsyncSession, current_user: Principal, permission_name: str):
+    """권한 확인 - 없으면 403 (요청 내용에 따라 필요한 권한이 달라지는 API 에서 직접 호출)"""
+    # 세션은 실제 조회 시에만 커넥션을 잡으므로 재계산이 필요 없으면 DB 접근 없음
+    if permission_registry.needs_reload():
+        await permission_registry.load(db)
+    if not permission_registry.has_permission(current_user.role.role_id, permission_name):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Access denied. Required permission: {permission_name}",
+        )
+
+
+def require_permission(permission_name: str):
+    """권한 기반 접근 제어 (예: require_permission("debit_note:approve"))"""
+    async def permission_checker(
+        current_user: Principal = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db),
+    ):
+        await check_permission(db, current_user, permission_name)
+        return current_user
+    return permission_checker
+
+
+# ── 변경 감지 ──
+
+@event.listens_for(Session, "after_flush")
+def _collect_permission_changes(session: Session, flush_context):
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, (Permission, Role, RolePermission)) for obj in changed):
+        session.info["permission_registry_stale"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_registry_stale(session: Session):
+    if session.info.pop("permission_registry_stale", False):
+        permission_registry.stale = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_permission_changes(session: Session):
+    session.info.pop("permission_registry_stale", None)
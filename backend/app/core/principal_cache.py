@@ -0,0 +1,220 @@
+"""인증 사용자(principal) 캐시 (NFR-004)
+
+get_current_user 가 요청마다 users + roles 를 조회하지 않도록 (user_id, 토큰) 단위로 짧게 캐시한다.
+- 1차: 프로세스 내 dict (AUTH_CACHE_TTL_SECONDS)
+- 2차: Redis (AUTH_CACHE_REDIS=true 일 때, 프로세스 간 공유)
+
+무효화: 사용자 표시/권한 컬럼, 역할, 역할-권한 매핑이 변경되어 커밋되면 세대(generation)를 올려
+전체 캐시를 버린다. 변경이 드물어 사용자별 무효화 대신 전체 무효화로 단순화.
+ORM 을 거치지 않는 일괄 UPDATE 는 invalidate() 를 직접 호출해야 한다.
+다른 프로세스의 1차 캐시는 TTL 동안 이전 값을 볼 수 있다 (Redis 사용 시 2차는 즉시 반영).
+Redis 버전 증가는 after_commit 훅(이벤트 루프 위)을 막지 않도록 비동기 클라이언트로 예약해서 보낸다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Optional
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.models.user import Role, RolePermission, User
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "auth:principal"
+REDIS_VERSION_KEY = f"{REDIS_PREFIX}:version"
+# 이 컬럼이 바뀔 때만 무효화 (last_login 등은 제외 - 로그인마다 캐시를 버리지 않도록)
+USER_PRINCIPAL_FIELDS = ("username", "email", "full_name", "hashed_password", "role_id", "is_active")
+
+
+@dataclass(frozen=True)
+class PrincipalRole:
+    role_id: int
+    role_name: str
+
+
+@dataclass(frozen=True)
+class Principal:
+    """요청 처리에 필요한 사용자 정보 (User ORM 객체 대신 반환, 세션에 묶이지 않음)"""
+    user_id: int
+    username: str
+    email: str
+    full_name: str
+    is_active: bool
+    role: PrincipalRole
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            user_id=user.user_id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            role=PrincipalRole(role_id=user.role.role_id, role_name=user.role.role_name),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Principal":
+        return cls(**{**data, "role": PrincipalRole(**data["role"])})
+
+
+class PrincipalCache:
+    def __init__(self, ttl_seconds: int, redis_url: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self.generation = 0
+        self._entries: dict[str, tuple[float, Principal]] = {}
+        self._redis: Optional[aioredis.Redis] = None
+        self._pending: set[asyncio.Task] = set()  # 예약한 버전 증가 (완료 전 GC 방지)
+
+    @staticmethod
+    def _key(user_id: int, token: str) -> str:
+        return f"{user_id}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    async def get_or_load(
+        self,
+        user_id: int,
+        token: str,
+        loader: Callable[[], Awaitable[Optional[Principal]]],
+    ) -> Optional[Principal]:
+        """캐시 조회, 없으면 loader 로 DB 조회 후 저장 (활성 사용자만 저장)"""
+        if self.ttl_seconds <= 0:
+            return await loader()
+
+        key = self._key(user_id, token)
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            CACHE_REQUESTS.inc(cache="principal", result="hit")
+            return entry[1]
+
+        generation = self.generation
+        principal, redis_version = await self._redis_get(key)
+        CACHE_REQUESTS.inc(cache="principal", result="miss" if principal is None else "redis_hit")
+        if principal is None:
+            principal = await loader()
+            if principal is None or not principal.is_active:
+                return principal
+            await self._redis_set(key, principal, redis_version)
+
+        # 조회 중 무효화되었으면 저장하지 않음 (이전 상태를 다시 캐시하지 않도록)
+        if generation == self.generation:
+            if len(self._entries) >= settings.AUTH_CACHE_MAX_ENTRIES:
+                self._entries.clear()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+        return principal
+
+    def invalidate(self):
+        """전체 무효화 - 1차는 비우고, Redis 는 버전을 올려 기존 항목을 무효화
+
+        커밋 훅에서 불리므로 Redis 왕복을 기다리지 않는다: 이벤트 루프 위면 버전 증가를 태스크로 예약,
+        루프 밖(동기 스크립트)이면 바로 보낸다.
+        """
+        self.generation += 1
+        self._entries.clear()
+        if not self.redis_url:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._incr_version_sync()
+            return
+        task = loop.create_task(self._incr_version())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _incr_version(self):
+        try:
+            await self._client().incr(REDIS_VERSION_KEY)
+        except redis.RedisError:
+            # 다른 프로세스의 2차 캐시는 TTL 경과 후 만료됨
+            logger.warning("Principal cache: Redis version bump failed", exc_info=True)
+
+    def _incr_version_sync(self):
+        try:
+            with redis.Redis.from_url(self.redis_url, socket_timeout=1) as r:
+                r.incr(REDIS_VERSION_KEY)
+        except redis.RedisError:
+            logger.warning("Principal cache: Redis version bump failed", exc_info=True)
+
+    # ── Redis (2차) ──
+
+    def _client(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url, socket_timeout=1)
+        return self._redis
+
+    async def _redis_get(self, key: str) -> tuple[Optional[Principal], Optional[bytes]]:
+        """→ (principal, 현재 버전). 항목 버전이 현재 버전과 다르면 miss"""
+        if not self.redis_url:
+            return None, None
+        try:
+            raw, version = await self._client().mget(f"{REDIS_PREFIX}:{key}", REDIS_VERSION_KEY)
+        except redis.RedisError:
+            return None, None
+        version = version or b"0"
+        if raw:
+            data = json.loads(raw)
+            if data.pop("version").encode() == version:
+                return Principal.from_dict(data), version
+        return None, version
+
+    async def _redis_set(self, key: str, principal: Principal, version: Optional[bytes]):
+        if not self.redis_url or version is None:
+            return
+        # DB 조회 전에 읽은 버전으로 저장 - 그 사이 무효화되었으면 다음 조회에서 miss
+        data = {**asdict(principal), "version": version.decode()}
+        try:
+            await self._client().set(f"{REDIS_PREFIX}:{key}", json.dumps(data), ex=self.ttl_seconds)
+        except redis.RedisError:
+            pass
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL if settings.AUTH_CACHE_REDIS else None,
+)
+
+
+# ── 무효화 (ORM 변경 감지) ──
+
+def _affects_principal(session: Session) -> bool:
+    for obj in session.deleted:
+        if isinstance(obj, (User, Role, RolePermission)):
+            return True
+    for obj in session.new:
+        if isinstance(obj, (Role, RolePermission)):
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, (Role, RolePermission)):
+            return True
+        if isinstance(obj, User):
+            state = inspect(obj)
+            if any(state.attrs[field].history.has_changes() for field in USER_PRINCIPAL_FIELDS):
+                return True
+    return False
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session: Session, flush_context):
+    if _affects_principal(session):
+        session.info["principal_cache_stale"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session: Session):
+    if session.info.pop("principal_cache_stale", False):
+        principal_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session: Session):
+    session.info.pop("principal_cache_stale", None)
@@ -0,0 +1,167 @@
+"""요청별 SQL 쿼리 집계 / N+1 감지
+
+SQLAlchemy before/after_cursor_execute 이벤트로 요청 하나의 쿼리 수, DB 시간, 반복 실행된 문장을 센다.
+- 응답 헤더 (QUERY_STATS_HEADERS): X-DB-Query-Count, X-DB-Time-Ms, X-DB-Repeated-Queries
+- 로그: 같은 문장 지문이 QUERY_REPEAT_THRESHOLD 회 이상(N+1 의심) 또는 쿼리 예산 초과 시 WARNING
+- 쿼리 예산: QUERY_BUDGET (0 = 제한 없음), 요청 헤더 X-Query-Budget 으로 요청별 지정 가능
+  QUERY_BUDGET_ENFORCE=true (테스트 모드) 면 예산 초과 응답을 500 으로 바꾼다
+
+문장 지문 = 리터럴/바인드 파라미터/IN 목록을 ? 로 바꾼 정규화 SQL (선적별 SELECT 반복이 하나로 묶임)
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_FINGERPRINT_RULES = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # 문자열 리터럴
+    (re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+|\?"), "?"),  # 바인드 파라미터 (asyncpg / pyformat / named / qmark)
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),  # 숫자 리터럴
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),  # IN (?, ?, ...) / VALUES (?, ?)
+    (re.compile(r"\s+"), " "),
+]
+
+
+def fingerprint(statement: str) -> str:
+    for pattern, replacement in _FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    db_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)  # 지문 → 실행 횟수
+
+    def repeated(self, threshold: Optional[int] = None) -> list[tuple[str, int]]:
+        """threshold 회 이상 실행된 문장 (많은 순)"""
+        threshold = threshold or settings.QUERY_REPEAT_THRESHOLD
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """현재 요청(또는 track_queries 블록)의 집계 - 집계 중이 아니면 None"""
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """블록 안에서 실행된 쿼리 집계 (요청 밖 - 배치/테스트용)"""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_stats_started")
+    if stats is None or not started:
+        return
+    stats.count += 1
+    stats.db_seconds += time.perf_counter() - started.pop()
+    stats.statements[fingerprint(statement)] += 1
+
+
+# ── 미들웨어 ──
+
+class QueryStatsMiddleware:
+    """요청마다 QueryStats 를 만들어 응답 시작 시점에 헤더/로그/예산 판정 (순수 ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        budget = _request_budget(scope)
+        over_budget = False
+
+        async def send_with_stats(message):
+            nonlocal over_budget
+            if message["type"] == "http.response.start":
+                stats = _current.get()
+                over_budget = bool(budget) and stats.count > budget
+                _log_request(scope, stats, budget, over_budget)
+                if over_budget and settings.QUERY_BUDGET_ENFORCE:
+                    await _send_budget_error(send, stats, budget)
+                    return
+                if settings.QUERY_STATS_HEADERS:
+                    message["headers"] = list(message.get("headers", [])) + _stats_headers(stats)
+            elif over_budget and settings.QUERY_BUDGET_ENFORCE:
+                return  # 원래 응답 본문 버림
+            await send(message)
+
+        with track_queries():
+            await self.app(scope, receive, send_with_stats)
+
+
+def _request_budget(scope) -> int:
+    for name, value in scope.get("headers", []):
+        if name == b"x-query-budget":
+            try:
+                return int(value)
+            except ValueError:
+                break
+    return settings.QUERY_BUDGET
+
+
+def _stats_headers(stats: QueryStats) -> list[tuple[bytes, bytes]]:
+    return [
+        (b"x-db-query-count", str(stats.count).encode()),
+        (b"x-db-time-ms", f"{stats.db_seconds * 1000:.1f}".encode()),
+        (b"x-db-repeated-queries", str(len(stats.repeated())).encode()),
+    ]
+
+
+def _log_request(scope, stats: QueryStats, budget: int, over_budget: bool):
+    repeated = stats.repeated()
+    if not repeated and not over_budget:
+        return
+    logger.warning(
+        "%s %s: %d queries, %.1f ms%s%s",
+        scope["method"], scope["path"], stats.count, stats.db_seconds * 1000,
+        f" (budget {budget} exceeded)" if over_budget else "",
+        "".join(f"\n  x{n} {sql[:300]}" for sql, n in repeated[:5]),
+    )
+
+
+async def _send_budget_error(send, stats: QueryStats, budget: int):
+    body = json.dumps({
+        "detail": f"Query budget exceeded: {stats.count} queries (budget {budget})",
+        "repeated": [{"count": n, "statement": sql} for sql, n in stats.repeated()],
+    }).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 500,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        + _stats_headers(stats),
+    })
+    await send({"type": "http.response.body", "body": body})
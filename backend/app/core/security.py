@@ -2,8 +2,10 @@
 
 - 액세스 토큰: 15분
 - 리프레시 토큰: 7일
-- bcrypt 비밀번호 해싱
+- bcrypt 비밀번호 해싱 (async 핸들러에서는 전용 스레드풀 사용)
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -17,6 +19,7 @@ from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.principal_cache import Principal, principal_cache
 from app.models.user import User
 
 SECRET_KEY = "eximuni-debit-note-secret-key-change-in-production-2026"
@@ -28,6 +31,13 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+# bcrypt 는 연산 중 GIL 을 놓으므로 스레드에서 병렬 실행된다.
+# 기본 executor 와 분리해 로그인 폭주가 다른 to_thread 작업을 밀어내지 않도록 한다.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash",
+)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -36,6 +46,17 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password 를 이벤트 루프 밖(전용 스레드풀)에서 실행 (~100-250ms/회)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -58,7 +79,11 @@ def create_refresh_token(data: dict) -> str:
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> Principal:
+    """토큰 검증 + 사용자 조회 (principal_cache 적중 시 DB 조회 없음)
+
+    반환값은 User ORM 객체가 아닌 Principal (user_id, username, email, full_name, is_active, role)
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -74,22 +99,31 @@ async def get_current_user(
     except (JWTError, ValueError):
         raise credentials_exception
 
-    result = await db.execute(
-        select(User).options(selectinload(User.role)).where(User.user_id == user_id)
-    )
-    user = result.scalar_one_or_none()
-    if user is None or not user.is_active:
+    async def load_principal() -> Optional[Principal]:
+        result = await db.execute(
+            select(User).options(selectinload(User.role)).where(User.user_id == user_id)
+        )
+        user = result.scalar_one_or_none()
+        return Principal.from_user(user) if user else None
+
+    principal = await principal_cache.get_or_load(user_id, token, load_principal)
+    if principal is None or not principal.is_active:
         raise credentials_exception
-    return user
+    return principal
+
+
+def check_role(current_user: Principal, *allowed_roles: str):
+    """역할 확인 - 허용 역할이 아니면 403"""
+    if current_user.role.role_name not in allowed_roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Access denied. Required role: {', '.join(allowed_roles)}",
+        )
 
 
 def require_role(*allowed_roles: str):
     """역할 기반 접근 제어 데코레이터 (FR-002)"""
-    async def role_checker(current_user: User = Depends(get_current_user)):
-        if current_user.role.role_name not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required role: {', '.join(allowed_roles)}",
-            )
+    async def role_checker(current_user: Principal = Depends(get_current_user)):
+        check_role(current_user, *allowed_roles)
         return current_user
     return role_checker
@@ -2,12 +2,11 @@
 import asyncio
 from datetime import date
 from sqlalchemy import select
-from passlib.context import CryptContext
 
 from app.core.database import async_session, engine, Base
+from app.core.security import get_password_hash_async
 from app.models import *
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services import reference_data  # noqa: F401 - 기준 데이터 버전 증가 리스너 등록
 
 
 async def seed_roles():
@@ -105,26 +104,31 @@ async def seed_users():
             return
 
         roles = {r.role_name: r for r in (await session.execute(select(Role))).scalars().all()}
+        admin_hash, accountant_hash, pic_hash = await asyncio.gather(
+            get_password_hash_async("admin123"),
+            get_password_hash_async("account123"),
+            get_password_hash_async("pic123"),
+        )
 
         users = [
             User(
                 username="admin",
                 email="admin@eximuni.com",
-                hashed_password=pwd_context.hash("admin123"),
+                hashed_password=admin_hash,
                 full_name="System Admin",
                 role_id=roles["admin"].role_id,
             ),
             User(
                 username="accountant1",
                 email="accountant@eximuni.com",
-                hashed_password=pwd_context.hash("account123"),
+                hashed_password=accountant_hash,
                 full_name="Nguyen Van A",
                 role_id=roles["accountant"].role_id,
             ),
             User(
                 username="pic1",
                 email="pic@eximuni.com",
-                hashed_password=pwd_context.hash("pic123"),
+                hashed_password=pic_hash,
                 full_name="Tran Thi B",
                 role_id=roles["pic"].role_id,
             ),
@@ -2,14 +2,18 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.core.query_stats import QueryStatsMiddleware
 from app.api.health import router as health_router
 from app.api.auth import router as auth_router
 from app.api.clients import router as clients_router
 from app.api.shipments import router as shipments_router
 from app.api.debit_notes import router as debit_notes_router
+from app.api.batch_runs import router as batch_runs_router
 from app.api.exchange_rates import router as exchange_rates_router
 from app.api.fees import router as fees_router
 from app.api.excel_export import router as excel_export_router
+from app.api.metrics import prometheus_router, router as metrics_router
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -26,6 +30,8 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["Content-Disposition"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)  # 바깥쪽 - MetricsMiddleware 가 요청 쿼리 집계를 읽음
 
 # API Routers
 app.include_router(health_router, prefix="/api", tags=["health"])
@@ -33,9 +39,12 @@ app.include_router(auth_router)
 app.include_router(clients_router)
 app.include_router(shipments_router)
 app.include_router(debit_notes_router)
+app.include_router(batch_runs_router)
 app.include_router(exchange_rates_router)
 app.include_router(fees_router)
 app.include_router(excel_export_router)
+app.include_router(metrics_router)
+app.include_router(prometheus_router)
 
 
 @app.get("/")
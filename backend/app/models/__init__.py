@@ -2,18 +2,20 @@ from app.models.user import Role, User, Permission, RolePermission
 from app.models.client import Client, ClientTemplate, ClientFeeMapping
 from app.models.fee import FeeCategory, FeeItem
 from app.models.exchange_rate import ExchangeRate, ClientExchangeRate
-from app.models.shipment import Shipment, ShipmentFeeDetail, DuplicateDetection
-from app.models.debit_note import DebitNote, DebitNoteLine, DebitNoteWorkflow
+from app.models.shipment import Shipment, ShipmentFeeDetail, ShipmentReferenceKey, DuplicateDetection
+from app.models.debit_note import (
+    DebitNote, DebitNoteLine, DebitNoteWorkflow, DebitNoteBatchRun, DebitNoteBatchRunItem,
+)
 from app.models.validation import ValidationRule, ValidationLog
-from app.models.audit import DebitNoteExport, AuditLog, SystemLog
+from app.models.audit import DebitNoteExport, AuditLog, SystemLog, ReferenceDataVersion
 
 __all__ = [
     "Role", "User", "Permission", "RolePermission",
     "Client", "ClientTemplate", "ClientFeeMapping",
     "FeeCategory", "FeeItem",
     "ExchangeRate", "ClientExchangeRate",
-    "Shipment", "ShipmentFeeDetail", "DuplicateDetection",
-    "DebitNote", "DebitNoteLine", "DebitNoteWorkflow",
+    "Shipment", "ShipmentFeeDetail", "ShipmentReferenceKey", "DuplicateDetection",
+    "DebitNote", "DebitNoteLine", "DebitNoteWorkflow", "DebitNoteBatchRun", "DebitNoteBatchRunItem",
     "ValidationRule", "ValidationLog",
-    "DebitNoteExport", "AuditLog", "SystemLog",
+    "DebitNoteExport", "AuditLog", "SystemLog", "ReferenceDataVersion",
 ]
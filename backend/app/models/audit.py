@@ -1,7 +1,7 @@
 """감사 로그 및 출력 관리 모델 (NFR-006, NFR-011)"""
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, BigInteger
+    Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, BigInteger, Index
 )
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -10,6 +10,10 @@ from app.core.database import Base
 class DebitNoteExport(Base):
     """Debit Note Excel 출력 기록 (FR-021)"""
     __tablename__ = "debit_note_exports"
+    __table_args__ = (
+        Index("ix_debit_note_exports_debit_note_id", "debit_note_id", "exported_at"),
+        Index("ix_debit_note_exports_content_hash", "debit_note_id", "content_hash"),
+    )
 
     export_id = Column(Integer, primary_key=True, autoincrement=True)
     debit_note_id = Column(Integer, ForeignKey("debit_notes.debit_note_id", ondelete="CASCADE"), nullable=False)
@@ -18,7 +22,9 @@ class DebitNoteExport(Base):
     file_size = Column(BigInteger)
     file_format = Column(String(20), default="xlsx")
     export_status = Column(String(50), default="PENDING")  # PENDING, GENERATING, COMPLETED, FAILED
+    content_hash = Column(String(64))  # 출력 캐시 키 / ETag (DN 내용 + 템플릿 + 생성기 버전)
     error_message = Column(Text)
+    claimed_at = Column(DateTime)  # GENERATING 선점 시각 (EXPORT_JOB_STALE_SECONDS 지나면 재선점 가능)
     exported_by = Column(Integer, ForeignKey("users.user_id"))
     exported_at = Column(DateTime, default=datetime.utcnow)
 
@@ -57,3 +63,12 @@ class SystemLog(Base):
     user_id = Column(Integer, ForeignKey("users.user_id"))
     ip_address = Column(String(50))
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ReferenceDataVersion(Base):
+    """기준 데이터 테이블별 버전 - 변경 트랜잭션에서 +1 (프로세스 간 캐시 무효화, reference_data 서비스)"""
+    __tablename__ = "reference_data_versions"
+
+    table_name = Column(String(100), primary_key=True)  # fee_categories, fee_items, client_templates, client_fee_mappings
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
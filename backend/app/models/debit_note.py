@@ -1,7 +1,7 @@
 """Debit Note 모델 (FR-015 ~ FR-032)"""
 from datetime import datetime, date
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Date, Text
+    Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Date, Text, Index, UniqueConstraint
 )
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -14,6 +14,11 @@ class DebitNote(Base):
     번호 형식: DN-YYYYMM-XXXXX
     """
     __tablename__ = "debit_notes"
+    __table_args__ = (
+        Index("ix_debit_notes_created_at", "created_at", "debit_note_id"),
+        Index("ix_debit_notes_client_created_at", "client_id", "created_at"),
+        Index("ix_debit_notes_status_created_at", "status", "created_at"),
+    )
 
     debit_note_id = Column(Integer, primary_key=True, autoincrement=True)
     debit_note_number = Column(String(100), unique=True)  # DN-YYYYMM-XXXXX (트리거 자동생성)
@@ -66,6 +71,10 @@ class DebitNote(Base):
 class DebitNoteLine(Base):
     """Debit Note 라인 항목 - 각 선적별 비용 상세"""
     __tablename__ = "debit_note_lines"
+    __table_args__ = (
+        Index("ix_debit_note_lines_debit_note_id", "debit_note_id", "line_no"),
+        Index("ix_debit_note_lines_shipment_id", "shipment_id"),
+    )
 
     line_id = Column(Integer, primary_key=True, autoincrement=True)
     debit_note_id = Column(Integer, ForeignKey("debit_notes.debit_note_id", ondelete="CASCADE"), nullable=False)
@@ -98,6 +107,9 @@ class DebitNoteLine(Base):
 class DebitNoteWorkflow(Base):
     """Debit Note 승인/거절 워크플로우 이력 (FR-031, FR-032)"""
     __tablename__ = "debit_note_workflows"
+    __table_args__ = (
+        Index("ix_debit_note_workflows_debit_note_id", "debit_note_id", "created_at"),
+    )
 
     workflow_id = Column(Integer, primary_key=True, autoincrement=True)
     debit_note_id = Column(Integer, ForeignKey("debit_notes.debit_note_id", ondelete="CASCADE"), nullable=False)
@@ -109,3 +121,63 @@ class DebitNoteWorkflow(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     debit_note = relationship("DebitNote", back_populates="workflows")
+
+
+class DebitNoteBatchRun(Base):
+    """월말 일괄 생성 실행 (거래처 전체 또는 Client.batch 그룹의 DRAFT DN 생성)
+
+    상태 플로우: PENDING → RUNNING → COMPLETED (거래처별 실패는 항목에 기록) / FAILED (실행 자체 오류)
+    worker 가 중단되어 RUNNING 에 남은 실행은 재전달 시 다시 선점되어 남은 PENDING 항목부터 이어서 처리
+    진행률: processed_clients / total_clients
+    """
+    __tablename__ = "debit_note_batch_runs"
+    __table_args__ = (
+        Index("ix_debit_note_batch_runs_created_at", "created_at"),
+    )
+
+    run_id = Column(Integer, primary_key=True, autoincrement=True)
+    period_from = Column(Date, nullable=False)
+    period_to = Column(Date, nullable=False)
+    sheet_type = Column(String(20), default="ALL")  # IMPORT, EXPORT, ALL
+    client_batch = Column(String(20))  # Client.batch (없으면 활성 거래처 전체)
+    exchange_rate = Column(Numeric(15, 2))  # 없으면 거래처별 period_to 기준 환율
+    notes = Column(Text)  # 생성되는 DN 의 notes
+    status = Column(String(50), default="PENDING")  # PENDING, RUNNING, COMPLETED, FAILED
+
+    # 진행 상황
+    total_clients = Column(Integer, default=0)
+    processed_clients = Column(Integer, default=0)
+    created_count = Column(Integer, default=0)
+    skipped_count = Column(Integer, default=0)  # 기간 내 ACTIVE 거래 없음
+    failed_count = Column(Integer, default=0)
+    error_message = Column(Text)
+
+    created_by = Column(Integer, ForeignKey("users.user_id"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)  # 선점/항목 기록 시각 (BATCH_RUN_STALE_SECONDS 지나면 재선점 가능)
+    finished_at = Column(DateTime)
+
+    items = relationship(
+        "DebitNoteBatchRunItem", back_populates="run", cascade="all, delete-orphan",
+        order_by="DebitNoteBatchRunItem.item_id",
+    )
+
+
+class DebitNoteBatchRunItem(Base):
+    """일괄 생성 실행의 거래처별 결과"""
+    __tablename__ = "debit_note_batch_run_items"
+    __table_args__ = (
+        UniqueConstraint("run_id", "client_id", name="uq_debit_note_batch_run_items_run_client"),
+    )
+
+    item_id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(Integer, ForeignKey("debit_note_batch_runs.run_id", ondelete="CASCADE"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.client_id"), nullable=False)
+    status = Column(String(50), default="PENDING")  # PENDING, CREATED, SKIPPED, FAILED
+    debit_note_id = Column(Integer, ForeignKey("debit_notes.debit_note_id", ondelete="SET NULL"))
+    total_lines = Column(Integer)
+    error = Column(Text)
+    finished_at = Column(DateTime)
+
+    run = relationship("DebitNoteBatchRun", back_populates="items")
@@ -1,7 +1,7 @@
 """거래 데이터 모델 (FR-007 ~ FR-011) - Master Data"""
 from datetime import datetime, date
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Date, Text, JSON
+    Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Date, Text, JSON, Index, UniqueConstraint, text
 )
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -15,6 +15,15 @@ class Shipment(Base):
     J(CD No.), K(CD Type), L(Air rate/Ocean freight)
     """
     __tablename__ = "shipments"
+    __table_args__ = (
+        # create_debit_note: 거래처 + 기간 내 ACTIVE 거래
+        Index(
+            "ix_shipments_active_client_delivery", "client_id", "delivery_date", "shipment_type",
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+        Index("ix_shipments_client_status_delivery", "client_id", "status", "delivery_date"),
+        Index("ix_shipments_delivery_date", "delivery_date", "shipment_id"),
+    )
 
     shipment_id = Column(Integer, primary_key=True, autoincrement=True)
     client_id = Column(Integer, ForeignKey("clients.client_id"), nullable=False)
@@ -56,11 +65,18 @@ class Shipment(Base):
     client = relationship("Client", back_populates="shipments")
     fee_details = relationship("ShipmentFeeDetail", back_populates="shipment", cascade="all, delete-orphan")
     debit_note_lines = relationship("DebitNoteLine", back_populates="shipment")
+    reference_keys = relationship("ShipmentReferenceKey", back_populates="shipment", cascade="all, delete-orphan")
 
 
 class ShipmentFeeDetail(Base):
     """선적별 비용 상세 - 각 비용 항목별 금액 (컬럼 M-AT)"""
     __tablename__ = "shipment_fee_details"
+    __table_args__ = (
+        Index(
+            "ix_shipment_fee_details_shipment_id", "shipment_id",
+            postgresql_include=["fee_item_id", "amount_usd"],
+        ),
+    )
 
     detail_id = Column(Integer, primary_key=True, autoincrement=True)
     shipment_id = Column(Integer, ForeignKey("shipments.shipment_id", ondelete="CASCADE"), nullable=False)
@@ -82,9 +98,35 @@ class ShipmentFeeDetail(Base):
     fee_item = relationship("FeeItem", back_populates="shipment_fee_details")
 
 
+class ShipmentReferenceKey(Base):
+    """선적 참조번호 정규화 키 (FR-009) - 중복 감지 전용 조회 테이블
+
+    선적 1건당 HBL/MBL/INV/CD 각 1행, key_value는 공백 제거 + 대문자
+    """
+    __tablename__ = "shipment_reference_keys"
+    __table_args__ = (
+        UniqueConstraint("shipment_id", "key_type", name="uq_shipment_reference_keys_shipment_type"),
+        Index(
+            "ix_shipment_reference_keys_lookup", "client_id", "key_type", "key_value",
+            postgresql_include=["shipment_id"],
+        ),
+    )
+
+    key_id = Column(Integer, primary_key=True, autoincrement=True)
+    shipment_id = Column(Integer, ForeignKey("shipments.shipment_id", ondelete="CASCADE"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.client_id"), nullable=False)
+    key_type = Column(String(20), nullable=False)  # HBL, MBL, INV, CD
+    key_value = Column(String(100), nullable=False)  # 정규화된 값
+
+    shipment = relationship("Shipment", back_populates="reference_keys")
+
+
 class DuplicateDetection(Base):
     """중복 감지 기록 (FR-009)"""
     __tablename__ = "duplicate_detections"
+    __table_args__ = (
+        Index("ix_duplicate_detections_shipment_id", "shipment_id"),
+    )
 
     detection_id = Column(Integer, primary_key=True, autoincrement=True)
     shipment_id = Column(Integer, ForeignKey("shipments.shipment_id", ondelete="CASCADE"), nullable=False)
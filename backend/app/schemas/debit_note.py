@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
@@ -8,7 +8,7 @@ class DebitNoteCreate(BaseModel):
     client_id: int
     period_from: date
     period_to: date
-    exchange_rate: Decimal
+    exchange_rate: Optional[Decimal] = None  # 없으면 거래처/period_to 기준 환율 자동 적용 (FR-006)
     sheet_type: str = "ALL"  # IMPORT, EXPORT, ALL
     notes: Optional[str] = None
 
@@ -51,21 +51,53 @@ class DebitNoteResponse(BaseModel):
     notes: Optional[str] = None
     created_at: datetime
     updated_at: datetime
-    lines: List[DebitNoteLineResponse] = []
+    lines: Optional[List[DebitNoteLineResponse]] = []  # 목록 view=summary 이면 None (라인 미조회)
 
     class Config:
         from_attributes = True
 
 
 class DebitNoteListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None  # count=none 이면 생략
     items: List[DebitNoteResponse]
+    next_cursor: Optional[str] = None  # 다음 페이지 cursor (마지막 페이지면 None)
+
+
+class DebitNoteLinePage(BaseModel):
+    """DN 라인 페이지 - (line_no, line_id) 순, cursor 로 이어서 조회"""
+    total: int  # debit_notes.total_lines
+    items: List[DebitNoteLineResponse]
+    next_cursor: Optional[str] = None
 
 
 class WorkflowAction(BaseModel):
     comment: Optional[str] = None
 
 
+BULK_WORKFLOW_MAX_ITEMS = 1000
+
+
+class BulkWorkflowAction(BaseModel):
+    debit_note_ids: List[int] = Field(..., min_length=1, max_length=BULK_WORKFLOW_MAX_ITEMS)
+    action: str = Field(..., pattern="^(submit|approve|reject)$")
+    comment: Optional[str] = None
+
+
+class BulkWorkflowResult(BaseModel):
+    debit_note_id: int
+    result: str  # APPLIED, FAILED
+    status: Optional[str] = None  # 처리 후 DN 상태 (없는 DN 이면 None)
+    error: Optional[str] = None
+
+
+class BulkWorkflowResponse(BaseModel):
+    action: str
+    total: int
+    applied: int
+    failed: int
+    results: List[BulkWorkflowResult]
+
+
 class DebitNoteWorkflowResponse(BaseModel):
     workflow_id: int
     action: str
@@ -77,3 +109,73 @@ class DebitNoteWorkflowResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ExportJobResponse(BaseModel):
+    export_id: int
+    debit_note_id: int
+    export_status: str  # PENDING, GENERATING, COMPLETED, FAILED
+    file_name: str
+    file_size: Optional[int] = None
+    content_hash: Optional[str] = None
+    error_message: Optional[str] = None
+    exported_by: Optional[int] = None
+    exported_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class BatchRunCreate(BaseModel):
+    period_from: date
+    period_to: date
+    client_batch: Optional[str] = None  # Client.batch ("Batch 1" 등) - 없으면 활성 거래처 전체
+    client_ids: Optional[List[int]] = Field(None, min_length=1)  # 지정 시 client_batch 대신 이 거래처만
+    exchange_rate: Optional[Decimal] = None  # 없으면 거래처별 period_to 기준 환율 (FR-006)
+    sheet_type: str = "ALL"  # IMPORT, EXPORT, ALL
+    notes: Optional[str] = None
+
+
+class BatchRunItemResponse(BaseModel):
+    item_id: int
+    client_id: int
+    status: str  # PENDING, CREATED, SKIPPED, FAILED
+    debit_note_id: Optional[int] = None
+    total_lines: Optional[int] = None
+    error: Optional[str] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class BatchRunSummary(BaseModel):
+    run_id: int
+    period_from: date
+    period_to: date
+    sheet_type: Optional[str] = None
+    client_batch: Optional[str] = None
+    exchange_rate: Optional[Decimal] = None
+    status: str  # PENDING, RUNNING, COMPLETED, FAILED
+    total_clients: int
+    processed_clients: int
+    created_count: int
+    skipped_count: int
+    failed_count: int
+    error_message: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class BatchRunResponse(BatchRunSummary):
+    items: List[BatchRunItemResponse] = []
+
+
+class BatchRunListResponse(BaseModel):
+    total: int
+    items: List[BatchRunSummary]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
@@ -26,6 +26,43 @@ class FeeDetailResponse(BaseModel):
         from_attributes = True
 
 
+class FeeDetailUpdate(BaseModel):
+    """보낸 필드만 수정 - notes 외에는 생략만 가능하고 null 은 422"""
+    fee_item_id: Optional[int] = None
+    amount_usd: Optional[Decimal] = None
+    amount_vnd: Optional[Decimal] = None
+    currency: Optional[str] = None
+    is_tax_inclusive: Optional[bool] = None
+    notes: Optional[str] = None
+
+    @field_validator("fee_item_id", "amount_usd", "amount_vnd", "currency", "is_tax_inclusive", mode="before")
+    @classmethod
+    def reject_null(cls, value):
+        # NOT NULL 컬럼 - 명시적 null 은 쓰기 전에 거부 (생략한 필드는 검증하지 않음)
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+class LineRecalculation(BaseModel):
+    """비용 변경으로 다시 계산한 DN 라인 1건 (delta = 변경 후 - 변경 전, note_* = 변경 후 헤더 합계)"""
+    debit_note_id: int
+    line_id: int
+    delta_usd: Decimal
+    delta_vnd: Decimal
+    delta_vat: Decimal
+    delta_grand_total_vnd: Decimal
+    note_total_usd: Decimal
+    note_total_vnd: Decimal
+    note_total_vat: Decimal
+    note_grand_total_vnd: Decimal
+
+
+class FeeDetailChangeResponse(BaseModel):
+    fee_detail: Optional[FeeDetailResponse] = None  # 삭제 시 None
+    recalculated: List[LineRecalculation] = []  # 선적이 포함된 DRAFT/REJECTED DN 라인
+
+
 class ShipmentBase(BaseModel):
     client_id: int
     shipment_type: str = "IMPORT"
@@ -85,5 +122,32 @@ class ShipmentResponse(ShipmentBase):
 
 
 class ShipmentListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None  # count=none 이면 생략
     items: List[ShipmentResponse]
+    next_cursor: Optional[str] = None  # 다음 페이지 cursor (마지막 페이지면 None)
+
+
+# ── 대량 등록 (월말 backfill) ──
+
+BULK_MAX_ITEMS = 10000
+
+
+class ShipmentBulkCreate(BaseModel):
+    items: List[ShipmentCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class ShipmentBulkResult(BaseModel):
+    index: int  # 입력 순번 (0부터)
+    status: str  # CREATED, FAILED
+    shipment_id: Optional[int] = None
+    is_duplicate: bool = False
+    duplicates: List[DuplicateWarning] = []
+    error: Optional[str] = None
+
+
+class ShipmentBulkResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    duplicates: int
+    results: List[ShipmentBulkResult]
@@ -0,0 +1,219 @@
+"""월말 일괄 DN 생성 (debit_note_batch_runs)
+
+실행 1건 = 대상 거래처마다 build_debit_note (단건 생성 API 와 같은 로직)
+- 거래처별로 세션/트랜잭션을 따로 사용: DN + 항목 결과 + 실행 카운터를 한 트랜잭션으로 커밋하므로
+  한 거래처의 실패(환율 없음, 409 등)가 다른 거래처에 영향을 주지 않고, 진행률은 커밋 단위로 보인다.
+- 동시 생성 거래처 수: BATCH_RUN_CONCURRENCY (DB_POOL_SIZE 이하, SQLite 는 쓰기가 직렬화되므로 1)
+- 카운터는 SET processed_clients = processed_clients + 1 형태로 갱신 (동시 갱신에 안전)
+- 항목을 기록할 때마다 heartbeat_at 갱신 - RUNNING 인 채 BATCH_RUN_STALE_SECONDS 동안 진행이 없으면
+  worker 중단으로 보고 재전달 시 다시 선점해서 남은 PENDING 항목부터 이어서 처리
+
+비동기 실행은 출력 작업과 같이 EXPORT_QUEUE 설정에 따라 Celery worker(app.worker) 또는
+API 프로세스의 백그라운드 스레드에서 돈다.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.models.client import Client
+from app.models.debit_note import DebitNoteBatchRun, DebitNoteBatchRunItem
+from app.schemas.debit_note import DebitNoteCreate
+from app.services.debit_note_builder import build_debit_note
+
+logger = logging.getLogger(__name__)
+
+# 항목 결과 → 실행 카운터 컬럼
+RESULT_COUNTERS = {
+    "CREATED": DebitNoteBatchRun.created_count,
+    "SKIPPED": DebitNoteBatchRun.skipped_count,
+    "FAILED": DebitNoteBatchRun.failed_count,
+}
+
+
+def batch_concurrency(dialect_name: str) -> int:
+    """동시 생성 거래처 수 - 커넥션 풀을 넘지 않도록 제한"""
+    if dialect_name == "sqlite":
+        return 1
+    return max(1, min(settings.BATCH_RUN_CONCURRENCY, settings.DB_POOL_SIZE))
+
+
+async def _record_item(
+    db: AsyncSession,
+    run_id: int,
+    item_id: int,
+    status: str,
+    debit_note_id: Optional[int] = None,
+    total_lines: Optional[int] = None,
+    error: Optional[str] = None,
+) -> bool:
+    """PENDING 항목 결과 + 실행 카운터/heartbeat 갱신 → 기록 여부 (commit 은 호출 측)
+
+    이미 기록된 항목(재선점 전 worker 가 늦게 끝낸 경우)이면 False - 호출 측은 롤백한다.
+    """
+    now = datetime.utcnow()
+    recorded = await db.execute(
+        update(DebitNoteBatchRunItem)
+        .where(DebitNoteBatchRunItem.item_id == item_id, DebitNoteBatchRunItem.status == "PENDING")
+        .values(status=status, debit_note_id=debit_note_id, total_lines=total_lines, error=error,
+                finished_at=now)
+    )
+    if recorded.rowcount != 1:
+        return False
+    counter = RESULT_COUNTERS[status]
+    await db.execute(
+        update(DebitNoteBatchRun)
+        .where(DebitNoteBatchRun.run_id == run_id)
+        .values({
+            DebitNoteBatchRun.processed_clients: DebitNoteBatchRun.processed_clients + 1,
+            counter: counter + 1,
+            DebitNoteBatchRun.heartbeat_at: now,
+        })
+    )
+    return True
+
+
+async def _build_client(
+    session_factory: async_sessionmaker,
+    run: DebitNoteBatchRun,
+    item_id: int,
+    client_id: int,
+) -> str:
+    """거래처 1곳 DN 생성 → 항목 결과 (CREATED / SKIPPED / FAILED, 다른 worker 가 이미 기록했으면 그 결과)"""
+    async with session_factory() as db:
+        try:
+            client = await db.get(Client, client_id)
+            if client is None:
+                raise HTTPException(status_code=404, detail="Client not found")
+            data = DebitNoteCreate(
+                client_id=client_id, period_from=run.period_from, period_to=run.period_to,
+                exchange_rate=run.exchange_rate, sheet_type=run.sheet_type or "ALL", notes=run.notes,
+            )
+            debit_note = await build_debit_note(db, data, client, run.created_by)
+        except Exception as e:
+            await db.rollback()
+            error = e.detail if isinstance(e, HTTPException) else f"{type(e).__name__}: {e}"
+            if not isinstance(e, HTTPException):
+                logger.exception("Batch run %d: client %d failed", run.run_id, client_id)
+            status, recorded = "FAILED", await _record_item(db, run.run_id, item_id, "FAILED", error=error)
+        else:
+            if debit_note is None:
+                status, recorded = "SKIPPED", await _record_item(db, run.run_id, item_id, "SKIPPED")
+            else:
+                status, recorded = "CREATED", await _record_item(
+                    db, run.run_id, item_id, "CREATED",
+                    debit_note_id=debit_note.debit_note_id, total_lines=debit_note.total_lines,
+                )
+
+        if not recorded:
+            await db.rollback()
+            return (await db.get(DebitNoteBatchRunItem, item_id)).status
+        await db.commit()
+        return status
+
+
+async def claim_batch_run(db: AsyncSession, run_id: int) -> bool:
+    """실행 선점 (RUNNING + heartbeat_at) → 선점 여부 (commit 은 호출 측)
+
+    PENDING 이거나, RUNNING 인 채 BATCH_RUN_STALE_SECONDS 동안 항목 기록이 없는 실행만 선점한다.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.BATCH_RUN_STALE_SECONDS)
+    claimed = await db.execute(
+        update(DebitNoteBatchRun)
+        .where(
+            DebitNoteBatchRun.run_id == run_id,
+            or_(
+                DebitNoteBatchRun.status == "PENDING",
+                and_(
+                    DebitNoteBatchRun.status == "RUNNING",
+                    or_(DebitNoteBatchRun.heartbeat_at.is_(None), DebitNoteBatchRun.heartbeat_at < stale_before),
+                ),
+            ),
+        )
+        .values(
+            status="RUNNING",
+            started_at=func.coalesce(DebitNoteBatchRun.started_at, now),
+            heartbeat_at=now,
+        )
+    )
+    return claimed.rowcount == 1
+
+
+async def run_batch(run_id: int, session_factory: async_sessionmaker) -> str:
+    """일괄 생성 1건 실행 → 최종 status
+
+    claim_batch_run 으로 선점한 경우만 처리하므로 같은 실행이 중복 전달되어도 한 번만 처리하고,
+    중단된 worker 의 실행은 BATCH_RUN_STALE_SECONDS 이후 재전달 시 남은 PENDING 항목부터 이어서 처리한다.
+    """
+    async with session_factory() as db:
+        claimed = await claim_batch_run(db, run_id)
+        await db.commit()
+        if not claimed:
+            run = await db.get(DebitNoteBatchRun, run_id)
+            return run.status if run else "FAILED"
+
+        run = await db.get(DebitNoteBatchRun, run_id)
+        items = (await db.execute(
+            select(DebitNoteBatchRunItem.item_id, DebitNoteBatchRunItem.client_id)
+            .where(DebitNoteBatchRunItem.run_id == run_id, DebitNoteBatchRunItem.status == "PENDING")
+            .order_by(DebitNoteBatchRunItem.item_id)
+        )).all()
+        semaphore = asyncio.Semaphore(batch_concurrency(db.get_bind().dialect.name))
+
+    async def build(item_id: int, client_id: int) -> str:
+        async with semaphore:
+            return await _build_client(session_factory, run, item_id, client_id)
+
+    results = await asyncio.gather(*(build(*item) for item in items), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    for error in errors:
+        logger.error("Batch run %d: result not recorded", run_id, exc_info=error)
+
+    status = "FAILED" if errors else "COMPLETED"
+    async with session_factory() as db:
+        await db.execute(
+            update(DebitNoteBatchRun)
+            .where(DebitNoteBatchRun.run_id == run_id)
+            .values(
+                status=status,
+                error_message=f"{len(errors)} clients not recorded: {errors[0]}" if errors else None,
+                finished_at=datetime.utcnow(),
+            )
+        )
+        await db.commit()
+    return status
+
+
+def run_batch_sync(run_id: int) -> str:
+    """이벤트 루프 밖(Celery worker / 스레드)에서 일괄 생성 실행
+
+    호출마다 새 이벤트 루프를 만들므로 API 의 커넥션 풀을 공유하지 않는 NullPool 엔진을 사용한다.
+    (동시 커넥션 수는 batch_concurrency 로 제한)
+    """
+    async def run():
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        try:
+            return await run_batch(
+                run_id, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+            )
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def enqueue_batch_run(run_id: int, background_tasks: BackgroundTasks):
+    """일괄 생성 등록 (EXPORT_QUEUE: celery / thread)"""
+    if settings.EXPORT_QUEUE == "thread":
+        background_tasks.add_task(run_batch_sync, run_id)
+        return
+
+    from app.worker import batch_run_task
+    batch_run_task.delay(run_id)
@@ -0,0 +1,231 @@
+"""컬럼형(columnar) Debit Note 계산기 - 대량 재청구/재계산용
+
+line_calculator.calculate_line_totals와 동일한 수식을 NumPy int64 고정소수점 배열로
+한 번에 계산한다. (USD는 센트 단위 정수, 환율은 정수/10^k 분수로 표현)
+
+- BC = freight + local + pay_on_behalf
+- BD = int(BC * 환율)          → 0 방향 절사 (Decimal int()와 동일)
+- BE = int(local * 환율 * 8%)  → 0 방향 절사
+- BF = BD + BE
+
+int64 범위를 넘을 수 있는 입력은 Python 정수 연산으로 자동 전환한다.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.models.shipment import ShipmentFeeDetail
+from app.services.line_calculator import PAY_ON_BEHALF_CODE
+from app.services.reference_data import reference_cache
+
+# 비용 버킷 (line_calculator 분류와 동일)
+BUCKET_FREIGHT = 0  # VAT 0%
+BUCKET_LOCAL = 1  # VAT 8%
+BUCKET_PAY_ON_BEHALF = 2
+
+VAT_PERCENT = 8
+LOAD_CHUNK_SIZE = 10000
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def fee_item_bucket(item_code: Optional[str], is_vat_applicable: Optional[bool]) -> int:
+    """fee_item → 비용 버킷"""
+    if item_code == PAY_ON_BEHALF_CODE:
+        return BUCKET_PAY_ON_BEHALF
+    if not is_vat_applicable:
+        return BUCKET_FREIGHT
+    return BUCKET_LOCAL
+
+
+def _rate_fraction(exchange_rate) -> tuple[int, int]:
+    """환율을 (분자, 10^k) 정수 분수로 변환 - 26446.55 → (2644655, 100)"""
+    rate = Decimal(str(exchange_rate))
+    sign, digits, exponent = rate.as_tuple()
+    numerator = int("".join(map(str, digits)) or "0") * (-1 if sign else 1)
+    if exponent >= 0:
+        return numerator * 10 ** exponent, 1
+    return numerator, 10 ** -exponent
+
+
+def _trunc_div(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    """0 방향 정수 나눗셈 (numpy //는 내림이므로 부호 분리)"""
+    return np.sign(numerator) * (np.abs(numerator) // denominator)
+
+
+def _cents(value: Decimal) -> Decimal:
+    return Decimal(int(value)).scaleb(-2)
+
+
+@dataclass
+class ColumnarLines:
+    """라인별 계산 결과 배열 (shipment_ids 순서)"""
+    shipment_ids: np.ndarray
+    freight_cents: np.ndarray
+    local_cents: np.ndarray
+    pay_on_behalf_cents: np.ndarray
+    total_cents: np.ndarray
+    total_vnd: np.ndarray
+    vat_amount: np.ndarray
+    grand_total_vnd: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.shipment_ids)
+
+    @property
+    def header_totals(self) -> dict:
+        """DebitNote 헤더 합계 (FR-018)"""
+        return {
+            "total_usd": _cents(self.total_cents.sum(dtype=object)),
+            "total_vnd": int(self.total_vnd.sum(dtype=object)),
+            "total_vat": int(self.vat_amount.sum(dtype=object)),
+            "grand_total_vnd": int(self.grand_total_vnd.sum(dtype=object)),
+            "total_lines": len(self),
+        }
+
+    def line(self, i: int) -> dict:
+        """calculate_line_totals와 같은 형태의 라인 dict"""
+        return {
+            "total_usd": _cents(self.total_cents[i]),
+            "total_vnd": int(self.total_vnd[i]),
+            "vat_amount": int(self.vat_amount[i]),
+            "grand_total_vnd": int(self.grand_total_vnd[i]),
+            "freight_usd": _cents(self.freight_cents[i]),
+            "local_charges_usd": _cents(self.local_cents[i]),
+            "pay_on_behalf": _cents(self.pay_on_behalf_cents[i]),
+        }
+
+    def line_dicts(self) -> dict[int, dict]:
+        """{shipment_id: line dict}"""
+        return {int(sid): self.line(i) for i, sid in enumerate(self.shipment_ids)}
+
+
+def calculate_columnar(
+    shipment_ids: np.ndarray,
+    fee_item_ids: np.ndarray,
+    amount_cents: np.ndarray,
+    fee_buckets: dict[int, int],
+    exchange_rate,
+    line_shipment_ids: Optional[np.ndarray] = None,
+) -> ColumnarLines:
+    """fee_detail 컬럼 배열 → 라인별 합계 (1 pass)
+
+    shipment_ids / fee_item_ids / amount_cents: fee_detail 1행당 1원소 (같은 길이)
+    fee_buckets: {fee_item_id: BUCKET_*} - 없는 fee_item은 현지비용(BUCKET_LOCAL)
+    line_shipment_ids: 결과 라인 순서 (fee_detail이 없는 선적도 0 라인으로 포함).
+                       생략하면 fee_detail에 등장한 선적의 오름차순.
+    """
+    shipment_ids = np.asarray(shipment_ids, dtype=np.int64)
+    fee_item_ids = np.asarray(fee_item_ids, dtype=np.int64)
+    amount_cents = np.asarray(amount_cents, dtype=np.int64)
+
+    if line_shipment_ids is None:
+        line_shipment_ids = np.unique(shipment_ids)
+    else:
+        line_shipment_ids = np.asarray(line_shipment_ids, dtype=np.int64)
+
+    # fee_item_id → 버킷 lookup 배열
+    max_item = int(max(fee_item_ids.max(initial=0), max(fee_buckets, default=0)))
+    bucket_lookup = np.full(max_item + 1, BUCKET_LOCAL, dtype=np.int64)
+    for item_id, bucket in fee_buckets.items():
+        bucket_lookup[item_id] = bucket
+    buckets = bucket_lookup[fee_item_ids]
+
+    # shipment_id → 라인 인덱스 (라인 목록에 없는 fee_detail은 제외)
+    order = np.argsort(line_shipment_ids, kind="stable")
+    sorted_ids = line_shipment_ids[order]
+    if len(sorted_ids):
+        pos = np.minimum(np.searchsorted(sorted_ids, shipment_ids), len(sorted_ids) - 1)
+        matched = sorted_ids[pos] == shipment_ids
+    else:
+        pos = np.zeros(len(shipment_ids), dtype=np.int64)
+        matched = np.zeros(len(shipment_ids), dtype=bool)
+    line_idx = order[pos[matched]]
+
+    sums = np.zeros((len(line_shipment_ids), 3), dtype=np.int64)
+    np.add.at(sums, (line_idx, buckets[matched]), amount_cents[matched])
+
+    freight = sums[:, BUCKET_FREIGHT]
+    local = sums[:, BUCKET_LOCAL]
+    pob = sums[:, BUCKET_PAY_ON_BEHALF]
+    total = freight + local + pob
+
+    # BD = int(BC/100 * n/d), BE = int(local/100 * n/d * 8/100)
+    rate_num, rate_den = _rate_fraction(exchange_rate)
+    largest = int(np.abs(total).max(initial=0)) + int(np.abs(local).max(initial=0))
+    if largest * abs(rate_num) * VAT_PERCENT < _INT64_MAX:
+        total_vnd = _trunc_div(total * rate_num, 100 * rate_den)
+        vat_amount = _trunc_div(local * rate_num * VAT_PERCENT, 100 * rate_den * 100)
+    else:
+        # int64 overflow 가능 → Python 정수(object 배열)로 동일 계산
+        total_vnd = _trunc_div(total.astype(object) * rate_num, 100 * rate_den)
+        vat_amount = _trunc_div(local.astype(object) * rate_num * VAT_PERCENT, 100 * rate_den * 100)
+
+    return ColumnarLines(
+        shipment_ids=line_shipment_ids,
+        freight_cents=freight,
+        local_cents=local,
+        pay_on_behalf_cents=pob,
+        total_cents=total,
+        total_vnd=total_vnd,
+        vat_amount=vat_amount,
+        grand_total_vnd=total_vnd + vat_amount,
+    )
+
+
+async def load_fee_buckets(db: AsyncSession) -> dict[int, int]:
+    """전체 fee_item의 버킷 맵 (기준 데이터 캐시)"""
+    fee_items = await reference_cache.fee_items(db, active_only=False)
+    return {fi.fee_item_id: fee_item_bucket(fi.item_code, fi.is_vat_applicable) for fi in fee_items}
+
+
+async def load_fee_columns(
+    db: AsyncSession,
+    shipment_ids: Select | Iterable[int],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """fee_detail을 (shipment_id, fee_item_id, amount_cents) 배열로 로드 - ORM 객체 생성 없음
+
+    shipment_id 목록은 LOAD_CHUNK_SIZE 단위로 나눠 조회 (바인드 파라미터 수 제한)
+    """
+    if isinstance(shipment_ids, Select):
+        chunks = [shipment_ids]
+    else:
+        ids = list(shipment_ids)
+        chunks = [ids[i:i + LOAD_CHUNK_SIZE] for i in range(0, len(ids), LOAD_CHUNK_SIZE)]
+
+    rows = []
+    for chunk in chunks:
+        result = await db.execute(
+            select(
+                ShipmentFeeDetail.shipment_id,
+                ShipmentFeeDetail.fee_item_id,
+                ShipmentFeeDetail.amount_usd,
+            ).where(ShipmentFeeDetail.shipment_id.in_(chunk))
+        )
+        rows.extend(result.all())
+
+    count = len(rows)
+    return (
+        np.fromiter((r[0] for r in rows), dtype=np.int64, count=count),
+        np.fromiter((r[1] for r in rows), dtype=np.int64, count=count),
+        np.fromiter((int((r[2] or 0) * 100) for r in rows), dtype=np.int64, count=count),
+    )
+
+
+async def price_shipments(
+    db: AsyncSession,
+    shipment_ids: Select | Iterable[int],
+    exchange_rate,
+) -> ColumnarLines:
+    """선적 목록(또는 shipment_id SELECT)을 환율로 일괄 계산 (재청구/시뮬레이션용, DB 쓰기 없음)"""
+    if isinstance(shipment_ids, Select):
+        line_ids = np.fromiter((await db.execute(shipment_ids)).scalars(), dtype=np.int64)
+    else:
+        line_ids = np.fromiter(shipment_ids, dtype=np.int64)
+    fee_buckets = await load_fee_buckets(db)
+    sids, fids, cents = await load_fee_columns(db, shipment_ids if isinstance(shipment_ids, Select) else line_ids.tolist())
+    return calculate_columnar(sids, fids, cents, fee_buckets, exchange_rate, line_shipment_ids=line_ids)
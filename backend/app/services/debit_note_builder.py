@@ -0,0 +1,143 @@
+"""Debit Note 생성 (FR-015 ~ FR-020)
+
+단건 생성 API(POST /debit-notes)와 월말 일괄 생성(batch_runs)이 공유한다.
+
+1. 거래처 + 기간 내 ACTIVE 거래 필터링 (선적 행 FOR UPDATE - 커밋 전 비용 수정 방지)
+2. 환율 결정 (미지정 시 거래처 환율 → 일반 환율 순으로 period_to 기준)
+3. 기간 내 fee_details 일괄 로드 후 라인 메모리 계산, 헤더 합계, CREATED 이력
+4. 라인 선적 ACTIVE → BILLED (UPDATE 1회)
+
+commit 은 호출 측. 실패 시 HTTPException 을 올리며 세션은 호출 측에서 롤백한다.
+"""
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import DEBIT_NOTE_CREATE_SECONDS, DEBIT_NOTE_LINES
+from app.models.client import Client
+from app.models.debit_note import DebitNote, DebitNoteLine, DebitNoteWorkflow
+from app.models.shipment import Shipment
+from app.schemas.debit_note import DebitNoteCreate
+from app.services.exchange_rate_resolver import exchange_rate_resolver
+from app.services.line_calculator import load_fee_rows, calculate_line_totals
+from app.services.shipment_billing import bill_line_shipments
+
+
+def generate_debit_note_number(debit_note_id: int) -> str:
+    """DN-YYYYMM-XXXXX 형식 자동 생성"""
+    now = date.today()
+    return f"DN-{now.strftime('%Y%m')}-{debit_note_id:05d}"
+
+
+async def build_debit_note(
+    db: AsyncSession,
+    data: DebitNoteCreate,
+    client: Client,
+    created_by: int,
+) -> Optional[DebitNote]:
+    """DRAFT Debit Note 생성 (flush 까지) → DebitNote, 기간 내 ACTIVE 거래가 없으면 None
+
+    환율을 정할 수 없으면 400, 조회 이후 다른 DN 이 선적을 청구했으면 409 HTTPException.
+    """
+    started = time.perf_counter()
+    exchange_rate = data.exchange_rate
+    if exchange_rate is None:
+        resolved = await exchange_rate_resolver.resolve(db, client.client_id, data.period_to)
+        if not resolved:
+            raise HTTPException(status_code=400, detail=f"No exchange rate found for {data.period_to}")
+        exchange_rate = resolved.rate
+
+    # 거래처별 기간 내 ACTIVE 거래 필터링 (FR-015)
+    shipment_query = select(Shipment).where(
+        Shipment.client_id == client.client_id,
+        Shipment.status == "ACTIVE",
+        Shipment.delivery_date >= data.period_from,
+        Shipment.delivery_date <= data.period_to,
+    )
+    if data.sheet_type != "ALL":
+        shipment_query = shipment_query.where(Shipment.shipment_type == data.sheet_type)
+
+    # 선적 행 잠금 (FOR UPDATE) - 비용 수정(shipments._lock_fee_lines)과 직렬화해서
+    # 아래에서 읽는 fee_details 가 커밋 전에 바뀌지 않게 한다 (새 라인은 아직 보이지 않으므로 재계산 대상이 아님)
+    result = await db.execute(
+        shipment_query.with_only_columns(Shipment.shipment_id).order_by(Shipment.delivery_date).with_for_update()
+    )
+    shipment_ids = result.scalars().all()
+    if not shipment_ids:
+        return None
+
+    # Debit Note 헤더 생성
+    debit_note = DebitNote(
+        client_id=client.client_id,
+        period_from=data.period_from,
+        period_to=data.period_to,
+        exchange_rate=exchange_rate,
+        sheet_type=data.sheet_type,
+        status="DRAFT",
+        created_by=created_by,
+        notes=data.notes,
+    )
+    db.add(debit_note)
+    await db.flush()
+
+    # 자동 번호 생성
+    debit_note.debit_note_number = generate_debit_note_number(debit_note.debit_note_id)
+
+    # 라인별 계산 (FR-016 ~ FR-019) - 기간 내 fee_details 일괄 로드 후 메모리 계산
+    fee_rows = await load_fee_rows(db, shipment_query.with_only_columns(Shipment.shipment_id))
+
+    sum_usd = Decimal("0")
+    sum_vnd = Decimal("0")
+    sum_vat = Decimal("0")
+    sum_grand = Decimal("0")
+
+    for idx, shipment_id in enumerate(shipment_ids, 1):
+        calc = calculate_line_totals(fee_rows.get(shipment_id, []), exchange_rate)
+
+        line = DebitNoteLine(
+            debit_note_id=debit_note.debit_note_id,
+            shipment_id=shipment_id,
+            line_no=idx,
+            **calc,
+        )
+        db.add(line)
+
+        sum_usd += calc["total_usd"]
+        sum_vnd += calc["total_vnd"]
+        sum_vat += calc["vat_amount"]
+        sum_grand += calc["grand_total_vnd"]
+
+    # 헤더 합계 업데이트 (FR-018)
+    debit_note.total_usd = sum_usd
+    debit_note.total_vnd = sum_vnd
+    debit_note.total_vat = sum_vat
+    debit_note.grand_total_vnd = sum_grand
+    debit_note.total_lines = len(shipment_ids)
+
+    # 워크플로우 기록
+    workflow = DebitNoteWorkflow(
+        debit_note_id=debit_note.debit_note_id,
+        action="CREATED",
+        from_status=None,
+        to_status="DRAFT",
+        performed_by=created_by,
+    )
+    db.add(workflow)
+    await db.flush()
+
+    # 거래 상태를 BILLED로 변경 - 조회 이후 다른 DN 에 청구된 선적이 있으면 행 수가 모자람
+    billed = await bill_line_shipments(db, debit_note.debit_note_id)
+    if billed != len(shipment_ids):
+        raise HTTPException(
+            status_code=409,
+            detail=f"{len(shipment_ids) - billed} shipments were billed by another Debit Note; retry",
+        )
+
+    DEBIT_NOTE_CREATE_SECONDS.observe(time.perf_counter() - started, client=client.client_code)
+    DEBIT_NOTE_LINES.observe(len(shipment_ids), client=client.client_code)
+    return debit_note
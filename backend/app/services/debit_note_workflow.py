@@ -0,0 +1,247 @@
+"""Debit Note 워크플로우 상태 전이 (FR-029 ~ FR-032)
+
+전이 1건 = 조건부 UPDATE 1회 + 이력 INSERT (PostgreSQL 은 data-modifying CTE 로 한 문장)
+
+    WITH updated AS (
+        UPDATE debit_notes SET status = :to, ...
+        WHERE debit_note_id = :id AND status = :from [AND created_by <> :user]
+        RETURNING *
+    ), workflow AS (
+        INSERT INTO debit_note_workflows (...) SELECT ... FROM updated RETURNING workflow_id
+    )
+    SELECT updated.*, workflow.workflow_id FROM updated, workflow
+
+노트/라인을 미리 로드하지 않고, 현재 상태 확인과 변경이 같은 문장이므로 두 승인자가 동시에 처리해도
+한 명만 성공한다. (나머지는 0행 → 현재 상태를 다시 읽어 400)
+SQLite(로컬/테스트)는 UPDATE ... RETURNING 과 INSERT 두 문장으로 같은 트랜잭션에서 처리한다.
+
+일괄 처리(apply_bulk_transition)는 노트 수와 관계없이 검증 조회 1회 + UPDATE 1회 + 이력 INSERT 1회.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import insert, literal, or_, select, true, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.debit_note import DebitNote, DebitNoteWorkflow
+from app.schemas.debit_note import BulkWorkflowResult
+from app.services.shipment_billing import release_line_shipments
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Transition:
+    action: str  # debit_note_workflows.action
+    from_status: str
+    to_status: str
+    verb: str  # 오류 메시지용
+
+
+TRANSITIONS = {
+    "submit": Transition("SUBMITTED", "DRAFT", "PENDING_REVIEW", "submit"),
+    "approve": Transition("APPROVED", "PENDING_REVIEW", "APPROVED", "approve"),
+    "reject": Transition("REJECTED", "PENDING_REVIEW", "REJECTED", "reject"),
+}
+
+HEADER_COLUMNS = tuple(DebitNote.__table__.c)
+
+
+def _conditions(transition: Transition, user_id: int) -> list:
+    conditions = [DebitNote.status == transition.from_status]
+    if transition.action == "APPROVED":
+        # 생성자 ≠ 승인자 (이중 승인)
+        conditions.append(or_(DebitNote.created_by.is_(None), DebitNote.created_by != user_id))
+    return conditions
+
+
+def _values(transition: Transition, user_id: int, comment: Optional[str], now: datetime) -> dict:
+    values = {"status": transition.to_status, "updated_at": now}
+    if transition.action == "APPROVED":
+        values.update(approved_by=user_id, approved_at=now)
+    elif transition.action == "REJECTED":
+        values["rejection_reason"] = comment
+    return values
+
+
+def rejection_reason(
+    transition: Transition, status: Optional[str], created_by: Optional[int], user_id: int,
+) -> Optional[str]:
+    """전이를 적용할 수 없는 이유 - 적용 가능하면 None (status None = 노트 없음)"""
+    if status is None:
+        return "Debit Note not found"
+    if status != transition.from_status:
+        return f"Cannot {transition.verb}: current status is {status}"
+    if transition.action == "APPROVED" and created_by == user_id:
+        return "Creator cannot approve their own Debit Note"
+    return None
+
+
+def _concurrent_change(transition: Transition) -> str:
+    return f"Cannot {transition.verb}: status changed by another request"
+
+
+def _workflow_row(debit_note_id: int, transition: Transition, user_id: int, comment: Optional[str],
+                  now: datetime) -> dict:
+    return {
+        "debit_note_id": debit_note_id, "action": transition.action, "from_status": transition.from_status,
+        "to_status": transition.to_status, "performed_by": user_id, "comment": comment, "created_at": now,
+    }
+
+
+def _log_release(debit_note_ids, released: int, expected: int):
+    if released != expected:
+        logger.warning(
+            "Debit Note %s rejected: %d of %d shipments restored to ACTIVE (others no longer BILLED)",
+            ", ".join(map(str, debit_note_ids)), released, expected,
+        )
+
+
+async def _apply_postgresql(db: AsyncSession, debit_note_id: int, transition: Transition, user_id: int,
+                            comment: Optional[str], now: datetime) -> Optional[Row]:
+    updated = (
+        update(DebitNote)
+        .where(DebitNote.debit_note_id == debit_note_id, *_conditions(transition, user_id))
+        .values(**_values(transition, user_id, comment, now))
+        .returning(*HEADER_COLUMNS)
+        .cte("updated")
+    )
+    workflow = (
+        insert(DebitNoteWorkflow)
+        .from_select(
+            ["debit_note_id", "action", "from_status", "to_status", "performed_by", "comment", "created_at"],
+            select(
+                updated.c.debit_note_id, literal(transition.action), literal(transition.from_status),
+                literal(transition.to_status), literal(user_id),
+                literal(comment, DebitNoteWorkflow.comment.type), literal(now),
+            ),
+        )
+        .returning(DebitNoteWorkflow.workflow_id)
+        .cte("workflow")
+    )
+    result = await db.execute(select(*updated.c, workflow.c.workflow_id).select_from(updated).join(workflow, true()))
+    return result.one_or_none()
+
+
+async def _apply_two_statements(db: AsyncSession, debit_note_id: int, transition: Transition, user_id: int,
+                                comment: Optional[str], now: datetime) -> Optional[Row]:
+    result = await db.execute(
+        update(DebitNote)
+        .where(DebitNote.debit_note_id == debit_note_id, *_conditions(transition, user_id))
+        .values(**_values(transition, user_id, comment, now))
+        .returning(*HEADER_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    header = result.one_or_none()
+    if header is not None:
+        await db.execute(insert(DebitNoteWorkflow).values(
+            **_workflow_row(debit_note_id, transition, user_id, comment, now)
+        ))
+    return header
+
+
+async def apply_transition(
+    db: AsyncSession,
+    debit_note_id: int,
+    action: str,
+    user_id: int,
+    comment: Optional[str] = None,
+) -> Row:
+    """action(submit/approve/reject) 적용 → 변경된 debit_notes 헤더 행 (commit 은 호출 측)
+
+    적용할 수 없으면 404 (노트 없음) / 400 (상태 불일치, 자가 승인) HTTPException.
+    reject 는 라인 선적을 ACTIVE 로 복원한다.
+    """
+    transition = TRANSITIONS[action]
+    now = datetime.utcnow()
+    if db.get_bind().dialect.name == "postgresql":
+        header = await _apply_postgresql(db, debit_note_id, transition, user_id, comment, now)
+    else:
+        header = await _apply_two_statements(db, debit_note_id, transition, user_id, comment, now)
+
+    if header is None:
+        current = (await db.execute(
+            select(DebitNote.status, DebitNote.created_by).where(DebitNote.debit_note_id == debit_note_id)
+        )).one_or_none()
+        if current is None:
+            raise HTTPException(status_code=404, detail="Debit Note not found")
+        detail = rejection_reason(transition, *current, user_id) or _concurrent_change(transition)
+        raise HTTPException(status_code=400, detail=detail)
+
+    if transition.action == "REJECTED":
+        # 관련 거래를 다시 ACTIVE로 복원 (BILLED 인 것만 - 취소/삭제된 선적은 제외)
+        released = await release_line_shipments(db, debit_note_id)
+        _log_release([debit_note_id], released, header.total_lines or 0)
+    return header
+
+
+async def apply_bulk_transition(
+    db: AsyncSession,
+    debit_note_ids: list[int],
+    action: str,
+    user_id: int,
+    comment: Optional[str] = None,
+) -> list[BulkWorkflowResult]:
+    """여러 DN 에 같은 전이 적용 → DN 별 결과 (입력 순서, 중복 id 는 1건) (commit 은 호출 측)
+
+    1) 대상 헤더 (status, created_by) 1회 조회로 상태 / 생성자 ≠ 승인자 검증
+    2) 통과한 DN 만 조건부 UPDATE 1회 - 조회 이후 다른 요청이 상태를 바꾼 DN 은 제외되어 FAILED
+    3) 이력 INSERT 1회 (executemany), reject 는 라인 선적 복원 UPDATE 1회
+    """
+    transition = TRANSITIONS[action]
+    ids = list(dict.fromkeys(debit_note_ids))
+    current = {
+        row.debit_note_id: row
+        for row in await db.execute(
+            select(DebitNote.debit_note_id, DebitNote.status, DebitNote.created_by, DebitNote.total_lines)
+            .where(DebitNote.debit_note_id.in_(ids))
+        )
+    }
+    errors = {}
+    for debit_note_id in ids:
+        row = current.get(debit_note_id)
+        reason = rejection_reason(transition, row.status if row else None, row.created_by if row else None, user_id)
+        if reason:
+            errors[debit_note_id] = reason
+
+    applied: set[int] = set()
+    eligible = [debit_note_id for debit_note_id in ids if debit_note_id not in errors]
+    if eligible:
+        now = datetime.utcnow()
+        result = await db.execute(
+            update(DebitNote)
+            .where(DebitNote.debit_note_id.in_(eligible), *_conditions(transition, user_id))
+            .values(**_values(transition, user_id, comment, now))
+            .returning(DebitNote.debit_note_id)
+            .execution_options(synchronize_session=False)
+        )
+        applied = set(result.scalars())
+
+    if applied:
+        applied_ids = [debit_note_id for debit_note_id in ids if debit_note_id in applied]
+        await db.execute(insert(DebitNoteWorkflow), [
+            _workflow_row(debit_note_id, transition, user_id, comment, now) for debit_note_id in applied_ids
+        ])
+        if transition.action == "REJECTED":
+            released = await release_line_shipments(db, *applied_ids)
+            _log_release(applied_ids, released, sum(current[i].total_lines or 0 for i in applied_ids))
+
+    results = []
+    for debit_note_id in ids:
+        if debit_note_id in applied:
+            results.append(BulkWorkflowResult(
+                debit_note_id=debit_note_id, result="APPLIED", status=transition.to_status,
+            ))
+        else:
+            row = current.get(debit_note_id)
+            results.append(BulkWorkflowResult(
+                debit_note_id=debit_note_id,
+                result="FAILED",
+                status=row.status if row else None,
+                error=errors.get(debit_note_id) or _concurrent_change(transition),
+            ))
+    return results
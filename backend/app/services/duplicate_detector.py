@@ -0,0 +1,167 @@
+"""중복 HBL/MBL/INV/CD 감지 서비스 (설계서 FR-009)
+
+shipment_reference_keys(client_id, key_type, key_value) 정규화 키 테이블을 사용해
+선적 묶음 전체의 중복을 쿼리 1회로 조회한다. (선적 1건당 최대 4회 → 묶음당 1회)
+"""
+import re
+from collections import defaultdict
+from typing import Iterable, Optional, Protocol
+
+from sqlalchemy import select, insert, update, delete, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.shipment import Shipment, ShipmentReferenceKey, DuplicateDetection
+from app.schemas.shipment import DuplicateWarning
+
+# key_type → Shipment 컬럼
+REFERENCE_FIELDS = {
+    "HBL": "hbl",
+    "MBL": "mbl",
+    "INV": "invoice_no",
+    "CD": "cd_no",
+}
+
+# (client_id, key_type, key_value) 튜플 IN 절 바인드 파라미터 제한 대비
+LOOKUP_CHUNK_SIZE = 2000
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ShipmentRefs(Protocol):
+    """중복 감지에 필요한 선적 속성 (ORM Shipment 또는 동일 속성 객체)"""
+    shipment_id: int
+    client_id: int
+    hbl: Optional[str]
+    mbl: Optional[str]
+    invoice_no: Optional[str]
+    cd_no: Optional[str]
+
+
+def normalize_reference(value: Optional[str]) -> Optional[str]:
+    """참조번호 정규화 - 공백 제거 + 대문자 (빈 값은 None)"""
+    if not value:
+        return None
+    normalized = _WHITESPACE.sub("", value).upper()
+    return normalized or None
+
+
+def reference_keys(shipment: ShipmentRefs) -> list[tuple[str, str, str]]:
+    """선적의 (key_type, 정규화 값, 원래 값) 목록"""
+    keys = []
+    for key_type, field in REFERENCE_FIELDS.items():
+        raw = getattr(shipment, field)
+        normalized = normalize_reference(raw)
+        if normalized:
+            keys.append((key_type, normalized, raw))
+    return keys
+
+
+async def insert_reference_keys(db: AsyncSession, shipments: Iterable[ShipmentRefs]) -> None:
+    """신규 선적의 정규화 키 일괄 INSERT"""
+    rows = [
+        {
+            "shipment_id": s.shipment_id,
+            "client_id": s.client_id,
+            "key_type": key_type,
+            "key_value": key_value,
+        }
+        for s in shipments
+        for key_type, key_value, _ in reference_keys(s)
+    ]
+    if rows:
+        await db.execute(insert(ShipmentReferenceKey), rows)
+
+
+async def sync_reference_keys(db: AsyncSession, shipments: Iterable[ShipmentRefs]) -> None:
+    """선적의 정규화 키 재작성 (참조번호 수정 시)"""
+    shipments = list(shipments)
+    if not shipments:
+        return
+
+    await db.execute(
+        delete(ShipmentReferenceKey)
+        .where(ShipmentReferenceKey.shipment_id.in_([s.shipment_id for s in shipments]))
+    )
+    await insert_reference_keys(db, shipments)
+
+
+async def detect_duplicates_batch(
+    db: AsyncSession,
+    shipments: Iterable[ShipmentRefs],
+) -> dict[int, list[DuplicateWarning]]:
+    """선적 묶음의 중복 감지 (FR-009)
+
+    - 정규화 키 테이블에서 (client_id, key_type, key_value) IN (...) 1회 조회
+    - CANCELLED 선적과 자기 자신은 제외 (같은 묶음 안의 선적끼리도 중복으로 감지)
+    - 같은 묶음 안의 중복 쌍은 나중 선적(shipment_id 가 큰 쪽)에만 기록
+      → 한 건씩 등록했을 때와 같은 결과 (먼저 등록된 선적은 중복이 아님)
+    - duplicate_detections 기록 + shipments.is_duplicate 갱신
+
+    Returns: {shipment_id: [DuplicateWarning, ...]} (중복 없는 선적은 빈 목록)
+    """
+    shipments = list(shipments)
+    warnings: dict[int, list[DuplicateWarning]] = {s.shipment_id: [] for s in shipments}
+
+    # (client_id, key_type, key_value) → [(shipment_id, 원래 값)]
+    wanted: dict[tuple[int, str, str], list[tuple[int, str]]] = defaultdict(list)
+    for s in shipments:
+        for key_type, key_value, raw in reference_keys(s):
+            wanted[(s.client_id, key_type, key_value)].append((s.shipment_id, raw))
+    if not wanted:
+        return warnings
+
+    lookup_keys = list(wanted)
+    matches: dict[tuple[int, str, str], list[int]] = defaultdict(list)
+    for i in range(0, len(lookup_keys), LOOKUP_CHUNK_SIZE):
+        chunk = lookup_keys[i:i + LOOKUP_CHUNK_SIZE]
+        result = await db.execute(
+            select(
+                ShipmentReferenceKey.client_id,
+                ShipmentReferenceKey.key_type,
+                ShipmentReferenceKey.key_value,
+                ShipmentReferenceKey.shipment_id,
+            )
+            .join(Shipment, Shipment.shipment_id == ShipmentReferenceKey.shipment_id)
+            .where(
+                tuple_(
+                    ShipmentReferenceKey.client_id,
+                    ShipmentReferenceKey.key_type,
+                    ShipmentReferenceKey.key_value,
+                ).in_(chunk),
+                Shipment.status != "CANCELLED",
+            )
+            .order_by(ShipmentReferenceKey.shipment_id)
+        )
+        for client_id, key_type, key_value, existing_id in result:
+            matches[(client_id, key_type, key_value)].append(existing_id)
+
+    batch_ids = set(warnings)
+    detections = []
+    for key, owners in wanted.items():
+        key_type = key[1]
+        for shipment_id, raw in owners:
+            for existing_id in matches.get(key, []):
+                if existing_id == shipment_id or (existing_id in batch_ids and existing_id > shipment_id):
+                    continue
+                warnings[shipment_id].append(DuplicateWarning(
+                    duplicate_type=key_type,
+                    duplicate_value=raw,
+                    existing_shipment_id=existing_id,
+                ))
+                detections.append({
+                    "shipment_id": shipment_id,
+                    "duplicate_shipment_id": existing_id,
+                    "duplicate_type": key_type,
+                    "duplicate_value": raw,
+                })
+
+    if detections:
+        await db.execute(insert(DuplicateDetection), detections)
+        await db.execute(
+            update(Shipment)
+            .where(Shipment.shipment_id.in_([sid for sid, w in warnings.items() if w]))
+            .values(is_duplicate=True)
+            .execution_options(synchronize_session=False)
+        )
+
+    return warnings
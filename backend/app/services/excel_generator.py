@@ -4,35 +4,52 @@ NEXCON 기술사양서 기반:
 - IMPORT Sheet: A-BM (65 columns), Row 16+
 - EXPORT Sheet: A-AQ (43 columns), Row 16+
 - 수식: BC=SUM(M:AT), BD=BC*환율, BE=SUM(Z:AT)*환율*8%, BF=BD+BE
+
+생성 모드:
+- generate_debit_note_excel: 일반 Workbook → BytesIO
+- write_debit_note_excel: write_only Workbook → 파일 (행 단위 스트리밍, 대용량 DN)
+두 모드 모두 같은 행 레이아웃(_sheet_rows)과 named style 을 사용하므로 결과가 동일하다.
+
+라인은 메모리에 올리지 않는다: 시트 레이아웃(비용 컬럼/사용 컬럼/중복 강조 값)은 집계 쿼리로 먼저
+확정하고(_load_sheet_stats), 데이터 행은 라인 + 선적 + 비용을 조인한 결과를 db.stream 으로
+STREAM_YIELD_PER 행씩 읽으면서 바로 기록한다(_stream_lines) - 피크 메모리가 라인 수와 무관.
 """
 import os
 import io
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from decimal import Decimal
-from collections import defaultdict
-from typing import Optional
+from types import SimpleNamespace
+from typing import AsyncIterator, Iterator, Optional
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import (
-    Font, Alignment, Border, Side, PatternFill, numbers,
+    Font, Alignment, Border, Side, PatternFill, NamedStyle, numbers,
 )
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter, column_index_from_string
-from sqlalchemy import select
+from sqlalchemy import Integer, Numeric, String, case, func, literal_column, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.debit_note import DebitNote, DebitNoteLine
 from app.models.shipment import Shipment, ShipmentFeeDetail
-from app.models.fee import FeeItem
-from app.models.client import Client, ClientTemplate, ClientFeeMapping
+from app.models.client import Client, ClientTemplate
+from app.services.reference_data import reference_cache
 
 
+# 레이아웃/수식/스타일이 바뀌면 올린다 (출력 캐시 무효화)
+GENERATOR_VERSION = "2"
+
 # ── 스타일 상수 ──────────────────────────────────────────────
 TITLE_FONT = Font(name="Arial", size=14, bold=True)
 HEADER_FONT = Font(name="Arial", size=10, bold=True)
 DATA_FONT = Font(name="Arial", size=9)
 COMPANY_FONT = Font(name="Arial", size=11, bold=True)
 LABEL_FONT = Font(name="Arial", size=10)
+TOTAL_FONT = Font(name="Arial", size=10, bold=True)
+RATE_FONT = Font(name="Arial", size=10, bold=True, color="FF0000")
+HIDDEN_FONT = Font(name="Arial", size=8, color="999999")
 THIN_BORDER = Border(
     left=Side(style="thin"),
     right=Side(style="thin"),
@@ -43,6 +60,43 @@ HEADER_FILL = PatternFill(start_color="DCE6F1", end_color="DCE6F1", fill_type="s
 DUPLICATE_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
 NUMBER_FMT_USD = '#,##0.00'
 NUMBER_FMT_VND = '#,##0'
+NUMBER_FMT_DATE = "YYYY-MM-DD"
+
+CENTER = Alignment(horizontal="center")
+RIGHT = Alignment(horizontal="right")
+
+# named style 정의: 이름 → 속성 (워크북마다 새 NamedStyle 로 등록)
+CELL_STYLES = {
+    # 헤더 영역 (Row 1-13)
+    "dn_company": dict(font=COMPANY_FONT),
+    "dn_small": dict(font=DATA_FONT),
+    "dn_label": dict(font=LABEL_FONT),
+    "dn_label_date": dict(font=LABEL_FONT, number_format=NUMBER_FMT_DATE),
+    "dn_rate": dict(font=RATE_FONT, number_format=NUMBER_FMT_VND),
+    "dn_title": dict(font=TITLE_FONT, alignment=Alignment(horizontal="center", vertical="center")),
+    "dn_hidden": dict(font=HIDDEN_FONT),
+    "dn_hidden_vnd": dict(font=HIDDEN_FONT, number_format=NUMBER_FMT_VND),
+    # 컬럼 헤더 (Row 14-15)
+    "dn_column_header": dict(
+        font=HEADER_FONT,
+        alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+        fill=HEADER_FILL,
+        border=THIN_BORDER,
+    ),
+    # 데이터 행 (FR-024 테두리)
+    "dn_cell": dict(font=DEFAULT_FONT, border=THIN_BORDER),
+    "dn_text": dict(font=DATA_FONT, border=THIN_BORDER),
+    "dn_no": dict(font=DATA_FONT, alignment=CENTER, border=THIN_BORDER),
+    "dn_date": dict(font=DATA_FONT, number_format=NUMBER_FMT_DATE, border=THIN_BORDER),
+    "dn_duplicate": dict(font=DATA_FONT, fill=DUPLICATE_FILL, border=THIN_BORDER),
+    "dn_weight": dict(font=DATA_FONT, number_format=NUMBER_FMT_USD, border=THIN_BORDER),
+    "dn_usd": dict(font=DATA_FONT, number_format=NUMBER_FMT_USD, alignment=RIGHT, border=THIN_BORDER),
+    "dn_vnd": dict(font=DATA_FONT, number_format=NUMBER_FMT_VND, alignment=RIGHT, border=THIN_BORDER),
+    # 합계 행
+    "dn_total_label": dict(font=TOTAL_FONT, alignment=CENTER, border=THIN_BORDER),
+    "dn_total_usd": dict(font=TOTAL_FONT, number_format=NUMBER_FMT_USD, border=THIN_BORDER),
+    "dn_total_vnd": dict(font=TOTAL_FONT, number_format=NUMBER_FMT_VND, border=THIN_BORDER),
+}
 
 # ── IMPORT 컬럼 헤더 정의 ────────────────────────────────────
 IMPORT_HEADERS = {
@@ -67,6 +121,66 @@ EXPORT_HEADERS = {
     "AK": "VAT (8%)", "AL": "Grand total (VND)",
 }
 
+# 선적 필드 → 데이터 컬럼 (_data_row_cells 와 같은 배치 - 사용 컬럼 집계용)
+_COMMON_COLUMNS = {
+    "delivery_date": "B", "invoice_no": "C", "mbl": "D", "hbl": "E", "term": "F",
+    "no_of_pkgs": "G", "gross_weight": "H", "chargeable_weight": "I",
+}
+IMPORT_FIELD_COLUMNS = {
+    **_COMMON_COLUMNS, "cd_no": "J", "cd_type": "K", "air_ocean_rate": "L", "back_to_back_invoice": "BG",
+}
+EXPORT_FIELD_COLUMNS = {**_COMMON_COLUMNS, "origin_destination": "M"}
+SHIPMENT_FIELDS = tuple(dict.fromkeys([*IMPORT_FIELD_COLUMNS, *EXPORT_FIELD_COLUMNS]))
+
+# 시트 안에서 같은 값이 2번 이상 나오면 강조 (FR-009)
+DUPLICATE_FIELDS = ("invoice_no", "mbl", "hbl", "cd_no")
+
+# 데이터 행 스트리밍 단위 (라인 × 비용 조인 행)
+STREAM_YIELD_PER = 1000
+
+# 행 데이터: {컬럼 문자: (값, named style)}
+RowCells = dict[str, tuple[object, str]]
+
+
+@dataclass
+class _SheetStats:
+    """시트 레이아웃 결정용 집계 (라인을 읽기 전에 확정)"""
+    line_count: int = 0
+    filled_fields: frozenset = frozenset()  # 값이 있는 선적 필드
+    pay_on_behalf: bool = False  # pay_on_behalf > 0 인 라인 존재
+    fee_items: dict = field(default_factory=dict)  # fee_item_id -> 금액(≠0) 유무 (시트 fee_details 에 나온 항목)
+    duplicate_values: dict = field(default_factory=dict)  # 필드명 -> 2번 이상 나온 값
+
+
+@dataclass
+class _ExcelData:
+    """Excel 생성에 필요한 DN 데이터 (라인 제외 - 행 기록 시 스트리밍)"""
+    dn: DebitNote
+    client: Client
+    exchange_rate: float
+    period_str: str
+    filename: str
+    sheets: list  # [(sheet_type, _SheetStats, template, fee_mappings)]
+    all_fee_items: list
+
+
+@dataclass
+class _SheetLayout:
+    """시트 레이아웃 - 컬럼 배치/합계 컬럼/사용 컬럼 (행 생성 전에 확정)"""
+    title: str
+    is_import: bool
+    data_start_row: int
+    fee_col_map: dict  # fee_item_id -> column_letter
+    col_fee_map: dict  # column_letter -> fee_item
+    total_usd_col: str
+    total_vnd_col: str
+    vat_col: str
+    grand_total_col: str
+    fee_start: str
+    fee_end: str
+    duplicate_values: dict  # 필드명 -> 시트 안에서 2번 이상 나온 값 (중복 강조)
+    used_columns: set  # 데이터가 있는 컬럼 (테두리/빈 컬럼 숨김)
+
 
 async def generate_debit_note_excel(
     debit_note_id: int,
@@ -77,13 +191,47 @@ async def generate_debit_note_excel(
     Returns:
         (BytesIO buffer, filename)
     """
-    # ── 1. 데이터 로드 ─────────────────────────────────────
+    data = await _load_excel_data(debit_note_id, db)
+
+    wb = Workbook()
+    wb.remove(wb.active)  # 기본 시트 제거
+    await _populate_workbook(wb, data, db, write_only=False)
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer, data.filename
+
+
+async def write_debit_note_excel(
+    debit_note_id: int,
+    db: AsyncSession,
+    output_dir: str,
+) -> tuple[str, str]:
+    """Debit Note를 write_only 모드로 파일에 직접 생성 (대용량 DN)
+
+    라인을 스트리밍으로 읽으면서 셀 객체를 쌓지 않고 행 단위로 임시 파일에 기록한 뒤 xlsx 로 묶는다.
+    결과 레이아웃/수식은 generate_debit_note_excel 과 동일.
+
+    Returns:
+        (file_path, filename)
+    """
+    data = await _load_excel_data(debit_note_id, db)
+
+    wb = Workbook(write_only=True)
+    await _populate_workbook(wb, data, db, write_only=True)
+
+    os.makedirs(output_dir, exist_ok=True)
+    file_path = os.path.join(output_dir, data.filename)
+    wb.save(file_path)
+    return file_path, data.filename
+
+
+async def _load_excel_data(debit_note_id: int, db: AsyncSession) -> _ExcelData:
+    """DN + 거래처 템플릿/fee 매핑 + 시트별 집계 (라인/선적은 로드하지 않음)"""
     dn = (await db.execute(
         select(DebitNote)
-        .options(
-            selectinload(DebitNote.lines),
-            selectinload(DebitNote.client),
-        )
+        .options(selectinload(DebitNote.client))
         .where(DebitNote.debit_note_id == debit_note_id)
     )).scalar_one_or_none()
 
@@ -92,119 +240,241 @@ async def generate_debit_note_excel(
 
     client = dn.client
 
-    # 템플릿 로드
-    templates = (await db.execute(
-        select(ClientTemplate)
-        .where(ClientTemplate.client_id == client.client_id, ClientTemplate.is_active == True)
-    )).scalars().all()
-
-    # fee 매핑 로드
-    fee_mappings = (await db.execute(
-        select(ClientFeeMapping)
-        .options(selectinload(ClientFeeMapping.fee_item))
-        .where(ClientFeeMapping.client_id == client.client_id, ClientFeeMapping.is_active == True)
-        .order_by(ClientFeeMapping.sort_order)
-    )).scalars().all()
-
-    # 모든 fee_items 로드
-    all_fee_items = (await db.execute(
-        select(FeeItem).where(FeeItem.is_active == True).order_by(FeeItem.sort_order)
-    )).scalars().all()
-    fee_item_map = {fi.fee_item_id: fi for fi in all_fee_items}
-
-    # 라인별 shipment + fee_details 로드
-    shipment_ids = [line.shipment_id for line in dn.lines]
-    shipments_result = await db.execute(
-        select(Shipment)
-        .options(selectinload(Shipment.fee_details).selectinload(ShipmentFeeDetail.fee_item))
-        .where(Shipment.shipment_id.in_(shipment_ids))
-    )
-    shipments_by_id = {s.shipment_id: s for s in shipments_result.scalars().unique().all()}
+    # 템플릿 / fee 매핑 / 전체 fee_items - 기준 데이터 캐시
+    templates = await reference_cache.client_templates(db, client.client_id)
+    fee_mappings = await reference_cache.client_fee_mappings(db, client.client_id)
+    all_fee_items = await reference_cache.fee_items(db)
 
-    # 라인을 line_no 순서로 정렬
-    lines_sorted = sorted(dn.lines, key=lambda l: l.line_no or 0)
-
-    # ── 2. 워크북 생성 ─────────────────────────────────────
-    wb = Workbook()
-    wb.remove(wb.active)  # 기본 시트 제거
+    stats = await _load_sheet_stats(db, debit_note_id)
 
     exchange_rate = float(dn.exchange_rate or 26446)
     period_str = dn.period_from.strftime("%m%Y") if dn.period_from else date.today().strftime("%m%Y")
 
-    # IMPORT/EXPORT 시트 분리
-    import_lines = []
-    export_lines = []
-    for line in lines_sorted:
-        ship = shipments_by_id.get(line.shipment_id)
-        if ship:
-            if ship.shipment_type == "EXPORT":
-                export_lines.append((line, ship))
-            else:
-                import_lines.append((line, ship))
-
-    sheets_to_create = []
-    if dn.sheet_type in ("IMPORT", "ALL") and import_lines:
-        imp_tmpl = next((t for t in templates if t.sheet_type == "IMPORT"), None)
-        sheets_to_create.append(("IMPORT", import_lines, imp_tmpl))
-    if dn.sheet_type in ("EXPORT", "ALL") and export_lines:
-        exp_tmpl = next((t for t in templates if t.sheet_type == "EXPORT"), None)
-        sheets_to_create.append(("EXPORT", export_lines, exp_tmpl))
-
+    # IMPORT/EXPORT 시트 (라인이 있는 시트만)
+    sheet_types = [
+        sheet_type for sheet_type in ("IMPORT", "EXPORT")
+        if dn.sheet_type in (sheet_type, "ALL") and sheet_type in stats
+    ]
     # 데이터가 없으면 기본 IMPORT 시트라도 생성
-    if not sheets_to_create:
-        imp_tmpl = next((t for t in templates if t.sheet_type == "IMPORT"), None)
-        sheets_to_create.append(("IMPORT", import_lines or [], imp_tmpl))
+    if not sheet_types:
+        sheet_types = ["IMPORT"]
+
+    dn_number = dn.debit_note_number or f"DN-{dn.debit_note_id}"
+    filename = f"{client.client_code}_{dn_number}_{period_str}.xlsx"
+    filename = filename.replace(" ", "_")
+
+    return _ExcelData(
+        dn=dn,
+        client=client,
+        exchange_rate=exchange_rate,
+        period_str=period_str,
+        filename=filename,
+        sheets=[
+            (
+                sheet_type,
+                stats.get(sheet_type, _SheetStats()),
+                next((t for t in templates if t.sheet_type == sheet_type), None),
+                [fm for fm in fee_mappings if fm.sheet_type == sheet_type],
+            )
+            for sheet_type in sheet_types
+        ],
+        all_fee_items=all_fee_items,
+    )
+
+
+# ── 라인 집계 / 스트리밍 ──────────────────────────────────────
+
+def _sheet_type_column():
+    """선적 → 시트 (EXPORT 외에는 IMPORT) - GROUP BY 에 같은 식을 쓰도록 바인드 파라미터 없이 생성"""
+    return case(
+        (Shipment.shipment_type == literal_column("'EXPORT'"), literal_column("'EXPORT'")),
+        else_=literal_column("'IMPORT'"),
+    )
+
+
+def _line_shipments(debit_note_id: int, *columns):
+    """DN 라인 ⋈ 선적 SELECT"""
+    return (
+        select(*columns)
+        .select_from(DebitNoteLine)
+        .join(Shipment, Shipment.shipment_id == DebitNoteLine.shipment_id)
+        .where(DebitNoteLine.debit_note_id == debit_note_id)
+    )
+
+
+def _count_filled(column):
+    """값이 있는 행 수 - 빈 문자열/0 은 값 없음 (_data_row_cells 의 조건과 동일)"""
+    if isinstance(column.type, String):
+        return func.count(func.nullif(column, ""))
+    if isinstance(column.type, (Integer, Numeric)):
+        return func.count(func.nullif(column, 0))
+    return func.count(column)
+
+
+async def _load_sheet_stats(db: AsyncSession, debit_note_id: int) -> dict[str, _SheetStats]:
+    """시트별 레이아웃 집계 → {sheet_type: _SheetStats} (라인이 있는 시트만, 쿼리 3회)"""
+    sheet = _sheet_type_column()
+    stats: dict[str, _SheetStats] = {}
+
+    # 라인 수 / 값이 있는 필드 / pay on behalf
+    result = await db.execute(
+        _line_shipments(
+            debit_note_id,
+            sheet,
+            func.count(),
+            func.count(case((DebitNoteLine.pay_on_behalf > 0, 1))),
+            *(_count_filled(getattr(Shipment, field)) for field in SHIPMENT_FIELDS),
+        ).group_by(sheet)
+    )
+    for sheet_type, line_count, pay_on_behalf, *filled in result:
+        stats[sheet_type] = _SheetStats(
+            line_count=line_count,
+            filled_fields=frozenset(field for field, count in zip(SHIPMENT_FIELDS, filled) if count),
+            pay_on_behalf=bool(pay_on_behalf),
+        )
+
+    # 시트에 나온 비용 항목 + 금액 유무
+    result = await db.execute(
+        _line_shipments(
+            debit_note_id,
+            sheet,
+            ShipmentFeeDetail.fee_item_id,
+            func.max(case((ShipmentFeeDetail.amount_usd != 0, 1), else_=0)),
+        )
+        .join(ShipmentFeeDetail, ShipmentFeeDetail.shipment_id == Shipment.shipment_id)
+        .group_by(sheet, ShipmentFeeDetail.fee_item_id)
+    )
+    for sheet_type, fee_item_id, has_amount in result:
+        stats[sheet_type].fee_items[fee_item_id] = bool(has_amount)
+
+    # 중복 강조 값
+    result = await db.execute(union_all(*(
+        _line_shipments(
+            debit_note_id,
+            sheet.label("sheet_type"),
+            literal_column(f"'{field}'").label("field"),
+            getattr(Shipment, field).label("value"),
+        )
+        .where(getattr(Shipment, field) != "")
+        .group_by(sheet, getattr(Shipment, field))
+        .having(func.count() > 1)
+        for field in DUPLICATE_FIELDS
+    )))
+    for sheet_type, field, value in result:
+        stats[sheet_type].duplicate_values.setdefault(field, set()).add(value)
+
+    return stats
+
+
+async def _stream_lines(
+    db: AsyncSession,
+    debit_note_id: int,
+    sheet_type: str,
+) -> AsyncIterator[tuple[SimpleNamespace, SimpleNamespace]]:
+    """시트 라인을 line_no 순서로 (line, ship) 스트리밍 - ship.fee_details 는 그 선적의 비용 행
 
-    for sheet_type, lines_data, template in sheets_to_create:
-        _build_sheet(
-            wb=wb,
+    라인 ⋈ 선적 ⟕ 비용 결과를 STREAM_YIELD_PER 행씩 읽어 라인 단위로 묶는다.
+    """
+    result = await db.stream(
+        _line_shipments(
+            debit_note_id,
+            DebitNoteLine.line_id,
+            DebitNoteLine.pay_on_behalf,
+            *(getattr(Shipment, field) for field in SHIPMENT_FIELDS),
+            ShipmentFeeDetail.fee_item_id,
+            ShipmentFeeDetail.amount_usd,
+        )
+        .outerjoin(ShipmentFeeDetail, ShipmentFeeDetail.shipment_id == Shipment.shipment_id)
+        .where(_sheet_type_column() == sheet_type)
+        .order_by(func.coalesce(DebitNoteLine.line_no, 0), DebitNoteLine.line_id, ShipmentFeeDetail.detail_id)
+        .execution_options(yield_per=STREAM_YIELD_PER)
+    )
+    line = ship = None
+    async for row in result:
+        if line is None or row.line_id != line.line_id:
+            if line is not None:
+                yield line, ship
+            line = SimpleNamespace(line_id=row.line_id, pay_on_behalf=row.pay_on_behalf)
+            ship = SimpleNamespace(**{field: getattr(row, field) for field in SHIPMENT_FIELDS}, fee_details=[])
+        if row.fee_item_id is not None:
+            ship.fee_details.append(SimpleNamespace(fee_item_id=row.fee_item_id, amount_usd=row.amount_usd))
+    if line is not None:
+        yield line, ship
+
+
+# ── 시트 기록 ────────────────────────────────────────────────
+
+async def _populate_workbook(wb: Workbook, data: _ExcelData, db: AsyncSession, write_only: bool):
+    """시트 생성 - 라인을 스트리밍하면서 write_only 면 행 순서대로 append, 아니면 셀 단위 기록"""
+    for name, attrs in CELL_STYLES.items():
+        wb.add_named_style(NamedStyle(name=name, **attrs))
+
+    for sheet_type, stats, template, fee_mappings in data.sheets:
+        layout = _plan_sheet(
             sheet_type=sheet_type,
-            lines_data=lines_data,
+            stats=stats,
             template=template,
-            client=client,
-            dn=dn,
-            exchange_rate=exchange_rate,
-            period_str=period_str,
-            fee_mappings=[fm for fm in fee_mappings if fm.sheet_type == sheet_type],
-            fee_item_map=fee_item_map,
-            all_fee_items=all_fee_items,
+            client=data.client,
+            period_str=data.period_str,
+            fee_mappings=fee_mappings,
+            all_fee_items=data.all_fee_items,
         )
+        ws = wb.create_sheet(title=layout.title)
+        # write_only 시트는 컬럼/행 속성을 첫 행 기록 전에 설정해야 함
+        _configure_sheet(ws, layout, write_only)
+
+        lines = _stream_lines(db, data.dn.debit_note_id, sheet_type)
+        rows = _sheet_rows(layout, lines, data.client, data.dn, data.exchange_rate)
+        if write_only:
+            await _append_rows(ws, rows)
+        else:
+            await _write_rows(ws, rows)
 
-    # ── 3. 출력 ──────────────────────────────────────────
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
 
-    dn_number = dn.debit_note_number or f"DN-{dn.debit_note_id}"
-    filename = f"{client.client_code}_{dn_number}_{period_str}.xlsx"
-    filename = filename.replace(" ", "_")
+async def _write_rows(ws, rows: AsyncIterator[tuple[int, RowCells]]):
+    """일반 Workbook: 셀 단위 기록"""
+    async for row, cells in rows:
+        for col_letter, (value, style) in cells.items():
+            cell = ws.cell(row=row, column=column_index_from_string(col_letter), value=value)
+            cell.style = style
+
 
-    return buffer, filename
+async def _append_rows(ws, rows: AsyncIterator[tuple[int, RowCells]]):
+    """write_only Workbook: 행 번호 순서대로 append (빈 행은 빈 리스트)"""
+    next_row = 1
+    async for row, cells in rows:
+        if row < next_row:
+            raise ValueError(f"Row {row} written out of order (expected >= {next_row})")
+        while next_row < row:
+            ws.append([])
+            next_row += 1
 
+        values = [None] * max(column_index_from_string(c) for c in cells)
+        for col_letter, (value, style) in cells.items():
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            values[column_index_from_string(col_letter) - 1] = cell
+        ws.append(values)
+        next_row += 1
 
-def _build_sheet(
-    wb: Workbook,
+
+def _plan_sheet(
     sheet_type: str,
-    lines_data: list,
+    stats: _SheetStats,
     template: Optional[ClientTemplate],
     client: Client,
-    dn: DebitNote,
-    exchange_rate: float,
     period_str: str,
     fee_mappings: list,
-    fee_item_map: dict,
     all_fee_items: list,
-):
-    """개별 시트 생성 (IMPORT 또는 EXPORT)"""
+) -> _SheetLayout:
+    """시트 레이아웃 결정 (IMPORT 또는 EXPORT) - 집계만으로 확정 (라인 불필요)"""
 
     # 시트명
     if template and template.sheet_name_pattern:
         sheet_name = template.sheet_name_pattern.replace("{MMYYYY}", period_str)
     else:
         sheet_name = f"{sheet_type} {client.client_code[:3]} {period_str}"
-    ws = wb.create_sheet(title=sheet_name[:31])  # Excel 시트명 31자 제한
 
-    data_start_row = template.data_start_row if template else 16
     is_import = sheet_type == "IMPORT"
 
     # ── 비용 컬럼 구성 ───────────────────────────────────
@@ -218,10 +488,7 @@ def _build_sheet(
             col_fee_map[fm.column_letter] = fm.fee_item
     else:
         # 데이터에서 사용된 fee_item들을 자동으로 컬럼 배치
-        used_fee_ids = set()
-        for line, ship in lines_data:
-            for fd in ship.fee_details:
-                used_fee_ids.add(fd.fee_item_id)
+        used_fee_ids = set(stats.fee_items)
 
         start_col = "M"
         start_idx = column_index_from_string(start_col)
@@ -252,369 +519,251 @@ def _build_sheet(
         fee_start = template.fee_column_start if template else "M"
         fee_end = template.fee_column_end if template else "AH"
 
-    # ── 헤더 영역 (Row 1-15) ─────────────────────────────
-    _build_header(
-        ws=ws,
-        client=client,
-        dn=dn,
-        exchange_rate=exchange_rate,
+    layout = _SheetLayout(
+        title=sheet_name[:31],  # Excel 시트명 31자 제한
         is_import=is_import,
+        data_start_row=template.data_start_row if template else 16,
+        fee_col_map=fee_col_map,
+        col_fee_map=col_fee_map,
         total_usd_col=total_usd_col,
-        grand_total_col=grand_total_col,
+        total_vnd_col=total_vnd_col,
         vat_col=vat_col,
+        grand_total_col=grand_total_col,
+        fee_start=fee_start,
+        fee_end=fee_end,
+        duplicate_values={field: stats.duplicate_values.get(field, set()) for field in DUPLICATE_FIELDS},
+        used_columns=set(),
     )
 
-    # ── 컬럼 헤더 (Row 14-15) ────────────────────────────
-    base_headers = IMPORT_HEADERS if is_import else EXPORT_HEADERS
-    # 기본 헤더 쓰기
-    for col_letter, header_text in base_headers.items():
-        col_idx = column_index_from_string(col_letter)
-        cell = ws.cell(row=14, column=col_idx, value=header_text)
-        cell.font = HEADER_FONT
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        cell.fill = HEADER_FILL
-        cell.border = THIN_BORDER
-        # 14-15행 병합
-        ws.merge_cells(start_row=14, start_column=col_idx, end_row=15, end_column=col_idx)
-
-    # 비용 컬럼 헤더
-    for col_letter, fi in col_fee_map.items():
-        col_idx = column_index_from_string(col_letter)
-        display_name = fi.item_name if hasattr(fi, 'item_name') else str(fi)
-        cell = ws.cell(row=14, column=col_idx, value=display_name)
-        cell.font = HEADER_FONT
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        cell.fill = HEADER_FILL
-        cell.border = THIN_BORDER
-        ws.merge_cells(start_row=14, start_column=col_idx, end_row=15, end_column=col_idx)
-
-    # ── 데이터 행 (Row 16+) ──────────────────────────────
-    # 중복 감지용 딕셔너리
-    hbl_counts = defaultdict(int)
-    mbl_counts = defaultdict(int)
-    inv_counts = defaultdict(int)
-    cd_counts = defaultdict(int)
-
-    for line, ship in lines_data:
-        if ship.hbl:
-            hbl_counts[ship.hbl] += 1
-        if ship.mbl:
-            mbl_counts[ship.mbl] += 1
-        if ship.invoice_no:
-            inv_counts[ship.invoice_no] += 1
-        if ship.cd_no:
-            cd_counts[ship.cd_no] += 1
-
-    # 사용된 컬럼 추적 (빈 컬럼 숨김용)
-    used_columns = set()
-
-    sum_total_usd = Decimal("0")
-    sum_total_vnd = 0
-    sum_vat = 0
-    sum_grand_total = 0
-
-    for idx, (line, ship) in enumerate(lines_data):
-        row = data_start_row + idx
-        fee_details_map = {fd.fee_item_id: fd for fd in ship.fee_details}
-
-        # A: No.
-        ws.cell(row=row, column=1, value=idx + 1).font = DATA_FONT
-        ws.cell(row=row, column=1).alignment = Alignment(horizontal="center")
-        used_columns.add("A")
-
-        # B: Delivery Date
-        if ship.delivery_date:
-            cell = ws.cell(row=row, column=2, value=ship.delivery_date)
-            cell.number_format = "YYYY-MM-DD"
-            cell.font = DATA_FONT
-            used_columns.add("B")
-
-        # C: Invoice No
-        if ship.invoice_no:
-            cell = ws.cell(row=row, column=3, value=ship.invoice_no)
-            cell.font = DATA_FONT
-            if inv_counts.get(ship.invoice_no, 0) > 1:
-                cell.fill = DUPLICATE_FILL
-            used_columns.add("C")
-
-        # D: MBL
-        if ship.mbl:
-            cell = ws.cell(row=row, column=4, value=ship.mbl)
-            cell.font = DATA_FONT
-            if mbl_counts.get(ship.mbl, 0) > 1:
-                cell.fill = DUPLICATE_FILL
-            used_columns.add("D")
-
-        # E: HBL
-        if ship.hbl:
-            cell = ws.cell(row=row, column=5, value=ship.hbl)
-            cell.font = DATA_FONT
-            if hbl_counts.get(ship.hbl, 0) > 1:
-                cell.fill = DUPLICATE_FILL
-            used_columns.add("E")
-
-        # F: Term
-        if ship.term:
-            ws.cell(row=row, column=6, value=ship.term).font = DATA_FONT
-            used_columns.add("F")
-
-        # G: No. of pkgs
-        if ship.no_of_pkgs:
-            ws.cell(row=row, column=7, value=ship.no_of_pkgs).font = DATA_FONT
-            used_columns.add("G")
-
-        # H: Gross weight
-        if ship.gross_weight:
-            cell = ws.cell(row=row, column=8, value=float(ship.gross_weight))
-            cell.font = DATA_FONT
-            cell.number_format = NUMBER_FMT_USD
-            used_columns.add("H")
-
-        # I: Chargeable weight
-        if ship.chargeable_weight:
-            cell = ws.cell(row=row, column=9, value=float(ship.chargeable_weight))
-            cell.font = DATA_FONT
-            cell.number_format = NUMBER_FMT_USD
-            used_columns.add("I")
-
-        if is_import:
-            # J: CD No.
-            if ship.cd_no:
-                cell = ws.cell(row=row, column=10, value=ship.cd_no)
-                cell.font = DATA_FONT
-                if cd_counts.get(ship.cd_no, 0) > 1:
-                    cell.fill = DUPLICATE_FILL
-                used_columns.add("J")
-
-            # K: CD Type
-            if ship.cd_type:
-                ws.cell(row=row, column=11, value=ship.cd_type).font = DATA_FONT
-                used_columns.add("K")
-
-            # L: Air rate/Ocean freight
-            if ship.air_ocean_rate:
-                ws.cell(row=row, column=12, value=ship.air_ocean_rate).font = DATA_FONT
-                used_columns.add("L")
-        else:
-            # EXPORT: M = Origin/Destination (handled via fee_col or direct)
-            if ship.origin_destination:
-                col_idx = column_index_from_string("M")
-                ws.cell(row=row, column=col_idx, value=ship.origin_destination).font = DATA_FONT
-                used_columns.add("M")
-
-        # 비용 항목 데이터 (M-AT or M-AH)
-        for fee_item_id, col_letter in fee_col_map.items():
-            fd = fee_details_map.get(fee_item_id)
-            if fd and fd.amount_usd:
-                col_idx = column_index_from_string(col_letter)
-                amount = float(fd.amount_usd)
-                cell = ws.cell(row=row, column=col_idx, value=amount)
-                cell.font = DATA_FONT
-                cell.number_format = NUMBER_FMT_USD
-                cell.alignment = Alignment(horizontal="right")
-                used_columns.add(col_letter)
-
-        # Pay on behalf (IMPORT: BA)
-        if is_import and line.pay_on_behalf and float(line.pay_on_behalf) > 0:
-            ba_idx = column_index_from_string("BA")
-            cell = ws.cell(row=row, column=ba_idx, value=float(line.pay_on_behalf))
-            cell.font = DATA_FONT
-            cell.number_format = NUMBER_FMT_USD
-            cell.alignment = Alignment(horizontal="right")
-            used_columns.add("BA")
-
-        # ── 수식 컬럼 (BC-BF / AI-AL) ────────────────────
-        if is_import:
-            # BC = SUM(M:AT)
-            bc_idx = column_index_from_string(total_usd_col)
-            fee_start_letter = fee_start
-            fee_end_letter = fee_end
-            ws.cell(row=row, column=bc_idx).value = f"=SUM({fee_start_letter}{row}:{fee_end_letter}{row})"
-            ws.cell(row=row, column=bc_idx).number_format = NUMBER_FMT_USD
-            ws.cell(row=row, column=bc_idx).font = DATA_FONT
-            ws.cell(row=row, column=bc_idx).alignment = Alignment(horizontal="right")
-            used_columns.add(total_usd_col)
-
-            # BD = BC * 환율 ($BE$13)
-            bd_idx = column_index_from_string(total_vnd_col)
-            ws.cell(row=row, column=bd_idx).value = f"={total_usd_col}{row}*$BE$13"
-            ws.cell(row=row, column=bd_idx).number_format = NUMBER_FMT_VND
-            ws.cell(row=row, column=bd_idx).font = DATA_FONT
-            ws.cell(row=row, column=bd_idx).alignment = Alignment(horizontal="right")
-            used_columns.add(total_vnd_col)
-
-            # BE = SUM(Z:AT) * 환율 * 8%
-            be_idx = column_index_from_string(vat_col)
-            # VAT 적용 범위: Z-AT (현지비용만)
-            ws.cell(row=row, column=be_idx).value = f"=SUM(Z{row}:{fee_end_letter}{row})*$BE$13*8%"
-            ws.cell(row=row, column=be_idx).number_format = NUMBER_FMT_VND
-            ws.cell(row=row, column=be_idx).font = DATA_FONT
-            ws.cell(row=row, column=be_idx).alignment = Alignment(horizontal="right")
-            used_columns.add(vat_col)
-
-            # BF = BD + BE
-            bf_idx = column_index_from_string(grand_total_col)
-            ws.cell(row=row, column=bf_idx).value = f"={total_vnd_col}{row}+{vat_col}{row}"
-            ws.cell(row=row, column=bf_idx).number_format = NUMBER_FMT_VND
-            ws.cell(row=row, column=bf_idx).font = DATA_FONT
-            ws.cell(row=row, column=bf_idx).alignment = Alignment(horizontal="right")
-            used_columns.add(grand_total_col)
-
+    # 사용된 컬럼 (빈 컬럼 숨김/테두리용) - _data_row_cells 가 값을 쓰는 컬럼을 집계로 확정
+    if stats.line_count:
+        field_columns = IMPORT_FIELD_COLUMNS if is_import else EXPORT_FIELD_COLUMNS
+        layout.used_columns.update(["A", total_usd_col, total_vnd_col, vat_col, grand_total_col])
+        layout.used_columns.update(col for field, col in field_columns.items() if field in stats.filled_fields)
+        layout.used_columns.update(
+            fee_col_map[fee_item_id]
+            for fee_item_id, has_amount in stats.fee_items.items()
+            if has_amount and fee_item_id in fee_col_map
+        )
+        if is_import and stats.pay_on_behalf:
+            layout.used_columns.add("BA")
+
+    return layout
+
+
+def _configure_sheet(ws, layout: _SheetLayout, write_only: bool):
+    """병합/숨김 행/컬럼 너비/행 고정 - 행 기록 전에 설정"""
+    # Row 12: DEBIT NOTE 타이틀 병합 (FR-026), Row 14-15: 컬럼 헤더 병합
+    merges = [f"A12:{layout.grand_total_col}12"]
+    base_headers = IMPORT_HEADERS if layout.is_import else EXPORT_HEADERS
+    for col_letter in dict.fromkeys([*base_headers, *layout.col_fee_map]):
+        merges.append(f"{col_letter}14:{col_letter}15")
+    for ref in merges:
+        if write_only:
+            ws.merged_cells.add(ref)
         else:
-            # EXPORT 수식
-            # AI = SUM(M:N) -- subtotal
-            ai_idx = column_index_from_string(total_usd_col)
-            ws.cell(row=row, column=ai_idx).value = f"=SUM(M{row}+N{row})"
-            ws.cell(row=row, column=ai_idx).number_format = NUMBER_FMT_USD
-            ws.cell(row=row, column=ai_idx).font = DATA_FONT
-            ws.cell(row=row, column=ai_idx).alignment = Alignment(horizontal="right")
-            used_columns.add(total_usd_col)
-
-            # AJ = ROUND(SUM(M:AH) * 환율, 0)
-            aj_idx = column_index_from_string(total_vnd_col)
-            ws.cell(row=row, column=aj_idx).value = f"=ROUND(SUM(M{row}:{fee_end}{row})*$D$9,0)"
-            ws.cell(row=row, column=aj_idx).number_format = NUMBER_FMT_VND
-            ws.cell(row=row, column=aj_idx).font = DATA_FONT
-            ws.cell(row=row, column=aj_idx).alignment = Alignment(horizontal="right")
-            used_columns.add(total_vnd_col)
-
-            # AK = AJ * 8%
-            ak_idx = column_index_from_string(vat_col)
-            ws.cell(row=row, column=ak_idx).value = f"={total_vnd_col}{row}*8%"
-            ws.cell(row=row, column=ak_idx).number_format = NUMBER_FMT_VND
-            ws.cell(row=row, column=ak_idx).font = DATA_FONT
-            ws.cell(row=row, column=ak_idx).alignment = Alignment(horizontal="right")
-            used_columns.add(vat_col)
-
-            # AL = AJ + AK
-            al_idx = column_index_from_string(grand_total_col)
-            ws.cell(row=row, column=al_idx).value = f"=SUM({total_vnd_col}{row}+{vat_col}{row})"
-            ws.cell(row=row, column=al_idx).number_format = NUMBER_FMT_VND
-            ws.cell(row=row, column=al_idx).font = DATA_FONT
-            ws.cell(row=row, column=al_idx).alignment = Alignment(horizontal="right")
-            used_columns.add(grand_total_col)
-
-        # BG: Back-to-back Invoice (IMPORT only)
-        if is_import and ship.back_to_back_invoice:
-            bg_idx = column_index_from_string("BG")
-            ws.cell(row=row, column=bg_idx, value=ship.back_to_back_invoice).font = DATA_FONT
-            used_columns.add("BG")
-
-        # 테두리 적용 (데이터 행)
-        _apply_row_borders(ws, row, is_import, used_columns)
-
-        # 합계 누적
-        sum_total_usd += line.total_usd or Decimal("0")
-        sum_total_vnd += int(line.total_vnd or 0)
-        sum_vat += int(line.vat_amount or 0)
-        sum_grand_total += int(line.grand_total_vnd or 0)
+            ws.merge_cells(ref)
 
-    # ── 합계 행 ──────────────────────────────────────────
-    if lines_data:
-        sum_row = data_start_row + len(lines_data)
-        last_data_row = data_start_row + len(lines_data) - 1
-
-        # "TOTAL" 라벨
-        ws.cell(row=sum_row, column=1, value="TOTAL").font = Font(name="Arial", size=10, bold=True)
-        ws.cell(row=sum_row, column=1).alignment = Alignment(horizontal="center")
-
-        # 합계 수식
-        tc_idx = column_index_from_string(total_usd_col)
-        ws.cell(row=sum_row, column=tc_idx).value = f"=SUM({total_usd_col}{data_start_row}:{total_usd_col}{last_data_row})"
-        ws.cell(row=sum_row, column=tc_idx).number_format = NUMBER_FMT_USD
-        ws.cell(row=sum_row, column=tc_idx).font = Font(name="Arial", size=10, bold=True)
-
-        tv_idx = column_index_from_string(total_vnd_col)
-        ws.cell(row=sum_row, column=tv_idx).value = f"=SUM({total_vnd_col}{data_start_row}:{total_vnd_col}{last_data_row})"
-        ws.cell(row=sum_row, column=tv_idx).number_format = NUMBER_FMT_VND
-        ws.cell(row=sum_row, column=tv_idx).font = Font(name="Arial", size=10, bold=True)
-
-        vc_idx = column_index_from_string(vat_col)
-        ws.cell(row=sum_row, column=vc_idx).value = f"=SUM({vat_col}{data_start_row}:{vat_col}{last_data_row})"
-        ws.cell(row=sum_row, column=vc_idx).number_format = NUMBER_FMT_VND
-        ws.cell(row=sum_row, column=vc_idx).font = Font(name="Arial", size=10, bold=True)
-
-        gt_idx = column_index_from_string(grand_total_col)
-        ws.cell(row=sum_row, column=gt_idx).value = f"=SUM({grand_total_col}{data_start_row}:{grand_total_col}{last_data_row})"
-        ws.cell(row=sum_row, column=gt_idx).number_format = NUMBER_FMT_VND
-        ws.cell(row=sum_row, column=gt_idx).font = Font(name="Arial", size=10, bold=True)
-
-        # 비용 항목별 합계
-        for col_letter in fee_col_map.values():
-            if col_letter in used_columns:
-                c_idx = column_index_from_string(col_letter)
-                ws.cell(row=sum_row, column=c_idx).value = f"=SUM({col_letter}{data_start_row}:{col_letter}{last_data_row})"
-                ws.cell(row=sum_row, column=c_idx).number_format = NUMBER_FMT_USD
-                ws.cell(row=sum_row, column=c_idx).font = Font(name="Arial", size=10, bold=True)
-
-        # 합계 행 테두리
-        _apply_row_borders(ws, sum_row, is_import, used_columns)
+    # Row 13: 숨김 행 -- 환율 참조 (IMPORT 전용)
+    if layout.is_import:
+        ws.row_dimensions[13].hidden = True
 
     # ── 빈 컬럼 숨김 (FR-022) ────────────────────────────
-    _hide_empty_columns(ws, is_import, used_columns, fee_col_map, total_usd_col, grand_total_col)
+    _hide_empty_columns(ws, layout.is_import, layout.used_columns, layout.fee_col_map,
+                        layout.total_usd_col, layout.grand_total_col)
 
     # ── 컬럼 너비 조정 ──────────────────────────────────
-    _adjust_column_widths(ws, is_import)
+    _adjust_column_widths(ws, layout.is_import)
 
     # ── 행 고정 (Row 1-15) ───────────────────────────────
-    ws.freeze_panes = f"A{data_start_row}"
+    ws.freeze_panes = f"A{layout.data_start_row}"
 
 
-def _build_header(
-    ws, client, dn, exchange_rate, is_import,
-    total_usd_col, grand_total_col, vat_col,
-):
-    """헤더 영역 (Row 1-13) 생성"""
-    # Row 1-2: 회사명
-    ws.cell(row=1, column=1, value="UNI CONSULTING CO.LTD").font = COMPANY_FONT
-    ws.cell(row=2, column=1, value="Tax code: 0315609***").font = Font(name="Arial", size=9)
+async def _sheet_rows(
+    layout: _SheetLayout,
+    lines: AsyncIterator[tuple[object, object]],
+    client: Client,
+    dn: DebitNote,
+    exchange_rate: float,
+) -> AsyncIterator[tuple[int, RowCells]]:
+    """시트 전체 행을 행 번호 순서대로 생성 (데이터 행은 lines 를 읽는 대로)"""
+    # ── 헤더 영역 (Row 1-13) ─────────────────────────────
+    for header_row in _header_rows(layout, client, dn, exchange_rate):
+        yield header_row
 
-    # Row 5-8: 수신자 정보
-    ws.cell(row=5, column=3, value="TO").font = LABEL_FONT
-    ws.cell(row=5, column=4, value=client.client_name or client.client_code).font = LABEL_FONT
+    # ── 컬럼 헤더 (Row 14-15) ────────────────────────────
+    base_headers = IMPORT_HEADERS if layout.is_import else EXPORT_HEADERS
+    header_cells = {
+        col_letter: (header_text, "dn_column_header")
+        for col_letter, header_text in base_headers.items()
+    }
+    # 비용 컬럼 헤더
+    for col_letter, fi in layout.col_fee_map.items():
+        display_name = fi.item_name if hasattr(fi, 'item_name') else str(fi)
+        header_cells[col_letter] = (display_name, "dn_column_header")
+    yield 14, header_cells
 
-    ws.cell(row=6, column=3, value="ADD").font = LABEL_FONT
-    ws.cell(row=6, column=4, value=client.address or "").font = LABEL_FONT
+    # ── 데이터 행 (Row 16+) ──────────────────────────────
+    line_count = 0
+    async for line, ship in lines:
+        row = layout.data_start_row + line_count
+        cells = _data_row_cells(layout, line_count, row, line, ship)
+        # 테두리 적용 (FR-024) - 값이 없는 사용 컬럼도 테두리
+        for col_letter in layout.used_columns:
+            cells.setdefault(col_letter, (None, "dn_cell"))
+        yield row, cells
+        line_count += 1
 
-    ws.cell(row=7, column=3, value="SUBJECT").font = LABEL_FONT
-    period_label = f"Debit Note {dn.period_from.strftime('%m/%Y')}" if dn.period_from else "Debit Note"
-    ws.cell(row=7, column=4, value=period_label).font = LABEL_FONT
+    # ── 합계 행 ──────────────────────────────────────────
+    if line_count:
+        yield _sum_row(layout, line_count)
+
+
+def _header_rows(layout: _SheetLayout, client, dn, exchange_rate) -> Iterator[tuple[int, RowCells]]:
+    """헤더 영역 (Row 1-13)"""
+    # Row 1-2: 회사명
+    yield 1, {"A": ("UNI CONSULTING CO.LTD", "dn_company")}
+    yield 2, {"A": ("Tax code: 0315609***", "dn_small")}
 
-    ws.cell(row=8, column=3, value="DATE").font = LABEL_FONT
-    ws.cell(row=8, column=4, value=dn.billing_date or date.today()).font = LABEL_FONT
-    ws.cell(row=8, column=4).number_format = "YYYY-MM-DD"
+    # Row 5-8: 수신자 정보
+    yield 5, {"C": ("TO", "dn_label"), "D": (client.client_name or client.client_code, "dn_label")}
+    yield 6, {"C": ("ADD", "dn_label"), "D": (client.address or "", "dn_label")}
+    period_label = f"Debit Note {dn.period_from.strftime('%m/%Y')}" if dn.period_from else "Debit Note"
+    yield 7, {"C": ("SUBJECT", "dn_label"), "D": (period_label, "dn_label")}
+    yield 8, {"C": ("DATE", "dn_label"), "D": (dn.billing_date or date.today(), "dn_label_date")}
 
     # Row 9: Exchange rate (D9)
-    ws.cell(row=9, column=3, value="Exchange rate").font = LABEL_FONT
-    ws.cell(row=9, column=4, value=exchange_rate).font = Font(name="Arial", size=10, bold=True, color="FF0000")
-    ws.cell(row=9, column=4).number_format = NUMBER_FMT_VND
+    yield 9, {"C": ("Exchange rate", "dn_label"), "D": (exchange_rate, "dn_rate")}
 
     # Row 12: DEBIT NOTE 타이틀 (FR-026)
-    last_col = grand_total_col
-    last_col_idx = column_index_from_string(last_col)
-    ws.merge_cells(start_row=12, start_column=1, end_row=12, end_column=last_col_idx)
-    title_cell = ws.cell(row=12, column=1, value="DEBIT NOTE")
-    title_cell.font = TITLE_FONT
-    title_cell.alignment = Alignment(horizontal="center", vertical="center")
+    yield 12, {"A": ("DEBIT NOTE", "dn_title")}
 
     # Row 13: 숨김 행 -- 환율 참조 (IMPORT 전용)
-    if is_import:
-        bd_col_idx = column_index_from_string("BD")
-        ws.cell(row=13, column=bd_col_idx, value="Tỷ giá").font = Font(name="Arial", size=8, color="999999")
-        be_col_idx = column_index_from_string("BE")
-        ws.cell(row=13, column=be_col_idx, value=exchange_rate).font = Font(name="Arial", size=8, color="999999")
-        ws.cell(row=13, column=be_col_idx).number_format = NUMBER_FMT_VND
-        ws.row_dimensions[13].hidden = True
+    if layout.is_import:
+        yield 13, {"BD": ("Tỷ giá", "dn_hidden"), "BE": (exchange_rate, "dn_hidden_vnd")}
+
+
+def _data_row_cells(layout: _SheetLayout, idx: int, row: int, line, ship) -> RowCells:
+    """데이터 행 1개의 셀 (값, 스타일)"""
+    cells: RowCells = {}
+    duplicates = layout.duplicate_values
+
+    def reference(col_letter, field):
+        value = getattr(ship, field)
+        if value:
+            style = "dn_duplicate" if value in duplicates[field] else "dn_text"
+            cells[col_letter] = (value, style)
+
+    # A: No.
+    cells["A"] = (idx + 1, "dn_no")
+
+    # B: Delivery Date
+    if ship.delivery_date:
+        cells["B"] = (ship.delivery_date, "dn_date")
+
+    # C: Invoice No / D: MBL / E: HBL
+    reference("C", "invoice_no")
+    reference("D", "mbl")
+    reference("E", "hbl")
+
+    # F: Term
+    if ship.term:
+        cells["F"] = (ship.term, "dn_text")
+
+    # G: No. of pkgs
+    if ship.no_of_pkgs:
+        cells["G"] = (ship.no_of_pkgs, "dn_text")
+
+    # H: Gross weight / I: Chargeable weight
+    if ship.gross_weight:
+        cells["H"] = (float(ship.gross_weight), "dn_weight")
+    if ship.chargeable_weight:
+        cells["I"] = (float(ship.chargeable_weight), "dn_weight")
+
+    if layout.is_import:
+        # J: CD No.
+        reference("J", "cd_no")
+
+        # K: CD Type
+        if ship.cd_type:
+            cells["K"] = (ship.cd_type, "dn_text")
+
+        # L: Air rate/Ocean freight
+        if ship.air_ocean_rate:
+            cells["L"] = (ship.air_ocean_rate, "dn_text")
+    else:
+        # EXPORT: M = Origin/Destination (handled via fee_col or direct)
+        if ship.origin_destination:
+            cells["M"] = (ship.origin_destination, "dn_text")
+
+    # 비용 항목 데이터 (M-AT or M-AH)
+    fee_details_map = {fd.fee_item_id: fd for fd in ship.fee_details}
+    for fee_item_id, col_letter in layout.fee_col_map.items():
+        fd = fee_details_map.get(fee_item_id)
+        if fd and fd.amount_usd:
+            cells[col_letter] = (float(fd.amount_usd), "dn_usd")
+
+    # Pay on behalf (IMPORT: BA)
+    if layout.is_import and line.pay_on_behalf and float(line.pay_on_behalf) > 0:
+        cells["BA"] = (float(line.pay_on_behalf), "dn_usd")
+
+    # ── 수식 컬럼 (BC-BF / AI-AL) ────────────────────
+    total_usd_col = layout.total_usd_col
+    total_vnd_col = layout.total_vnd_col
+    vat_col = layout.vat_col
+    if layout.is_import:
+        # BC = SUM(M:AT)
+        cells[total_usd_col] = (f"=SUM({layout.fee_start}{row}:{layout.fee_end}{row})", "dn_usd")
+        # BD = BC * 환율 ($BE$13)
+        cells[total_vnd_col] = (f"={total_usd_col}{row}*$BE$13", "dn_vnd")
+        # BE = SUM(Z:AT) * 환율 * 8% (VAT 적용 범위: Z-AT 현지비용만)
+        cells[vat_col] = (f"=SUM(Z{row}:{layout.fee_end}{row})*$BE$13*8%", "dn_vnd")
+        # BF = BD + BE
+        cells[layout.grand_total_col] = (f"={total_vnd_col}{row}+{vat_col}{row}", "dn_vnd")
+    else:
+        # AI = SUM(M:N) -- subtotal
+        cells[total_usd_col] = (f"=SUM(M{row}+N{row})", "dn_usd")
+        # AJ = ROUND(SUM(M:AH) * 환율, 0)
+        cells[total_vnd_col] = (f"=ROUND(SUM(M{row}:{layout.fee_end}{row})*$D$9,0)", "dn_vnd")
+        # AK = AJ * 8%
+        cells[vat_col] = (f"={total_vnd_col}{row}*8%", "dn_vnd")
+        # AL = AJ + AK
+        cells[layout.grand_total_col] = (f"=SUM({total_vnd_col}{row}+{vat_col}{row})", "dn_vnd")
+
+    # BG: Back-to-back Invoice (IMPORT only)
+    if layout.is_import and ship.back_to_back_invoice:
+        cells["BG"] = (ship.back_to_back_invoice, "dn_text")
+
+    return cells
+
+
+def _sum_row(layout: _SheetLayout, line_count: int) -> tuple[int, RowCells]:
+    """합계 행 (데이터 행 바로 아래)"""
+    start = layout.data_start_row
+    sum_row = start + line_count
+    last_data_row = sum_row - 1
+
+    def column_sum(col_letter):
+        return f"=SUM({col_letter}{start}:{col_letter}{last_data_row})"
+
+    # "TOTAL" 라벨
+    cells: RowCells = {"A": ("TOTAL", "dn_total_label")}
+
+    # 비용 항목별 합계
+    for col_letter in layout.fee_col_map.values():
+        if col_letter in layout.used_columns:
+            cells[col_letter] = (column_sum(col_letter), "dn_total_usd")
+
+    # 합계 수식
+    cells[layout.total_usd_col] = (column_sum(layout.total_usd_col), "dn_total_usd")
+    for col_letter in (layout.total_vnd_col, layout.vat_col, layout.grand_total_col):
+        cells[col_letter] = (column_sum(col_letter), "dn_total_vnd")
 
+    # 합계 행 테두리
+    for col_letter in layout.used_columns:
+        cells.setdefault(col_letter, (None, "dn_cell"))
 
-def _apply_row_borders(ws, row, is_import, used_columns):
-    """행에 테두리 적용 (FR-024)"""
-    for col_letter in used_columns:
-        try:
-            col_idx = column_index_from_string(col_letter)
-            ws.cell(row=row, column=col_idx).border = THIN_BORDER
-        except (ValueError, KeyError):
-            pass
+    return sum_row, cells
 
 
 def _hide_empty_columns(ws, is_import, used_columns, fee_col_map, total_usd_col, grand_total_col):
@@ -0,0 +1,156 @@
+"""환율 결정 (FR-006, FR-030)
+
+"거래처 X 의 D 일자 환율" 을 메모리 구간 인덱스로 답한다.
+1. 거래처별 환율(client_exchange_rates): effective_from ≤ D ≤ effective_to (effective_to 없으면 무기한)
+   - 구간이 겹치면 effective_from 이 늦은 설정이 우선 (같으면 나중에 등록된 설정)
+2. 없으면 일반 환율(exchange_rates, 활성): rate_date ≤ D 중 가장 최근 (같은 날짜면 나중에 등록된 환율)
+
+통화쌍별로 정렬된 날짜 배열 + bisect → 조회당 O(log n), 요청마다 ORDER BY/LIMIT 조회 없음.
+원본 행은 기준 데이터 캐시(app.services.reference_data)가 버전 관리하며, 스냅샷이 바뀌면 인덱스를 다시 만든다.
+"""
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.reference_data import reference_cache
+
+
+@dataclass(frozen=True)
+class ResolvedRate:
+    rate: Decimal
+    source: str  # CLIENT, GENERAL
+    rate_id: int  # client_rate_id 또는 rate_id
+    currency_from: str
+    currency_to: str
+    effective_from: date  # 거래처 환율 effective_from / 일반 환율 rate_date
+    effective_to: Optional[date] = None
+
+
+class _DatedRates:
+    """일반 환율 - rate_date 오름차순, 날짜당 1건"""
+
+    def __init__(self, rows: list[SimpleNamespace]):
+        by_date = {}
+        for row in sorted(rows, key=lambda r: (r.rate_date, r.rate_id)):
+            by_date[row.rate_date] = row
+        self.dates = list(by_date)
+        self.rows = list(by_date.values())
+
+    def at(self, on_date: date) -> Optional[SimpleNamespace]:
+        i = bisect_right(self.dates, on_date) - 1
+        return self.rows[i] if i >= 0 else None
+
+    def latest(self) -> Optional[SimpleNamespace]:
+        return self.rows[-1] if self.rows else None
+
+
+class _ClientIntervals:
+    """거래처별 환율 - effective_from 오름차순 구간 목록"""
+
+    def __init__(self, rows: list[SimpleNamespace]):
+        self.rows = sorted(rows, key=lambda r: (r.effective_from, r.client_rate_id))
+        self.starts = [r.effective_from for r in self.rows]
+        # reach[i] = rows[:i+1] 중 가장 늦은 종료일 → 이보다 뒤 날짜는 앞쪽 구간에 없으므로 탐색 중단
+        self.reach = []
+        for row in self.rows:
+            end = row.effective_to or date.max
+            self.reach.append(max(end, self.reach[-1]) if self.reach else end)
+
+    def at(self, on_date: date) -> Optional[SimpleNamespace]:
+        i = bisect_right(self.starts, on_date) - 1
+        # 시작일이 D 이하인 마지막 구간부터 거꾸로 - 보통 첫 구간에서 끝남
+        while i >= 0 and self.reach[i] >= on_date:
+            row = self.rows[i]
+            if row.effective_to is None or row.effective_to >= on_date:
+                return row
+            i -= 1
+        return None
+
+
+class ExchangeRateIndex:
+    def __init__(self, general_rows: list[SimpleNamespace], client_rows: list[SimpleNamespace]):
+        general: dict[tuple[str, str], list] = {}
+        for row in general_rows:
+            if row.is_active:
+                general.setdefault((row.currency_from, row.currency_to), []).append(row)
+        clients: dict[tuple[int, str, str], list] = {}
+        for row in client_rows:
+            clients.setdefault((row.client_id, row.currency_from, row.currency_to), []).append(row)
+
+        self._general = {pair: _DatedRates(rows) for pair, rows in general.items()}
+        self._clients = {key: _ClientIntervals(rows) for key, rows in clients.items()}
+
+    def resolve(
+        self,
+        client_id: Optional[int],
+        on_date: date,
+        currency_from: str = "USD",
+        currency_to: str = "VND",
+    ) -> Optional[ResolvedRate]:
+        """거래처 환율 → 일반 환율 순으로 on_date 에 적용되는 환율 (없으면 None)"""
+        intervals = self._clients.get((client_id, currency_from, currency_to))
+        row = intervals.at(on_date) if intervals else None
+        if row is not None:
+            return ResolvedRate(
+                rate=row.rate, source="CLIENT", rate_id=row.client_rate_id,
+                currency_from=currency_from, currency_to=currency_to,
+                effective_from=row.effective_from, effective_to=row.effective_to,
+            )
+
+        dated = self._general.get((currency_from, currency_to))
+        row = dated.at(on_date) if dated else None
+        if row is not None:
+            return ResolvedRate(
+                rate=row.rate, source="GENERAL", rate_id=row.rate_id,
+                currency_from=currency_from, currency_to=currency_to,
+                effective_from=row.rate_date,
+            )
+        return None
+
+    def latest(self, currency_from: str = "USD", currency_to: str = "VND") -> Optional[SimpleNamespace]:
+        """가장 최근 rate_date 의 활성 일반 환율 행"""
+        dated = self._general.get((currency_from, currency_to))
+        return dated.latest() if dated else None
+
+
+class ExchangeRateResolver:
+    def __init__(self):
+        self._index: Optional[ExchangeRateIndex] = None
+        self._built_from: tuple = ()
+
+    async def index(self, db: AsyncSession) -> ExchangeRateIndex:
+        general_rows, client_rows = await reference_cache.exchange_rate_rows(db)
+        # 기준 데이터 스냅샷이 다시 적재되면 list 객체가 바뀐다
+        if self._index is None or self._built_from[0] is not general_rows or self._built_from[1] is not client_rows:
+            self._index = ExchangeRateIndex(general_rows, client_rows)
+            self._built_from = (general_rows, client_rows)
+        return self._index
+
+    async def resolve(
+        self,
+        db: AsyncSession,
+        client_id: Optional[int],
+        on_date: date,
+        currency_from: str = "USD",
+        currency_to: str = "VND",
+    ) -> Optional[ResolvedRate]:
+        return (await self.index(db)).resolve(client_id, on_date, currency_from, currency_to)
+
+    async def resolve_many(
+        self,
+        db: AsyncSession,
+        pairs: Iterable[tuple[Optional[int], date]],
+        currency_from: str = "USD",
+        currency_to: str = "VND",
+    ) -> list[Optional[ResolvedRate]]:
+        """(client_id, 일자) 여러 건을 한 번에 - 같은 인덱스 스냅샷으로 결정"""
+        index = await self.index(db)
+        return [index.resolve(client_id, on_date, currency_from, currency_to) for client_id, on_date in pairs]
+
+
+exchange_rate_resolver = ExchangeRateResolver()
@@ -0,0 +1,276 @@
+"""Excel 출력 작업 서비스 (설계서 FR-021)
+
+동기 출력(export-excel)과 비동기 출력 작업(export-jobs)이 공유한다.
+- export_content_hash: Excel 내용에 영향을 주는 값의 해시 (출력 캐시 키 / ETag)
+- get_export_file: 같은 해시의 COMPLETED 출력 파일이 있으면 재사용, 없으면 생성
+- create_export_file: 라인 수에 따라 일반/write_only 모드로 EXPORT_DIR/<해시>/ 에 파일 생성
+- mark_exported: 최초 출력 시 APPROVED → EXPORTED + 워크플로우 기록
+- run_export_job: debit_note_exports 행을 PENDING → GENERATING → COMPLETED/FAILED 로 진행
+  (GENERATING 인 채 EXPORT_JOB_STALE_SECONDS 가 지난 작업은 worker 중단으로 보고 재전달 시 다시 선점)
+
+비동기 작업은 EXPORT_QUEUE 설정에 따라 Celery worker(app.worker) 또는
+API 프로세스의 백그라운드 스레드에서 실행된다. 어느 쪽이든 요청 이벤트 루프 밖에서 돈다.
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional
+
+from fastapi import BackgroundTasks
+from sqlalchemy import and_, or_, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS, EXPORT_FILE_BYTES, EXPORT_GENERATION_SECONDS
+from app.models.audit import DebitNoteExport
+from app.models.client import Client
+from app.models.debit_note import DebitNote, DebitNoteLine, DebitNoteWorkflow
+from app.models.shipment import Shipment, ShipmentFeeDetail
+from app.services.excel_generator import (
+    GENERATOR_VERSION, generate_debit_note_excel, write_debit_note_excel,
+)
+from app.services.reference_data import reference_cache
+
+# Excel 출력에 쓰이는 기준 데이터 (환율 테이블은 debit_notes.exchange_rate 로 이미 반영됨)
+EXCEL_REFERENCE_TABLES = ("fee_categories", "fee_items", "client_templates", "client_fee_mappings")
+
+
+class ExportFile(NamedTuple):
+    file_path: str
+    file_name: str
+    content_hash: str
+    cached: bool  # 기존 출력 파일 재사용 여부
+
+
+# ── 출력 캐시 ────────────────────────────────────────────────
+
+async def export_content_hash(db: AsyncSession, dn: DebitNote) -> str:
+    """출력 캐시 키 (sha256)
+
+    Excel 내용을 결정하는 값만 포함한다. DN status/updated_at 은 출력 시 바뀌므로 제외.
+    - DN 헤더(번호/기간/청구일/환율/시트), 거래처 표시 정보
+      청구일이 없으면 Excel 에 출력일(date.today())이 찍히므로 그 날짜를 넣는다 - 다음 날 재사용 방지
+    - 라인 (선적, 순번, 금액)
+    - 라인 선적/비용 상세의 건수 + 최종 수정 시각 (+ 금액 합계)
+    - 기준 데이터 버전 (템플릿/비용 매핑/비용 항목), GENERATOR_VERSION
+    """
+    digest = hashlib.sha256()
+
+    def feed(*values):
+        digest.update(repr(values).encode())
+
+    feed("generator", GENERATOR_VERSION)
+    feed("debit_note", dn.debit_note_id, dn.debit_note_number, dn.client_id, dn.period_from,
+         dn.billing_date or date.today(), dn.exchange_rate, dn.sheet_type)
+
+    client = await db.get(Client, dn.client_id)
+    feed("client", client.client_code, client.client_name, client.address)
+
+    lines = await db.execute(
+        select(
+            DebitNoteLine.line_id, DebitNoteLine.shipment_id, DebitNoteLine.line_no,
+            DebitNoteLine.total_usd, DebitNoteLine.total_vnd, DebitNoteLine.vat_amount,
+            DebitNoteLine.grand_total_vnd, DebitNoteLine.pay_on_behalf,
+        )
+        .where(DebitNoteLine.debit_note_id == dn.debit_note_id)
+        .order_by(DebitNoteLine.line_id)
+    )
+    for line in lines:
+        feed("line", *line)
+
+    line_shipments = select(DebitNoteLine.shipment_id).where(DebitNoteLine.debit_note_id == dn.debit_note_id)
+    feed("shipments", *(await db.execute(
+        select(func.count(), func.max(Shipment.updated_at))
+        .where(Shipment.shipment_id.in_(line_shipments))
+    )).one())
+    feed("fee_details", *(await db.execute(
+        select(func.count(), func.max(ShipmentFeeDetail.updated_at), func.sum(ShipmentFeeDetail.amount_usd))
+        .where(ShipmentFeeDetail.shipment_id.in_(line_shipments))
+    )).one())
+
+    # 템플릿/비용 매핑/비용 항목은 기준 데이터 버전으로 대신한다.
+    # max_age=0: DB 버전을 바로 확인하고 캐시를 맞춤 → 이어지는 Excel 생성이 같은 버전의 데이터를 사용
+    feed("reference", *(await reference_cache.versions(db, max_age=0, tables=EXCEL_REFERENCE_TABLES)).items())
+
+    return digest.hexdigest()
+
+
+async def find_cached_export(
+    db: AsyncSession,
+    debit_note_id: int,
+    content_hash: str,
+) -> Optional[DebitNoteExport]:
+    """같은 내용 해시의 최근 COMPLETED 출력 (파일이 남아 있는 경우만)"""
+    result = await db.execute(
+        select(DebitNoteExport)
+        .where(
+            DebitNoteExport.debit_note_id == debit_note_id,
+            DebitNoteExport.content_hash == content_hash,
+            DebitNoteExport.export_status == "COMPLETED",
+        )
+        .order_by(DebitNoteExport.exported_at.desc())
+        .limit(1)
+    )
+    export = result.scalar_one_or_none()
+    if export and export.file_path and os.path.exists(export.file_path):
+        return export
+    return None
+
+
+async def get_export_file(db: AsyncSession, dn: DebitNote) -> ExportFile:
+    """출력 파일 조회 - 캐시 적중 시 기존 파일, 아니면 새로 생성"""
+    content_hash = await export_content_hash(db, dn)
+    cached = await find_cached_export(db, dn.debit_note_id, content_hash)
+    CACHE_REQUESTS.inc(cache="export", result="hit" if cached else "miss")
+    if cached:
+        return ExportFile(cached.file_path, cached.file_name, content_hash, True)
+
+    file_path, filename = await create_export_file(db, dn, content_hash)
+    return ExportFile(file_path, filename, content_hash, False)
+
+
+async def create_export_file(db: AsyncSession, dn: DebitNote, content_hash: str) -> tuple[str, str]:
+    """DN Excel 파일 생성 → (file_path, filename)
+
+    EXPORT_DIR/<content_hash>/<filename> 에 저장한다. 임시 디렉터리에 생성한 뒤 rename 하므로
+    같은 해시를 동시에 생성해도 완성된 파일 하나만 남는다.
+    """
+    target_dir = os.path.join(settings.EXPORT_DIR, content_hash)
+    staging_dir = f"{target_dir}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(staging_dir)
+    write_only = (dn.total_lines or 0) >= settings.EXCEL_WRITE_ONLY_MIN_LINES
+    started = time.perf_counter()
+    try:
+        if write_only:
+            _, filename = await write_debit_note_excel(dn.debit_note_id, db, staging_dir)
+        else:
+            buffer, filename = await generate_debit_note_excel(dn.debit_note_id, db)
+            with open(os.path.join(staging_dir, filename), "wb") as f:
+                f.write(buffer.getvalue())
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    client_code = (await db.get(Client, dn.client_id)).client_code
+    EXPORT_GENERATION_SECONDS.observe(
+        time.perf_counter() - started, client=client_code, mode="write_only" if write_only else "in_memory",
+    )
+    EXPORT_FILE_BYTES.observe(os.path.getsize(os.path.join(staging_dir, filename)), client=client_code)
+
+    try:
+        os.rename(staging_dir, target_dir)
+    except OSError:
+        # 같은 해시가 이미 생성됨 - 먼저 완성된 파일 사용
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    return os.path.join(target_dir, filename), filename
+
+
+def mark_exported(db: AsyncSession, dn: DebitNote, user_id: int, filename: str):
+    """상태 변경: APPROVED → EXPORTED (최초 출력 시)"""
+    if dn.status != "APPROVED":
+        return
+    dn.status = "EXPORTED"
+    db.add(DebitNoteWorkflow(
+        debit_note_id=dn.debit_note_id,
+        action="EXPORTED",
+        from_status="APPROVED",
+        to_status="EXPORTED",
+        performed_by=user_id,
+        comment=f"Excel exported: {filename}",
+    ))
+
+
+async def claim_export_job(db: AsyncSession, export_id: int) -> bool:
+    """작업 선점 (GENERATING + claimed_at) → 선점 여부 (commit 은 호출 측)
+
+    PENDING 이거나, GENERATING 인 채 EXPORT_JOB_STALE_SECONDS 가 지난 작업만 선점한다.
+    (선점한 worker 가 중단되면 acks_late 로 재전달된 작업이 이어서 생성)
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS)
+    claimed = await db.execute(
+        update(DebitNoteExport)
+        .where(
+            DebitNoteExport.export_id == export_id,
+            or_(
+                DebitNoteExport.export_status == "PENDING",
+                and_(
+                    DebitNoteExport.export_status == "GENERATING",
+                    or_(DebitNoteExport.claimed_at.is_(None), DebitNoteExport.claimed_at < stale_before),
+                ),
+            ),
+        )
+        .values(export_status="GENERATING", claimed_at=now)
+    )
+    return claimed.rowcount == 1
+
+
+async def run_export_job(export_id: int, session_factory: async_sessionmaker) -> str:
+    """출력 작업 1건 실행 → 최종 export_status
+
+    claim_export_job 으로 선점한 경우만 생성하므로 같은 작업이 중복 전달되어도 한 번만 생성하고,
+    중단된 worker 의 작업은 EXPORT_JOB_STALE_SECONDS 이후 재전달 시 다시 생성한다.
+    """
+    async with session_factory() as db:
+        claimed = await claim_export_job(db, export_id)
+        await db.commit()
+        if not claimed:
+            export = await db.get(DebitNoteExport, export_id)
+            return export.export_status if export else "FAILED"
+
+        export = await db.get(DebitNoteExport, export_id)
+        dn = await db.get(DebitNote, export.debit_note_id)
+        try:
+            export_file = await get_export_file(db, dn)
+        except Exception as e:
+            await db.rollback()
+            await db.execute(
+                update(DebitNoteExport)
+                .where(DebitNoteExport.export_id == export_id)
+                .values(export_status="FAILED", error_message=str(e))
+            )
+            await db.commit()
+            return "FAILED"
+
+        export.file_name = export_file.file_name
+        export.file_path = export_file.file_path
+        export.file_size = os.path.getsize(export_file.file_path)
+        export.content_hash = export_file.content_hash
+        export.export_status = "COMPLETED"
+        export.exported_at = datetime.utcnow()
+        mark_exported(db, dn, export.exported_by, export_file.file_name)
+        await db.commit()
+        return "COMPLETED"
+
+
+def run_export_job_sync(export_id: int) -> str:
+    """이벤트 루프 밖(Celery worker / 스레드)에서 출력 작업 실행
+
+    호출마다 새 이벤트 루프를 만들므로 API 의 커넥션 풀을 공유하지 않는 NullPool 엔진을 사용한다.
+    """
+    async def run():
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        try:
+            return await run_export_job(
+                export_id, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+            )
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def enqueue_export_job(export_id: int, background_tasks: BackgroundTasks):
+    """출력 작업 등록 (EXPORT_QUEUE: celery / thread)"""
+    if settings.EXPORT_QUEUE == "thread":
+        # 응답 전송 후 스레드풀에서 실행 (별도 worker 없이 로컬/테스트)
+        background_tasks.add_task(run_export_job_sync, export_id)
+        return
+
+    from app.worker import generate_export_task
+    generate_export_task.delay(export_id)
@@ -0,0 +1,101 @@
+"""Debit Note 라인 계산 엔진 (설계서 FR-016 ~ FR-019)
+
+기간 내 전체 선적의 fee_details를 집합 쿼리 1회로 로드하고 fee_items는 기준 데이터 캐시에서
+붙인 뒤 BC/BD/BE/BF를 메모리에서 계산한다. (선적 1건당 쿼리 1회 → 전체 1회)
+
+IMPORT:
+  BC = SUM(M:AT)  → freight + local charges
+  BD = BC * 환율
+  BE = SUM(Z:AT) * 환율 * 8%   (현지비용만 VAT)
+  BF = BD + BE
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.models.shipment import ShipmentFeeDetail
+from app.services.reference_data import reference_cache
+
+VAT_RATE = Decimal("0.08")
+PAY_ON_BEHALF_CODE = "PAY_ON_BEHALF"
+
+
+class FeeRow(NamedTuple):
+    """계산에 필요한 fee_detail 컬럼만 담은 행"""
+    shipment_id: int
+    amount_usd: Optional[Decimal]
+    fee_item_id: Optional[int]  # fee_items 에 있는 항목만 (없으면 None)
+    item_code: Optional[str]
+    is_vat_applicable: Optional[bool]
+
+
+async def load_fee_rows(
+    db: AsyncSession,
+    shipment_ids: Select | Iterable[int],
+) -> dict[int, list[FeeRow]]:
+    """선적별 fee_detail 행을 한 번의 쿼리로 로드
+
+    shipment_ids: shipment_id 목록 또는 shipment_id를 반환하는 SELECT
+    (SELECT를 넘기면 IN (SELECT ...) 서브쿼리로 처리되어 바인드 파라미터 수 제한이 없음)
+    """
+    if not isinstance(shipment_ids, Select):
+        shipment_ids = list(shipment_ids)
+        if not shipment_ids:
+            return {}
+
+    fee_items = await reference_cache.fee_items_by_id(db)
+    result = await db.execute(
+        select(
+            ShipmentFeeDetail.shipment_id,
+            ShipmentFeeDetail.amount_usd,
+            ShipmentFeeDetail.fee_item_id,
+        )
+        .where(ShipmentFeeDetail.shipment_id.in_(shipment_ids))
+    )
+
+    rows_by_shipment: dict[int, list[FeeRow]] = defaultdict(list)
+    for shipment_id, amount_usd, fee_item_id in result:
+        fee_item = fee_items.get(fee_item_id)
+        if fee_item is None:
+            rows_by_shipment[shipment_id].append(FeeRow(shipment_id, amount_usd, None, None, None))
+        else:
+            rows_by_shipment[shipment_id].append(FeeRow(
+                shipment_id, amount_usd, fee_item.fee_item_id, fee_item.item_code, fee_item.is_vat_applicable,
+            ))
+    return rows_by_shipment
+
+
+def calculate_line_totals(fee_rows: Iterable[FeeRow], exchange_rate: Decimal) -> dict:
+    """선적 1건의 비용 계산 (NEXCON 기술사양서 수식 체계, DB 접근 없음)"""
+    freight_usd = Decimal("0")
+    local_charges_usd = Decimal("0")
+    pay_on_behalf = Decimal("0")
+
+    for fr in fee_rows:
+        amount = fr.amount_usd or Decimal("0")
+        has_fee_item = fr.fee_item_id is not None
+        if has_fee_item and fr.item_code == PAY_ON_BEHALF_CODE:
+            pay_on_behalf += amount
+        elif has_fee_item and not fr.is_vat_applicable:
+            freight_usd += amount  # Freight (VAT 0%)
+        else:
+            local_charges_usd += amount  # Local charges (VAT 8%)
+
+    total_usd = freight_usd + local_charges_usd + pay_on_behalf  # BC
+    total_vnd = int(total_usd * exchange_rate)  # BD
+    vat_amount = int(local_charges_usd * exchange_rate * VAT_RATE)  # BE
+    grand_total_vnd = total_vnd + vat_amount  # BF
+
+    return {
+        "total_usd": total_usd,
+        "total_vnd": total_vnd,
+        "vat_amount": vat_amount,
+        "grand_total_vnd": grand_total_vnd,
+        "freight_usd": freight_usd,
+        "local_charges_usd": local_charges_usd,
+        "pay_on_behalf": pay_on_behalf,
+    }
@@ -0,0 +1,119 @@
+"""선적 비용 변경 시 DN 라인 증분 재계산 (FR-016 ~ FR-019)
+
+DRAFT/REJECTED DN 에 포함된 선적의 fee_detail 이 바뀌면 DN 전체를 다시 만들지 않고
+- 그 선적의 라인만 다시 계산 (fee_details 1회 로드 + calculate_line_totals)
+- 헤더 합계는 라인 변경분(delta)만 더한다 - 라인 수와 관계없이 UPDATE 2회
+
+    UPDATE debit_notes SET total_usd = total_usd + :d_usd, ... WHERE debit_note_id = :id AND status IN (...)
+    UPDATE debit_note_lines SET total_usd = :usd, ... WHERE line_id = :line_id
+
+라인 조회는 FOR UPDATE (PostgreSQL) 로 잠가서 같은 선적의 비용을 동시에 고쳐도 delta 가 겹치지 않는다.
+헤더 UPDATE 의 상태 조건으로, 조회 이후 검토 요청된 DN 은 409 (호출 측 롤백).
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.debit_note import DebitNote, DebitNoteLine
+from app.schemas.shipment import LineRecalculation
+from app.services.line_calculator import calculate_line_totals, load_fee_rows
+
+# 라인 비용을 고칠 수 있는 DN 상태
+EDITABLE_STATUSES = ("DRAFT", "REJECTED")
+
+# DN 헤더 합계 컬럼 → 라인 컬럼
+TOTAL_COLUMNS = {
+    "total_usd": "total_usd",
+    "total_vnd": "total_vnd",
+    "total_vat": "vat_amount",
+    "grand_total_vnd": "grand_total_vnd",
+}
+LINE_COLUMNS = (
+    "total_usd", "total_vnd", "vat_amount", "grand_total_vnd", "freight_usd", "local_charges_usd", "pay_on_behalf",
+)
+
+
+async def lock_shipment_lines(db: AsyncSession, shipment_id: int) -> list[Row]:
+    """선적이 포함된 DN 라인 (+ DN 상태/환율) - 비용 변경 전에 호출 (PostgreSQL 은 라인 행 잠금)"""
+    result = await db.execute(
+        select(
+            DebitNoteLine.line_id, DebitNoteLine.debit_note_id, DebitNote.status, DebitNote.exchange_rate,
+            *(getattr(DebitNoteLine, column) for column in LINE_COLUMNS),
+        )
+        .join(DebitNote, DebitNote.debit_note_id == DebitNoteLine.debit_note_id)
+        .where(DebitNoteLine.shipment_id == shipment_id)
+        .order_by(DebitNoteLine.line_id)
+        .with_for_update(of=DebitNoteLine)
+    )
+    return result.all()
+
+
+def locked_by(lines: list[Row]) -> Optional[Row]:
+    """비용을 고칠 수 없게 하는 라인 (검토/승인/출력된 DN) - 없으면 None"""
+    return next((line for line in lines if line.status not in EDITABLE_STATUSES), None)
+
+
+async def recalculate_shipment_lines(
+    db: AsyncSession,
+    shipment_id: int,
+    lines: list[Row],
+) -> list[LineRecalculation]:
+    """fee_detail 변경(flush 됨) 후 DRAFT/REJECTED DN 라인 재계산 + 헤더 delta 반영 (commit 은 호출 측)
+
+    lines: 변경 전에 lock_shipment_lines 로 읽은 라인
+    """
+    targets = [line for line in lines if line.status in EDITABLE_STATUSES]
+    if not targets:
+        return []
+
+    fee_rows = (await load_fee_rows(db, [shipment_id])).get(shipment_id, [])
+    now = datetime.utcnow()
+    recalculated = []
+    for line in targets:
+        calc = calculate_line_totals(fee_rows, line.exchange_rate)
+        if all(calc[column] == getattr(line, column) for column in LINE_COLUMNS):
+            continue
+
+        delta = {
+            header_column: calc[line_column] - (getattr(line, line_column) or 0)
+            for header_column, line_column in TOTAL_COLUMNS.items()
+        }
+        header = (await db.execute(
+            update(DebitNote)
+            .where(DebitNote.debit_note_id == line.debit_note_id, DebitNote.status.in_(EDITABLE_STATUSES))
+            .values({
+                **{getattr(DebitNote, column): getattr(DebitNote, column) + delta[column] for column in TOTAL_COLUMNS},
+                DebitNote.updated_at: now,
+            })
+            .returning(*(getattr(DebitNote, column) for column in TOTAL_COLUMNS))
+            .execution_options(synchronize_session=False)
+        )).one_or_none()
+        if header is None:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Debit Note {line.debit_note_id} left {line.status} while fees were being changed; retry",
+            )
+
+        await db.execute(
+            update(DebitNoteLine)
+            .where(DebitNoteLine.line_id == line.line_id)
+            .values(**calc, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        recalculated.append(LineRecalculation(
+            debit_note_id=line.debit_note_id,
+            line_id=line.line_id,
+            delta_usd=delta["total_usd"],
+            delta_vnd=delta["total_vnd"],
+            delta_vat=delta["total_vat"],
+            delta_grand_total_vnd=delta["grand_total_vnd"],
+            note_total_usd=header.total_usd,
+            note_total_vnd=header.total_vnd,
+            note_total_vat=header.total_vat,
+            note_grand_total_vnd=header.grand_total_vnd,
+        ))
+    return recalculated
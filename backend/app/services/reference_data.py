@@ -0,0 +1,201 @@
+"""기준 데이터 캐시 (FR-012 ~ FR-014, FR-036 ~ FR-038)
+
+비용 카테고리/항목, 거래처 템플릿/비용 매핑, 환율(일반/거래처별)은 거의 바뀌지 않으므로
+테이블 단위로 메모리에 보관한다. API 라우터, 라인 계산, Excel 생성, 환율 결정이 같은 캐시를 사용한다.
+
+버전 관리:
+- reference_data_versions 에 테이블별 버전. ORM 으로 기준 데이터를 변경하면 같은 트랜잭션에서 +1
+- 같은 프로세스: 커밋 직후 해당 테이블을 다시 읽음
+- 다른 프로세스(worker): REFERENCE_CACHE_CHECK_SECONDS 마다 버전 1회 조회 → 바뀐 테이블만 다시 읽음
+- ORM 을 거치지 않는 변경(raw SQL)은 bump_versions() 를 직접 호출해야 한다
+
+캐시 항목은 세션에 묶이지 않는 SimpleNamespace 스냅샷이다 (컬럼 값 + fee_items / fee_item 관계).
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.models.audit import ReferenceDataVersion
+from app.models.client import ClientFeeMapping, ClientTemplate
+from app.models.exchange_rate import ClientExchangeRate, ExchangeRate
+from app.models.fee import FeeCategory, FeeItem
+
+REFERENCE_MODELS = {
+    "fee_categories": FeeCategory,
+    "fee_items": FeeItem,
+    "client_templates": ClientTemplate,
+    "client_fee_mappings": ClientFeeMapping,
+    "exchange_rates": ExchangeRate,
+    "client_exchange_rates": ClientExchangeRate,
+}
+
+
+@dataclass
+class _TableSnapshot:
+    version: int
+    rows: list
+
+
+class ReferenceDataCache:
+    def __init__(self):
+        self._tables: dict[str, _TableSnapshot] = {}
+        self._checked_at = float("-inf")
+        self._dirty: set[str] = set()
+
+    def invalidate(self, *tables: str):
+        """이 프로세스에서 커밋된 변경 - 다음 조회 때 버전 확인 후 다시 읽음"""
+        self._dirty.update(tables or REFERENCE_MODELS)
+
+    async def versions(
+        self,
+        db: AsyncSession,
+        max_age: Optional[float] = None,
+        tables: Iterable[str] = REFERENCE_MODELS,
+    ) -> dict[str, int]:
+        """테이블별 버전 (max_age=0 이면 DB 버전을 바로 확인하고 캐시를 맞춤)"""
+        tables = sorted(tables)
+        await self._ensure_fresh(db, tables, max_age)
+        return {name: self._tables[name].version for name in tables}
+
+    # ── 조회 ──
+
+    async def fee_items(self, db: AsyncSession, active_only: bool = True) -> list[SimpleNamespace]:
+        """비용 항목 (sort_order 순)"""
+        rows = (await self._ensure_fresh(db, ["fee_items"]))["fee_items"]
+        return [fi for fi in rows if fi.is_active or not active_only]
+
+    async def fee_items_by_id(self, db: AsyncSession) -> dict[int, SimpleNamespace]:
+        """비활성 포함 전체 비용 항목 (fee_item_id → 항목)"""
+        return {fi.fee_item_id: fi for fi in await self.fee_items(db, active_only=False)}
+
+    async def fee_categories(self, db: AsyncSession) -> list[SimpleNamespace]:
+        """활성 카테고리 (sort_order 순) + 카테고리별 fee_items"""
+        tables = await self._ensure_fresh(db, ["fee_categories", "fee_items"])
+        categories = []
+        for category in tables["fee_categories"]:
+            if category.is_active:
+                items = [fi for fi in tables["fee_items"] if fi.category_id == category.category_id]
+                categories.append(SimpleNamespace(**vars(category), fee_items=items))
+        return categories
+
+    async def client_templates(self, db: AsyncSession, client_id: int) -> list[SimpleNamespace]:
+        """거래처의 활성 템플릿"""
+        rows = (await self._ensure_fresh(db, ["client_templates"]))["client_templates"]
+        return [t for t in rows if t.client_id == client_id and t.is_active]
+
+    async def client_fee_mappings(self, db: AsyncSession, client_id: int) -> list[SimpleNamespace]:
+        """거래처의 활성 비용 매핑 (sort_order 순, fee_item 포함)"""
+        tables = await self._ensure_fresh(db, ["client_fee_mappings", "fee_items"])
+        fee_items = {fi.fee_item_id: fi for fi in tables["fee_items"]}
+        return [
+            SimpleNamespace(**vars(m), fee_item=fee_items.get(m.fee_item_id))
+            for m in tables["client_fee_mappings"]
+            if m.client_id == client_id and m.is_active
+        ]
+
+    async def exchange_rate_rows(self, db: AsyncSession) -> tuple[list[SimpleNamespace], list[SimpleNamespace]]:
+        """일반 환율 / 거래처별 환율 원본 행 (비활성 포함, 스냅샷이 그대로면 같은 list 객체)"""
+        tables = await self._ensure_fresh(db, ["exchange_rates", "client_exchange_rates"])
+        return tables["exchange_rates"], tables["client_exchange_rates"]
+
+    # ── 적재 ──
+
+    async def _ensure_fresh(
+        self,
+        db: AsyncSession,
+        tables: Iterable[str],
+        max_age: Optional[float] = None,
+    ) -> dict[str, list]:
+        tables = list(tables)
+        max_age = settings.REFERENCE_CACHE_CHECK_SECONDS if max_age is None else max_age
+        now = time.monotonic()
+        if self._dirty or now - self._checked_at >= max_age or any(t not in self._tables for t in tables):
+            # 버전을 먼저 읽고 행을 읽는다 - 그 사이 변경되면 다음 확인 때 버전 차이로 다시 읽힘
+            self._dirty.clear()
+            self._checked_at = now
+            versions = dict((await db.execute(
+                select(ReferenceDataVersion.table_name, ReferenceDataVersion.version)
+            )).all())
+            for name in set(tables) | set(self._tables):
+                version = versions.get(name, 0)
+                cached = self._tables.get(name)
+                if cached is None or cached.version != version:
+                    CACHE_REQUESTS.inc(cache="reference_data", result="miss")
+                    self._tables[name] = _TableSnapshot(version, await self._load_table(db, name))
+                elif name in tables:
+                    CACHE_REQUESTS.inc(cache="reference_data", result="hit")
+        else:
+            CACHE_REQUESTS.inc(len(tables), cache="reference_data", result="hit")
+        return {name: self._tables[name].rows for name in tables}
+
+    @staticmethod
+    async def _load_table(db: AsyncSession, name: str) -> list[SimpleNamespace]:
+        # ORM 객체 대신 컬럼 값만 조회 (호출 측 세션의 identity map 에 올리지 않음)
+        table = REFERENCE_MODELS[name].__table__
+        query = select(table)
+        if "sort_order" in table.c:
+            query = query.order_by(table.c.sort_order, *table.primary_key.columns)
+        return [SimpleNamespace(**row._asdict()) for row in await db.execute(query)]
+
+
+reference_cache = ReferenceDataCache()
+
+
+# ── 변경 감지 / 버전 증가 ──
+
+# 방언별 INSERT ... ON CONFLICT (행이 없는 테이블을 두 트랜잭션이 동시에 처음 올려도 PK 충돌 없음)
+_UPSERT_INSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def bump_versions(connection: Connection, tables: Iterable[str]):
+    """테이블별 버전 +1 (현재 트랜잭션 안에서, 행이 없으면 version=1 로 생성)"""
+    names = sorted(set(tables))
+    if not names:
+        return
+    now = datetime.utcnow()
+    stmt = _UPSERT_INSERT[connection.dialect.name](ReferenceDataVersion).values(
+        [{"table_name": name, "version": 1, "updated_at": now} for name in names]
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[ReferenceDataVersion.table_name],
+        set_={"version": ReferenceDataVersion.version + 1, "updated_at": now},
+    ))
+
+
+def _changed_tables(session: Session) -> set[str]:
+    changed = set()
+    for obj in list(session.new) + list(session.deleted) + list(session.dirty):
+        table = getattr(obj, "__tablename__", None)
+        if table in REFERENCE_MODELS and (obj not in session.dirty or session.is_modified(obj)):
+            changed.add(table)
+    return changed
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_reference_versions(session: Session, flush_context):
+    tables = _changed_tables(session)
+    if tables:
+        bump_versions(session.connection(), tables)
+        session.info.setdefault("reference_tables_changed", set()).update(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_reference_cache(session: Session):
+    tables = session.info.pop("reference_tables_changed", None)
+    if tables:
+        reference_cache.invalidate(*tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_reference_changes(session: Session):
+    session.info.pop("reference_tables_changed", None)
@@ -0,0 +1,45 @@
+"""DN 라인 선적의 상태 전이 (ACTIVE ↔ BILLED)
+
+선적을 하나씩 로드/변경하지 않고 DN 라인 서브쿼리로 UPDATE 1회에 처리한다.
+
+    UPDATE shipments SET status = :to, updated_at = :now
+    WHERE shipment_id IN (SELECT shipment_id FROM debit_note_lines WHERE debit_note_id IN (:ids))
+      AND status = :from
+
+WHERE 의 현재 상태 조건 때문에 같은 선적을 동시에 두 DN 이 청구하면 나중 트랜잭션은 0행이 되고,
+호출 측은 반환된 행 수로 이를 감지한다. (라인 INSERT 는 먼저 flush 되어 있어야 함)
+"""
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.debit_note import DebitNoteLine
+from app.models.shipment import Shipment
+
+
+async def _set_line_shipments_status(
+    db: AsyncSession, debit_note_ids: tuple[int, ...], from_status: str, to_status: str,
+) -> int:
+    result = await db.execute(
+        update(Shipment)
+        .where(
+            Shipment.shipment_id.in_(
+                select(DebitNoteLine.shipment_id).where(DebitNoteLine.debit_note_id.in_(debit_note_ids))
+            ),
+            Shipment.status == from_status,
+        )
+        .values(status=to_status, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def bill_line_shipments(db: AsyncSession, *debit_note_ids: int) -> int:
+    """DN 생성 - 라인 선적 ACTIVE → BILLED → 변경 행 수"""
+    return await _set_line_shipments_status(db, debit_note_ids, "ACTIVE", "BILLED")
+
+
+async def release_line_shipments(db: AsyncSession, *debit_note_ids: int) -> int:
+    """DN 거절 - 라인 선적 BILLED → ACTIVE (다음 DN 에 다시 포함) → 변경 행 수"""
+    return await _set_line_shipments_status(db, debit_note_ids, "BILLED", "ACTIVE")
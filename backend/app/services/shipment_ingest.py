@@ -0,0 +1,155 @@
+"""선적 대량 등록 서비스 (FR-007, FR-009)
+
+source_app 월말 backfill 용 - 선적 N건을 청크 단위로 처리한다.
+- 거래처/비용 항목 ID 검증: 청크당 1회씩 조회
+- shipments: 다중 행 INSERT ... RETURNING (입력 순서대로 shipment_id 반환)
+- shipment_fee_details / shipment_reference_keys: executemany INSERT
+- 중복 감지: detect_duplicates_batch (청크당 1회 조회, 같은 청크 안의 선적끼리도 감지)
+- 청크마다 commit - 실패한 청크만 롤백하고 행별 결과에 기록
+"""
+from decimal import Decimal
+from typing import NamedTuple, Optional, Sequence
+
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.client import Client
+from app.models.fee import FeeItem
+from app.models.shipment import Shipment, ShipmentFeeDetail
+from app.schemas.shipment import FeeDetailCreate, ShipmentCreate, ShipmentBulkResult
+from app.services.duplicate_detector import detect_duplicates_batch, insert_reference_keys
+
+BULK_CHUNK_SIZE = 1000
+
+# 세후→세전 환산 (FR-017: Handling/D/O ÷1.08)
+TAX_INCLUSIVE_DIVISOR = Decimal("1.08")
+
+
+class _InsertedShipment(NamedTuple):
+    """중복 감지용 선적 참조번호 (ShipmentRefs)"""
+    shipment_id: int
+    client_id: int
+    hbl: Optional[str]
+    mbl: Optional[str]
+    invoice_no: Optional[str]
+    cd_no: Optional[str]
+
+
+def pre_tax_amount(fee_detail: FeeDetailCreate) -> Optional[Decimal]:
+    """세후 금액 입력 시 세전 금액 (소수 2자리)"""
+    if fee_detail.is_tax_inclusive and fee_detail.amount_usd > 0:
+        return (fee_detail.amount_usd / TAX_INCLUSIVE_DIVISOR).quantize(Decimal("0.01"))
+    return None
+
+
+async def _validate_references(
+    db: AsyncSession,
+    items: Sequence[tuple[int, ShipmentCreate]],
+) -> dict[int, str]:
+    """존재하지 않는 client_id / fee_item_id 검사 → {index: 오류 메시지}"""
+    client_ids = {data.client_id for _, data in items}
+    fee_item_ids = {fd.fee_item_id for _, data in items for fd in data.fee_details or []}
+
+    known_clients = set((await db.execute(
+        select(Client.client_id).where(Client.client_id.in_(client_ids))
+    )).scalars())
+    known_fee_items = set()
+    if fee_item_ids:
+        known_fee_items = set((await db.execute(
+            select(FeeItem.fee_item_id).where(FeeItem.fee_item_id.in_(fee_item_ids))
+        )).scalars())
+
+    errors = {}
+    for index, data in items:
+        if data.client_id not in known_clients:
+            errors[index] = f"Client not found: {data.client_id}"
+            continue
+        missing = sorted({fd.fee_item_id for fd in data.fee_details or []} - known_fee_items)
+        if missing:
+            errors[index] = f"Fee item not found: {', '.join(map(str, missing))}"
+    return errors
+
+
+async def _insert_chunk(
+    db: AsyncSession,
+    items: Sequence[tuple[int, ShipmentCreate]],
+    created_by: int,
+) -> list[ShipmentBulkResult]:
+    """검증된 선적 묶음 INSERT + 중복 감지 (commit 은 호출자)"""
+    result = await db.execute(
+        insert(Shipment).returning(Shipment.shipment_id, sort_by_parameter_order=True),
+        [
+            {**data.model_dump(exclude={"fee_details"}), "created_by": created_by}
+            for _, data in items
+        ],
+    )
+    shipment_ids = result.scalars().all()
+
+    fee_rows = []
+    inserted = []
+    for shipment_id, (_, data) in zip(shipment_ids, items):
+        for fd in data.fee_details or []:
+            fee_rows.append({
+                "shipment_id": shipment_id,
+                **fd.model_dump(),
+                "pre_tax_amount": pre_tax_amount(fd),
+            })
+        inserted.append(_InsertedShipment(
+            shipment_id, data.client_id, data.hbl, data.mbl, data.invoice_no, data.cd_no,
+        ))
+    if fee_rows:
+        await db.execute(insert(ShipmentFeeDetail), fee_rows)
+
+    await insert_reference_keys(db, inserted)
+    warnings = await detect_duplicates_batch(db, inserted)
+
+    return [
+        ShipmentBulkResult(
+            index=index,
+            status="CREATED",
+            shipment_id=shipment_id,
+            is_duplicate=bool(warnings[shipment_id]),
+            duplicates=warnings[shipment_id],
+        )
+        for shipment_id, (index, _) in zip(shipment_ids, items)
+    ]
+
+
+async def ingest_shipments(
+    db: AsyncSession,
+    items: Sequence[tuple[int, ShipmentCreate]],
+    created_by: int,
+) -> list[ShipmentBulkResult]:
+    """(입력 순번, ShipmentCreate) 묶음 등록 → 행별 결과 (입력 순서)
+
+    BULK_CHUNK_SIZE 건마다 commit 한다. DB 오류가 난 청크는 롤백되고
+    해당 청크의 행은 모두 FAILED 로 기록된다. (이전 청크는 유지)
+    """
+    results: list[ShipmentBulkResult] = []
+    for i in range(0, len(items), BULK_CHUNK_SIZE):
+        chunk = items[i:i + BULK_CHUNK_SIZE]
+
+        errors = await _validate_references(db, chunk)
+        valid = [(index, data) for index, data in chunk if index not in errors]
+        chunk_results = [
+            ShipmentBulkResult(index=index, status="FAILED", error=error)
+            for index, error in errors.items()
+        ]
+
+        if valid:
+            try:
+                chunk_results.extend(await _insert_chunk(db, valid, created_by))
+                await db.commit()
+            except SQLAlchemyError as e:
+                await db.rollback()
+                error = f"Database error: {e.__class__.__name__}"
+                chunk_results = [
+                    r for r in chunk_results if r.status == "FAILED"
+                ] + [
+                    ShipmentBulkResult(index=index, status="FAILED", error=error)
+                    for index, _ in valid
+                ]
+
+        results.extend(sorted(chunk_results, key=lambda r: r.index))
+    return results
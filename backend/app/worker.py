@@ -0,0 +1,44 @@
+"""Celery worker - 요청 밖에서 실행하는 작업 (Excel 출력, 월말 일괄 DN 생성)
+
+실행: celery -A app.worker:celery_app worker --loglevel=info
+브로커: CELERY_BROKER_URL (비어 있으면 REDIS_URL)
+"""
+from celery import Celery
+
+from app.core.config import settings
+from app.services.batch_runs import run_batch_sync
+from app.services.export_jobs import run_export_job_sync
+
+celery_app = Celery("eximuni", broker=settings.CELERY_BROKER_URL or settings.REDIS_URL)
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,  # 작업 상태는 debit_note_exports / debit_note_batch_runs 의 status 로 관리
+    task_acks_late=True,  # worker 중단 시 재전달 (선점으로 중복 생성 방지, 오래된 선점은 재선점)
+    worker_prefetch_multiplier=1,  # CPU 작업 - worker 프로세스당 1건씩
+)
+
+
+@celery_app.task(name="exports.generate_debit_note_excel", bind=True)
+def generate_export_task(self, export_id: int) -> str:
+    """Debit Note Excel 출력 작업 (FR-021)
+
+    다른 worker 가 선점한 채 아직 오래되지 않은 작업이면 EXPORT_JOB_STALE_SECONDS 후 다시 확인
+    (그 사이 끝났으면 COMPLETED, 선점한 worker 가 중단되었으면 재선점해서 생성)
+    """
+    status = run_export_job_sync(export_id)
+    if status == "GENERATING":
+        raise self.retry(countdown=settings.EXPORT_JOB_STALE_SECONDS)
+    return status
+
+
+@celery_app.task(name="debit_notes.batch_run", bind=True)
+def batch_run_task(self, run_id: int) -> str:
+    """월말 일괄 DN 생성 (debit_note_batch_runs)
+
+    다른 worker 가 진행 중인 실행이면 BATCH_RUN_STALE_SECONDS 후 다시 확인 (중단되었으면 재선점해서 이어서 처리)
+    """
+    status = run_batch_sync(run_id)
+    if status == "RUNNING":
+        raise self.retry(countdown=settings.BATCH_RUN_STALE_SECONDS)
+    return status
@@ -0,0 +1,239 @@
+"""프로세스 내 ASGI 하네스 - uvicorn / docker 스택 없이 전체 요청 경로 부하 측정
+
+app.main:app 을 httpx.ASGITransport 로 직접 호출한다. (미들웨어 → 인증 → 라우터 → DB 전부 포함)
+DB 는 app import 전에 DATABASE_URL 을 덮어써서 교체한다.
+- 기본: 임시 디렉터리의 SQLite 파일 (aiosqlite). 부분 인덱스/INCLUDE 는 무시되고 쓰기는 직렬화되므로
+  쓰기 위주 부하의 절대값은 PostgreSQL 과 다르다 - 변경 전/후 비교용
+- HARNESS_DATABASE_URL=postgresql+asyncpg://... : 일회용 PostgreSQL DB
+  (시작 시 drop_all/create_all 로 비우므로 운영/개발 DB 를 지정하지 말 것)
+
+DATABASE_URL 은 app import 시점에 읽히므로 이 모듈을 app 보다 먼저 import 해야 한다.
+
+    from benchmarks.asgi_harness import AppHarness, run_load
+
+    async with AppHarness() as h:
+        headers = await h.login()
+        await h.seed_shipments(h.nexcon_client_id, 10000, date(2026, 3, 1))
+        result = await run_load(lambda i: h.client.get("/api/v1/shipments", headers=headers), 500, 20)
+        print(result.summary())
+"""
+import asyncio
+import contextlib
+import io
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Awaitable, Callable, Optional
+
+if "app.core.config" in sys.modules:
+    raise ImportError("benchmarks.asgi_harness 는 app 모듈보다 먼저 import 해야 합니다 (DATABASE_URL 교체)")
+
+_TMP_DIR = tempfile.mkdtemp(prefix="asgi-harness-")
+os.environ["DATABASE_URL"] = os.environ.get("HARNESS_DATABASE_URL") or f"sqlite+aiosqlite:///{_TMP_DIR}/harness.db"
+os.environ.setdefault("EXPORT_QUEUE", "thread")
+os.environ.setdefault("EXPORT_DIR", os.path.join(_TMP_DIR, "exports"))
+
+import httpx  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.core import seed  # noqa: E402
+from app.core.database import Base, async_session, engine  # noqa: E402
+from app.main import app as asgi_app  # noqa: E402
+from app.models import Client, FeeItem, User  # noqa: E402
+from app.schemas.shipment import FeeDetailCreate, ShipmentCreate  # noqa: E402
+from app.services.shipment_ingest import ingest_shipments  # noqa: E402
+
+BASE_URL = "http://harness"
+CREDENTIALS = {
+    "admin": "admin123",
+    "accountant1": "account123",
+    "pic1": "pic123",
+}
+
+# 선적 1건당 비용 항목 (item_code, USD) - seed_shipments 기본값
+DEFAULT_FEES = {
+    "IMPORT": [("OCEAN_FREIGHT", "500.00"), ("THC", "85.50"), ("CUSTOMS_FEE", "200.00"), ("PAY_ON_BEHALF", "30.25")],
+    "EXPORT": [("TRUCKING_EXP", "120.00"), ("THC", "85.50"), ("CO_FEE", "25.00"), ("CUSTOMS_FEE", "150.00")],
+}
+SEED_BATCH_SIZE = 5000
+
+
+class AppHarness:
+    """스키마 생성 + seed + ASGI 클라이언트 (async with)
+
+    속성: client (httpx.AsyncClient), nexcon_client_id, fee_item_ids (item_code → id), admin_user_id
+    """
+
+    def __init__(self, timeout: float = 600.0):
+        self.timeout = timeout
+        self._stack: Optional[contextlib.AsyncExitStack] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self.nexcon_client_id: Optional[int] = None
+        self.fee_item_ids: dict[str, int] = {}
+        self.admin_user_id: Optional[int] = None
+
+    async def __aenter__(self) -> "AppHarness":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        with contextlib.redirect_stdout(io.StringIO()):
+            await seed.run_seed()
+
+        async with async_session() as db:
+            self.nexcon_client_id = (
+                await db.execute(select(Client.client_id).where(Client.client_code == "NEXCON"))
+            ).scalar_one()
+            self.fee_item_ids = dict((await db.execute(select(FeeItem.item_code, FeeItem.fee_item_id))).all())
+            self.admin_user_id = (await db.execute(select(User.user_id).where(User.username == "admin"))).scalar_one()
+
+        self._stack = contextlib.AsyncExitStack()
+        self.client = await self._stack.enter_async_context(httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=asgi_app), base_url=BASE_URL, timeout=self.timeout,
+        ))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._stack.aclose()
+        await engine.dispose()
+
+    # ── 데이터 준비 ──
+
+    async def login(self, username: str = "admin") -> dict:
+        """seed 사용자로 로그인 → Authorization 헤더"""
+        res = await self.client.post("/api/v1/auth/login", json={
+            "username": username, "password": CREDENTIALS[username],
+        })
+        res.raise_for_status()
+        return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    async def create_client(self, client_code: Optional[str] = None) -> int:
+        """빈 거래처 생성 (NEXCON 템플릿/매핑 없음) → client_id"""
+        client_code = client_code or f"LOAD-{uuid.uuid4().hex[:8].upper()}"
+        async with async_session() as db:
+            client = Client(client_code=client_code, client_name=f"Load test {client_code}")
+            db.add(client)
+            await db.commit()
+            return client.client_id
+
+    async def seed_shipments(
+        self,
+        client_id: int,
+        count: int,
+        period_from: date,
+        shipment_type: str = "IMPORT",
+        days: int = 28,
+        fees: Optional[list[tuple[str, str]]] = None,
+    ) -> list[int]:
+        """선적 count 건을 period_from 부터 days 일에 나눠 등록 (ingest_shipments - 일괄 등록 API 와 같은 경로)
+
+        참조번호(HBL/MBL/INV/CD)는 호출마다 고유하므로 중복 감지에 걸리지 않는다.
+        """
+        fees = fees or DEFAULT_FEES[shipment_type]
+        fee_details = [
+            FeeDetailCreate(fee_item_id=self.fee_item_ids[code], amount_usd=Decimal(amount)) for code, amount in fees
+        ]
+        prefix = uuid.uuid4().hex[:8].upper()
+        items = [
+            (i, ShipmentCreate(
+                client_id=client_id,
+                shipment_type=shipment_type,
+                delivery_date=period_from + timedelta(days=i % days),
+                invoice_no=f"INV-{prefix}-{i}",
+                mbl=f"MBL-{prefix}-{i}",
+                hbl=f"HBL-{prefix}-{i}",
+                cd_no=f"CD-{prefix}-{i}",
+                term="FOB",
+                no_of_pkgs=1 + i % 20,
+                gross_weight=Decimal("120.5"),
+                fee_details=fee_details,
+            ))
+            for i in range(count)
+        ]
+
+        shipment_ids = []
+        for start in range(0, count, SEED_BATCH_SIZE):
+            async with async_session() as db:
+                results = await ingest_shipments(db, items[start:start + SEED_BATCH_SIZE], self.admin_user_id)
+            failed = [r for r in results if r.status != "CREATED"]
+            if failed:
+                raise RuntimeError(f"seed_shipments: {len(failed)} rows failed ({failed[0].error})")
+            shipment_ids.extend(r.shipment_id for r in results)
+        return shipment_ids
+
+
+# ── 부하 실행 ──
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+@dataclass
+class LoadResult:
+    seconds: float = 0.0  # 전체 소요 시간
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)  # HTTP 상태 코드 (예외는 예외 클래스명)
+    db_queries: list[int] = field(default_factory=list)  # X-DB-Query-Count (QUERY_STATS_HEADERS)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def errors(self) -> int:
+        return sum(n for status, n in self.statuses.items() if not (isinstance(status, int) and status < 400))
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def percentile(self, pct: float) -> float:
+        return percentile(self.latencies, pct) if self.latencies else 0.0
+
+    def summary(self) -> str:
+        queries = f", {statistics.mean(self.db_queries):.1f} queries/req" if self.db_queries else ""
+        return (
+            f"{self.requests} requests in {self.seconds:.2f}s ({self.throughput:.1f}/s), "
+            f"p50 {self.percentile(0.5) * 1000:.1f} ms, p95 {self.percentile(0.95) * 1000:.1f} ms, "
+            f"p99 {self.percentile(0.99) * 1000:.1f} ms, errors {self.errors}{queries}"
+        )
+
+
+async def run_load(
+    send: Callable[[int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int,
+) -> LoadResult:
+    """send(i) 를 i = 0..requests-1 에 대해 최대 concurrency 개 동시 실행 (closed loop)
+
+    응답 본문은 send 안에서 이미 읽힌 상태(httpx 기본)이므로 지연시간에 직렬화/전송 시간이 포함된다.
+    """
+    result = LoadResult()
+    indexes = itertools.count()
+
+    async def worker():
+        while (i := next(indexes)) < requests:
+            started = time.perf_counter()
+            try:
+                res = await send(i)
+            except Exception as e:  # 부하 중 오류는 집계만 하고 계속
+                result.latencies.append(time.perf_counter() - started)
+                result.statuses[type(e).__name__] += 1
+                continue
+            result.latencies.append(time.perf_counter() - started)
+            result.statuses[res.status_code] += 1
+            if "x-db-query-count" in res.headers:
+                result.db_queries.append(int(res.headers["x-db-query-count"]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,140 @@
+"""동시 요청 부하 벤치마크 - 프로세스 내 ASGI 하네스 (서버/docker 불필요)
+
+    python -m benchmarks.bench_asgi_load                                  # 기본 시나리오 전체
+    python -m benchmarks.bench_asgi_load --shipments 50000 --concurrency 1 10 50
+    python -m benchmarks.bench_asgi_load --scenarios shipments debit-note-lines
+    HARNESS_DATABASE_URL=postgresql+asyncpg://u:p@localhost/bench_tmp python -m benchmarks.bench_asgi_load
+
+준비: NEXCON 거래처에 --shipments 건 선적(IMPORT 3 : EXPORT 1, 2026-01 ~) + 그 중 1개월치로 DN 1건,
+create-debit-note 용으로 요청마다 다른 월의 선적 --create-size 건.
+시나리오별로 동시성 수준마다 --requests 건을 보내고 처리량 / 지연시간 분위수 / 요청당 쿼리 수를 출력한다.
+(DB 종류/버전은 asgi_harness 참고 - SQLite 결과는 같은 환경의 변경 전후 비교용)
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import date
+
+from benchmarks.asgi_harness import AppHarness, LoadResult, run_load
+
+EXCHANGE_RATE = 26446
+SCENARIOS = ("shipments", "shipment", "debit-notes", "debit-note", "debit-note-lines", "create-debit-note")
+
+
+def _month(index: int) -> tuple[date, date]:
+    """2026-01 부터 index 번째 달의 (1일, 28일)"""
+    year, month = divmod(index, 12)
+    first = date(2026 + year, month + 1, 1)
+    return first, first.replace(day=28)
+
+
+async def _prepare(h: AppHarness, shipments: int, create_requests: int, create_size: int) -> dict:
+    started = time.perf_counter()
+    client_id = h.nexcon_client_id
+    months = max(1, shipments // 1000)
+    shipment_ids = []
+    for m in range(months):
+        period_from, _ = _month(m)
+        per_month = shipments // months + (m < shipments % months)
+        imports = per_month * 3 // 4
+        shipment_ids += await h.seed_shipments(client_id, imports, period_from, "IMPORT")
+        shipment_ids += await h.seed_shipments(client_id, per_month - imports, period_from, "EXPORT")
+
+    headers = await h.login("accountant1")
+    period_from, period_to = _month(0)
+    res = await h.client.post("/api/v1/debit-notes", headers=headers, json={
+        "client_id": client_id, "period_from": str(period_from), "period_to": str(period_to),
+        "exchange_rate": EXCHANGE_RATE,
+    })
+    res.raise_for_status()
+    debit_note_id = res.json()["debit_note_id"]
+
+    # create-debit-note: 요청 i 는 months + i 번째 달 (전용 거래처 - 목록 시나리오 데이터와 분리)
+    create_client_id = await h.create_client()
+    for i in range(create_requests):
+        await h.seed_shipments(create_client_id, create_size, _month(months + i)[0], "IMPORT")
+
+    print(f"prepared {len(shipment_ids)} + {create_requests * create_size} shipments "
+          f"in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return {
+        "headers": headers,
+        "client_id": client_id,
+        "shipment_ids": shipment_ids,
+        "debit_note_id": debit_note_id,
+        "create_client_id": create_client_id,
+        "create_month_offset": months,
+    }
+
+
+def _senders(h: AppHarness, ctx: dict) -> dict:
+    """시나리오 이름 → send(i)"""
+    client, headers = h.client, ctx["headers"]
+    shipment_ids, dn_id = ctx["shipment_ids"], ctx["debit_note_id"]
+    create_offset = [0]  # 동시성 수준마다 다음 달들로 이어서 생성
+
+    def create_debit_note(i: int):
+        period_from, period_to = _month(ctx["create_month_offset"] + create_offset[0] + i)
+        return client.post("/api/v1/debit-notes", headers=headers, json={
+            "client_id": ctx["create_client_id"], "period_from": str(period_from), "period_to": str(period_to),
+            "exchange_rate": EXCHANGE_RATE, "sheet_type": "IMPORT",
+        })
+
+    return {
+        "shipments": lambda i: client.get("/api/v1/shipments", headers=headers, params={
+            "client_id": ctx["client_id"], "limit": 50, "skip": (i % 20) * 50,
+        }),
+        "shipment": lambda i: client.get(
+            f"/api/v1/shipments/{shipment_ids[i * 7919 % len(shipment_ids)]}", headers=headers,
+        ),
+        "debit-notes": lambda i: client.get("/api/v1/debit-notes", headers=headers, params={"view": "summary"}),
+        "debit-note": lambda i: client.get(f"/api/v1/debit-notes/{dn_id}", headers=headers),
+        "debit-note-lines": lambda i: client.get(
+            f"/api/v1/debit-notes/{dn_id}/lines", headers=headers, params={"limit": 200},
+        ),
+        "create-debit-note": create_debit_note,
+    }, create_offset
+
+
+async def run(args) -> list[tuple[str, int, LoadResult]]:
+    create_requests = args.requests * len(args.concurrency) if "create-debit-note" in args.scenarios else 0
+    rows = []
+    async with AppHarness() as h:
+        ctx = await _prepare(h, args.shipments, create_requests, args.create_size)
+        senders, create_offset = _senders(h, ctx)
+        for scenario in args.scenarios:
+            for concurrency in args.concurrency:
+                result = await run_load(senders[scenario], args.requests, concurrency)
+                if scenario == "create-debit-note":
+                    create_offset[0] += args.requests
+                print(f"  {scenario} c={concurrency}: {result.summary()}", file=sys.stderr)
+                rows.append((scenario, concurrency, result))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shipments", type=int, default=10000, help="목록/조회 시나리오용 선적 수")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오 x 동시성 수준당 요청 수")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--create-size", type=int, default=100, help="create-debit-note 요청 1건의 선적 수")
+    parser.add_argument("--log-queries", action="store_true", help="요청별 N+1 / 쿼리 예산 경고 로그 출력")
+    args = parser.parse_args()
+    if not args.log_queries:
+        logging.getLogger("app.core.query_stats").setLevel(logging.ERROR)
+
+    rows = asyncio.run(run(args))
+
+    print(f"{'scenario':<20} {'conc':>5} {'n':>5} {'err':>4} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'queries':>8}")
+    for scenario, concurrency, r in rows:
+        queries = f"{sum(r.db_queries) / len(r.db_queries):>8.1f}" if r.db_queries else f"{'-':>8}"
+        print(f"{scenario:<20} {concurrency:>5} {r.requests:>5} {r.errors:>4} {r.throughput:>8.1f} "
+              f"{r.percentile(0.5) * 1000:>8.1f} {r.percentile(0.95) * 1000:>8.1f} "
+              f"{r.percentile(0.99) * 1000:>8.1f} {max(r.latencies) * 1000:>8.1f} {queries}")
+
+
+if __name__ == "__main__":
+    main()
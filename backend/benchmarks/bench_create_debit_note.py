@@ -0,0 +1,114 @@
+"""Debit Note 생성 지연시간 벤치마크 - 선적 건수별 POST /api/v1/debit-notes 응답 시간
+
+실행 중인 서버(tests/conftest.py와 동일하게 localhost:8000)에 요청한다.
+
+    python -m benchmarks.bench_create_debit_note --sizes 100 1000 3000
+
+선적 건수마다 전용 거래처를 만들고 서로 겹치지 않는 기간에 선적을 등록한 뒤
+DN 생성 요청 시간을 측정한다.
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import date
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+# 선적 1건당 비용 항목 (item_code, USD) - fee_item_id 는 시작 시 /api/v1/fee-items 에서 조회
+FEES = [
+    ("OCEAN_FREIGHT", 500.00),
+    ("THC", 85.50),
+    ("CUSTOMS_FEE", 200.00),
+    ("PAY_ON_BEHALF", 30.25),
+]
+
+
+def _login(client: httpx.Client, username: str, password: str) -> dict:
+    res = client.post("/api/v1/auth/login", json={"username": username, "password": password})
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def _fee_details(client: httpx.Client, headers: dict) -> list[dict]:
+    """FEES → 선적 등록용 fee_details (seed 순서와 무관하게 item_code 로 id 조회)"""
+    res = client.get("/api/v1/fee-items", headers=headers)
+    res.raise_for_status()
+    fee_item_ids = {item["item_code"]: item["fee_item_id"] for item in res.json()}
+    missing = [code for code, _ in FEES if code not in fee_item_ids]
+    if missing:
+        raise SystemExit(f"fee items not found: {', '.join(missing)}")
+    return [
+        {"fee_item_id": fee_item_ids[code], "amount_usd": amount, "currency": "USD"}
+        for code, amount in FEES
+    ]
+
+
+def _create_client(client: httpx.Client, headers: dict, size: int) -> int:
+    code = f"BENCH{size}-{uuid.uuid4().hex[:6].upper()}"
+    res = client.post("/api/v1/clients", headers=headers, json={
+        "client_code": code,
+        "client_name": f"Benchmark client ({size} shipments)",
+    })
+    res.raise_for_status()
+    return res.json()["client_id"]
+
+
+def _seed_shipments(client: httpx.Client, headers: dict, fee_details: list[dict], client_id: int, size: int,
+                    period: date):
+    for i in range(size):
+        res = client.post("/api/v1/shipments", headers=headers, json={
+            "client_id": client_id,
+            "shipment_type": "IMPORT" if i % 4 else "EXPORT",
+            "delivery_date": period.replace(day=1 + i % 28).isoformat(),
+            "invoice_no": f"BENCH-INV-{client_id}-{i}",
+            "hbl": f"BENCH-HBL-{client_id}-{i}",
+            "fee_details": fee_details,
+        })
+        res.raise_for_status()
+
+
+def run(sizes: list[int], repeat: int) -> list[tuple[int, float, float]]:
+    results = []
+    with httpx.Client(base_url=BASE_URL, timeout=600.0) as client:
+        headers = _login(client, "admin", "admin123")
+        fee_details = _fee_details(client, headers)
+        for size in sizes:
+            timings = []
+            for r in range(repeat):
+                period = date(2031 + r, 1, 1)
+                client_id = _create_client(client, headers, size)
+                _seed_shipments(client, headers, fee_details, client_id, size, period)
+
+                started = time.perf_counter()
+                res = client.post("/api/v1/debit-notes", headers=headers, json={
+                    "client_id": client_id,
+                    "period_from": period.isoformat(),
+                    "period_to": period.replace(day=28).isoformat(),
+                    "exchange_rate": 26446,
+                    "sheet_type": "ALL",
+                    "notes": "benchmark",
+                })
+                elapsed = time.perf_counter() - started
+                res.raise_for_status()
+                assert res.json()["total_lines"] == size
+                timings.append(elapsed)
+            results.append((size, statistics.median(timings), max(timings)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 3000])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'shipments':>10} {'median (ms)':>12} {'max (ms)':>10} {'ms/line':>9}")
+    for size, median, worst in run(args.sizes, args.repeat):
+        print(f"{size:>10} {median * 1000:>12.1f} {worst * 1000:>10.1f} {median * 1000 / size:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
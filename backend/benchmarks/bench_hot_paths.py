@@ -0,0 +1,304 @@
+"""계산 / Excel 생성 핫패스 마이크로 벤치마크 (서버 불필요, 프로세스 내 실행)
+
+    python -m benchmarks.bench_hot_paths                      # 기준선과 비교, 회귀 시 exit 1
+    python -m benchmarks.bench_hot_paths --sizes 100 1000     # 일부 크기만
+    python -m benchmarks.bench_hot_paths --update-baseline    # 기준선 갱신
+
+측정 대상 (크기 = DN 라인 수, NEXCON 비용 항목/템플릿 형태의 합성 데이터):
+- calc/decimal      calculate_line_totals - create_debit_note 의 라인별 계산
+- calc/columnar     calculate_columnar - numpy 일괄 계산
+- sheet/IMPORT|EXPORT     _populate_workbook 시트 1개 (라인 스트리밍 + 행 기록, xlsx 압축/저장 제외)
+- generate/IMPORT|EXPORT  DB 로드 + 시트 생성 + xlsx 저장 (create_export_file 과 같은 모드 선택)
+
+Excel 은 운영과 같이 라인 수 >= EXCEL_WRITE_ONLY_MIN_LINES 면 write_only 모드.
+DB 는 임시 SQLite 파일(DATABASE_URL 을 덮어씀)이므로 generate 의 로드 시간은 PostgreSQL 과 다르다.
+
+시간 = 반복 실행 중 최솟값 (tracemalloc 없이), 메모리 = tracemalloc 피크 (별도 1회 실행).
+기준선(baseline_hot_paths.json)은 같은 머신/환경에서 만든 값과 비교해야 의미가 있다.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Awaitable, Callable
+
+_TMP_DIR = tempfile.mkdtemp(prefix="bench-hot-paths-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP_DIR}/bench.db"
+os.environ.setdefault("QUERY_STATS_ENABLED", "false")
+
+import numpy as np  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core import seed  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, async_session, engine  # noqa: E402
+from app.models import Client, DebitNote, DebitNoteLine, FeeItem, Shipment, ShipmentFeeDetail  # noqa: E402
+from app.services.columnar_calculator import fee_item_bucket, calculate_columnar  # noqa: E402
+from app.services.excel_generator import (  # noqa: E402
+    _load_excel_data, _populate_workbook, generate_debit_note_excel, write_debit_note_excel,
+)
+from app.services.line_calculator import FeeRow, calculate_line_totals  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline_hot_paths.json")
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+SHEET_TYPES = ("IMPORT", "EXPORT")
+EXCHANGE_RATE = Decimal("26446")
+
+# 선적 1건당 비용 항목 (item_code, 금액) - NEXCON IMPORT/EXPORT 시트의 일반적인 구성
+FEES = {
+    "IMPORT": [("OCEAN_FREIGHT", "500.00"), ("THC", "85.50"), ("CUSTOMS_FEE", "200.00"), ("DO_FEE", "35.00")],
+    "EXPORT": [("TRUCKING_EXP", "120.00"), ("THC", "85.50"), ("CO_FEE", "25.00"), ("CUSTOMS_FEE", "150.00")],
+}
+PAY_ON_BEHALF_EVERY = 7  # 7건마다 대납 비용 1건 추가
+
+
+# ── 합성 데이터 ──
+
+async def _seed_reference_data() -> tuple[int, dict[str, FeeItem]]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    with contextlib.redirect_stdout(io.StringIO()):
+        await seed.seed_fee_categories()
+        await seed.seed_fee_items()
+        await seed.seed_nexcon_client()
+    async with async_session() as db:
+        client_id = (await db.execute(select(Client.client_id).where(Client.client_code == "NEXCON"))).scalar_one()
+        fee_items = {fi.item_code: fi for fi in (await db.execute(select(FeeItem))).scalars()}
+    return client_id, fee_items
+
+
+def _fee_rows(sheet_type: str, index: int, fee_items: dict[str, FeeItem]) -> list[tuple[int, Decimal]]:
+    fees = [(fee_items[code].fee_item_id, Decimal(amount) + index % 10) for code, amount in FEES[sheet_type]]
+    if index % PAY_ON_BEHALF_EVERY == 0:
+        fees.append((fee_items["PAY_ON_BEHALF"].fee_item_id, Decimal("30.25")))
+    return fees
+
+
+async def _create_debit_note(client_id: int, fee_items: dict[str, FeeItem], sheet_type: str, size: int) -> int:
+    """size 라인짜리 DN (선적/비용 상세 포함)을 일괄 INSERT"""
+    async with async_session() as db:
+        period = date(2026, 3, 1)
+        first_id = ((await db.execute(select(Shipment.shipment_id).order_by(Shipment.shipment_id.desc()).limit(1)))
+                    .scalar_one_or_none() or 0) + 1
+        shipment_ids = list(range(first_id, first_id + size))
+        await db.execute(insert(Shipment), [
+            {
+                "shipment_id": sid, "client_id": client_id, "shipment_type": sheet_type,
+                "delivery_date": period.replace(day=1 + i % 28), "invoice_no": f"INV-{sid}",
+                "mbl": f"MBL-{sid // 3}", "hbl": f"HBL-{sid}", "term": "FOB", "no_of_pkgs": 1 + i % 20,
+                "gross_weight": Decimal("120.5"), "cd_no": f"CD-{sid}", "cd_type": "A11",
+                "origin_destination": "HCM", "status": "BILLED",
+            }
+            for i, sid in enumerate(shipment_ids)
+        ])
+        await db.execute(insert(ShipmentFeeDetail), [
+            {"shipment_id": sid, "fee_item_id": fee_item_id, "amount_usd": amount, "currency": "USD"}
+            for i, sid in enumerate(shipment_ids)
+            for fee_item_id, amount in _fee_rows(sheet_type, i, fee_items)
+        ])
+        dn = DebitNote(
+            debit_note_number=f"DN-BENCH-{sheet_type}-{size}", client_id=client_id, period_from=period,
+            period_to=period.replace(day=28), exchange_rate=EXCHANGE_RATE, sheet_type=sheet_type,
+            status="APPROVED", total_lines=size,
+        )
+        db.add(dn)
+        await db.flush()
+        await db.execute(insert(DebitNoteLine), [
+            {"debit_note_id": dn.debit_note_id, "shipment_id": sid, "line_no": i + 1,
+             "total_usd": 0, "total_vnd": 0, "vat_amount": 0, "grand_total_vnd": 0,
+             "freight_usd": 0, "local_charges_usd": 0, "pay_on_behalf": 0}
+            for i, sid in enumerate(shipment_ids)
+        ])
+        await db.commit()
+        return dn.debit_note_id
+
+
+def _calc_inputs(size: int, fee_items: dict[str, FeeItem]):
+    """calc/* 입력 - 선적별 FeeRow 목록과 같은 데이터의 컬럼 배열"""
+    items_by_id = {fi.fee_item_id: fi for fi in fee_items.values()}
+    rows_by_shipment = {}
+    for i in range(size):
+        sheet_type = SHEET_TYPES[i % 4 == 3]  # IMPORT 3 : EXPORT 1
+        rows_by_shipment[i + 1] = [
+            FeeRow(i + 1, amount, fee_item_id, items_by_id[fee_item_id].item_code,
+                   items_by_id[fee_item_id].is_vat_applicable)
+            for fee_item_id, amount in _fee_rows(sheet_type, i, fee_items)
+        ]
+    flat = [row for rows in rows_by_shipment.values() for row in rows]
+    columns = (
+        np.array([r.shipment_id for r in flat], dtype=np.int64),
+        np.array([r.fee_item_id for r in flat], dtype=np.int64),
+        np.array([int(r.amount_usd * 100) for r in flat], dtype=np.int64),
+    )
+    buckets = {fi.fee_item_id: fee_item_bucket(fi.item_code, fi.is_vat_applicable) for fi in fee_items.values()}
+    return rows_by_shipment, columns, buckets
+
+
+# ── 측정 ──
+
+def _repeats(size: int) -> int:
+    return max(1, min(5, 10000 // size))
+
+
+async def _measure(fn: Callable[[], Awaitable[None]], repeats: int, memory: bool) -> tuple[float, int | None]:
+    """→ (최소 시간 초, tracemalloc 피크 바이트)"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            await fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return min(timings), peak
+
+
+async def run(sizes: list[int], memory: bool) -> dict[str, dict]:
+    client_id, fee_items = await _seed_reference_data()
+    write_only_min = settings.EXCEL_WRITE_ONLY_MIN_LINES
+    results = {}
+
+    async def record(name: str, size: int, fn, mode: str = ""):
+        seconds, peak = await _measure(fn, _repeats(size), memory)
+        results[f"{name}/{size}"] = {"seconds": seconds, "peak_bytes": peak, "mode": mode}
+        print(f"  {name}/{size} {mode} {seconds * 1000:.1f} ms", file=sys.stderr)
+
+    for size in sizes:
+        rows_by_shipment, columns, buckets = _calc_inputs(size, fee_items)
+
+        async def calc_decimal():
+            for rows in rows_by_shipment.values():
+                calculate_line_totals(rows, EXCHANGE_RATE)
+
+        async def calc_columnar():
+            calculate_columnar(*columns, buckets, EXCHANGE_RATE).line_dicts()
+
+        await record("calc/decimal", size, calc_decimal)
+        await record("calc/columnar", size, calc_columnar)
+
+        for sheet_type in SHEET_TYPES:
+            dn_id = await _create_debit_note(client_id, fee_items, sheet_type, size)
+            write_only = size >= write_only_min
+            mode = "write_only" if write_only else "in_memory"
+            async with async_session() as db:
+                data = await _load_excel_data(dn_id, db)
+            data = replace(data, sheets=data.sheets[:1])
+
+            async def build_sheet():
+                wb = Workbook(write_only=write_only)
+                if not write_only:
+                    wb.remove(wb.active)
+                async with async_session() as db:
+                    await _populate_workbook(wb, data, db, write_only=write_only)
+                if write_only:
+                    # 시트 XML 마무리 + 임시 파일 삭제 (저장하지 않은 write_only 시트는 GC 시 오류)
+                    for ws in wb.worksheets:
+                        ws.close()
+                        ws._writer.cleanup()
+
+            async def generate():
+                async with async_session() as db:
+                    if write_only:
+                        await write_debit_note_excel(dn_id, db, os.path.join(_TMP_DIR, "out"))
+                    else:
+                        await generate_debit_note_excel(dn_id, db)
+
+            await record(f"sheet/{sheet_type}", size, build_sheet, mode)
+            await record(f"generate/{sheet_type}", size, generate, mode)
+    return results
+
+
+# ── 기준선 비교 ──
+
+def compare(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float,
+            min_delta_seconds: float) -> list[str]:
+    """결과 표 출력 → 회귀 항목 목록"""
+    regressions = []
+    print(f"{'case':<24} {'mode':<10} {'ms':>10} {'base ms':>10} {'ratio':>6} "
+          f"{'peak MB':>9} {'base MB':>9} {'ratio':>6}  status")
+    for case, current in results.items():
+        base = baseline.get(case)
+        status = "new"
+        time_ratio = mem_ratio = None
+        if base:
+            time_ratio = current["seconds"] / base["seconds"] if base["seconds"] else None
+            if current["peak_bytes"] and base.get("peak_bytes"):
+                mem_ratio = current["peak_bytes"] / base["peak_bytes"]
+            slower = (
+                time_ratio is not None and time_ratio > 1 + time_tolerance
+                and current["seconds"] - base["seconds"] > min_delta_seconds
+            )
+            bigger = mem_ratio is not None and mem_ratio > 1 + memory_tolerance
+            status = "REGRESSION" if slower or bigger else "ok"
+            if status == "REGRESSION":
+                regressions.append(case)
+
+        def mb(value):
+            return f"{value / 1e6:>9.1f}" if value else f"{'-':>9}"
+
+        def ratio(value):
+            return f"{value:>6.2f}" if value is not None else f"{'-':>6}"
+
+        base_ms = f"{base['seconds'] * 1000:>10.1f}" if base else f"{'-':>10}"
+        print(f"{case:<24} {current['mode']:<10} {current['seconds'] * 1000:>10.1f} {base_ms} {ratio(time_ratio)} "
+              f"{mb(current['peak_bytes'])} {mb(base.get('peak_bytes') if base else None)} {ratio(mem_ratio)}  {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 피크 측정 생략")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과로 기준선 파일 갱신 (기존 항목 병합)")
+    parser.add_argument("--time-tolerance", type=float, default=0.30, help="허용 시간 증가율 (0.30 = 30%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.15, help="허용 피크 메모리 증가율")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="이보다 작은 시간 차이는 무시 (측정 잡음)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.sizes, memory=not args.no_memory))
+
+    stored = {"results": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+    regressions = compare(results, stored["results"], args.time_tolerance, args.memory_tolerance,
+                          args.min_delta_ms / 1000)
+
+    if args.update_baseline:
+        stored["results"].update(results)
+        stored["environment"] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "excel_write_only_min_lines": settings.EXCEL_WRITE_ONLY_MIN_LINES,
+            "updated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline updated: {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
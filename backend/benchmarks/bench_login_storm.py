@@ -0,0 +1,104 @@
+"""로그인 폭주 벤치마크 - 동시 로그인 중 다른 API 응답 시간
+
+실행 중인 서버(tests/conftest.py와 동일하게 localhost:8000)에 요청한다.
+
+    python -m benchmarks.bench_login_storm --logins 200 --concurrency 20
+
+1) 기준: 로그인 없이 GET /api/v1/auth/me 지연시간 측정
+2) 폭주: 동시 로그인 요청을 보내면서 같은 /me 지연시간 측정
+bcrypt 검증이 이벤트 루프를 막으면 폭주 중 /me 지연시간이 로그인 1회 시간(수백 ms) 단위로 늘어난다.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+CREDENTIALS = {"username": "admin", "password": "admin123"}
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _probe(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event, interval: float) -> list[float]:
+    """stop 될 때까지 /me 를 주기적으로 호출 → 지연시간 목록"""
+    timings = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        res = await client.get("/api/v1/auth/me", headers=headers)
+        res.raise_for_status()
+        timings.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return timings
+
+
+async def _login_storm(client: httpx.AsyncClient, logins: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def login():
+        async with semaphore:
+            started = time.perf_counter()
+            res = await client.post("/api/v1/auth/login", json=CREDENTIALS)
+            res.raise_for_status()
+            timings.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return timings
+
+
+async def run(logins: int, concurrency: int, baseline_seconds: float, interval: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=600.0, limits=limits) as client:
+        res = await client.post("/api/v1/auth/login", json=CREDENTIALS)
+        res.raise_for_status()
+        headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, headers, stop, interval))
+        await asyncio.sleep(baseline_seconds)
+        stop.set()
+        baseline = await probe
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, headers, stop, interval))
+        started = time.perf_counter()
+        login_timings = await _login_storm(client, logins, concurrency)
+        storm_seconds = time.perf_counter() - started
+        stop.set()
+        during = await probe
+
+    return {
+        "baseline": baseline,
+        "during": during,
+        "logins": login_timings,
+        "storm_seconds": storm_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.05, help="/me 호출 간격 (초)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.logins, args.concurrency, args.baseline_seconds, args.interval))
+
+    print(f"logins: {len(result['logins'])} in {result['storm_seconds']:.1f}s "
+          f"({len(result['logins']) / result['storm_seconds']:.1f}/s), "
+          f"login p50 {statistics.median(result['logins']) * 1000:.0f} ms")
+    print(f"{'GET /me':>12} {'n':>5} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+    for label in ("baseline", "during"):
+        timings = result[label]
+        print(f"{label:>12} {len(timings):>5} {statistics.median(timings) * 1000:>9.1f} "
+              f"{_percentile(timings, 0.95) * 1000:>9.1f} {max(timings) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
-"""테스트 공통 설정 - 실행 중인 서버에 동기 HTTP 요청"""
+"""테스트 공통 설정 - 실행 중인 서버에 동기 HTTP 요청 / SQLite 단위 테스트 DB"""
+import asyncio
+
 import pytest
 import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401 - relationship 대상 매퍼 등록
+from app.core.database import Base
 
 BASE_URL = "http://localhost:8000"
 
@@ -48,3 +55,50 @@ def pic_token(client: httpx.Client):
 
 def auth_header(token: str):
     return {"Authorization": f"Bearer {token}"}
+
+
+def assert_query_budget(res: httpx.Response, budget: int):
+    """응답 헤더의 요청당 쿼리 수가 예산 이내인지 (app.core.query_stats)"""
+    count = int(res.headers["x-db-query-count"])
+    assert count <= budget, f"{res.request.method} {res.request.url.path}: {count} queries > budget {budget}"
+
+
+class SQLiteDB:
+    """서버 없이 도는 단위 테스트용 SQLite 임시 파일 DB (작업은 세션을 여러 개 쓰므로 파일)
+
+    run(scenario, seed) → asyncio.run(scenario(db)) 결과
+    - session_factory: 같은 DB 의 새 세션 (run 중에만)
+    - statements: seed 이후 실행된 SQL
+    """
+
+    def __init__(self, url: str, tables: tuple[str, ...]):
+        self.url = url
+        self.tables = tables
+        self.session_factory = None
+        self.statements: list[str] = []
+
+    def run(self, scenario, seed=None):
+        async def main():
+            engine = create_async_engine(self.url)
+            event.listen(engine.sync_engine, "before_cursor_execute",
+                         lambda conn, cursor, statement, *args: self.statements.append(statement))
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=[Base.metadata.tables[t] for t in self.tables])
+            self.session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            try:
+                async with self.session_factory() as db:
+                    if seed:
+                        await seed(db)
+                    self.statements.clear()
+                    return await scenario(db)
+            finally:
+                self.session_factory = None
+                await engine.dispose()
+        return asyncio.run(main())
+
+
+@pytest.fixture
+def sqlite_db(request, tmp_path):
+    """테이블: indirect parametrize 값, 없으면 테스트 모듈의 TABLES"""
+    tables = getattr(request, "param", None) or request.module.TABLES
+    return SQLiteDB(f"sqlite+aiosqlite:///{tmp_path}/unit.db", tuple(tables))
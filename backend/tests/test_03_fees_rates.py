@@ -51,3 +51,36 @@ def test_pic_cannot_create_rate(client: httpx.Client, pic_token: str):
         "rate_date": "2026-04-02",
     })
     assert res.status_code == 403
+
+
+def test_resolve_exchange_rate_by_date(client: httpx.Client, admin_token: str):
+    for rate, rate_date in ((20000, "2001-01-01"), (21000, "2001-06-01")):
+        res = client.post("/api/v1/exchange-rates", headers=auth_header(admin_token), json={
+            "rate": rate, "rate_date": rate_date, "source": "pytest",
+        })
+        assert res.status_code == 201
+
+    res = client.get("/api/v1/exchange-rates/resolve", headers=auth_header(admin_token),
+                     params={"on_date": "2001-03-15", "client_id": 1})
+    assert res.status_code == 200
+    data = res.json()
+    assert float(data["rate"]) == 20000
+    assert data["source"] == "GENERAL"
+    assert data["effective_from"] == "2001-01-01"
+
+    res = client.post("/api/v1/exchange-rates/resolve", headers=auth_header(admin_token), json={
+        "lookups": [
+            {"client_id": 1, "on_date": "2001-03-15"},
+            {"on_date": "2001-07-01"},
+            {"on_date": "2000-12-31"},
+        ],
+    })
+    assert res.status_code == 200
+    first, second, missing = res.json()
+    assert float(first["rate"]) == 20000
+    assert float(second["rate"]) == 21000
+    assert missing is None
+
+    res = client.get("/api/v1/exchange-rates/resolve", headers=auth_header(admin_token),
+                     params={"on_date": "2000-12-31"})
+    assert res.status_code == 404
@@ -48,8 +48,112 @@ def test_create_shipment_duplicate_detection(client: httpx.Client, admin_token:
     assert data.get("duplicates") or data.get("is_duplicate")
 
 
+def test_duplicate_detection_normalizes_reference(client: httpx.Client, admin_token: str):
+    """공백/대소문자만 다른 HBL도 중복으로 감지"""
+    res = client.post("/api/v1/shipments", headers=auth_header(admin_token), json={
+        "client_id": 1,
+        "shipment_type": "IMPORT",
+        "delivery_date": "2026-04-03",
+        "invoice_no": "STEP6-INV-003",
+        "hbl": " step6-hbl-001 ",
+        "fee_details": [],
+    })
+    assert res.status_code == 201
+    data = res.json()
+    assert data["is_duplicate"] is True
+    assert any(d["duplicate_type"] == "HBL" for d in data["duplicates"])
+
+
 def test_list_shipments_with_client_filter(client: httpx.Client, admin_token: str):
     res = client.get("/api/v1/shipments?client_id=1", headers=auth_header(admin_token))
     assert res.status_code == 200
     for item in res.json()["items"]:
         assert item["client_id"] == 1
+
+
+def test_bulk_create_shipments(client: httpx.Client, admin_token: str):
+    """대량 등록 - 행별 결과, 존재하지 않는 거래처는 FAILED, 같은 묶음 안의 중복 감지"""
+    res = client.post("/api/v1/shipments/bulk", headers=auth_header(admin_token), json={
+        "items": [
+            {
+                "client_id": 1,
+                "delivery_date": "2026-05-01",
+                "invoice_no": "BULK-INV-001",
+                "hbl": "BULK-HBL-001",
+                "fee_details": [
+                    {"fee_item_id": 1, "amount_usd": 300.00},
+                    {"fee_item_id": 8, "amount_usd": 108.00, "is_tax_inclusive": True},
+                ],
+            },
+            {"client_id": 999999, "delivery_date": "2026-05-01", "hbl": "BULK-HBL-002"},
+            {"client_id": 1, "delivery_date": "2026-05-02", "invoice_no": "BULK-INV-003", "hbl": "bulk-hbl-001"},
+        ],
+    })
+    assert res.status_code == 200
+    data = res.json()
+    assert (data["total"], data["created"], data["failed"]) == (3, 2, 1)
+    assert [r["index"] for r in data["results"]] == [0, 1, 2]
+
+    first, missing, duplicate = data["results"]
+    assert first["status"] == "CREATED"
+    assert missing["status"] == "FAILED" and "Client not found" in missing["error"]
+    assert duplicate["is_duplicate"] is True
+    assert any(d["existing_shipment_id"] == first["shipment_id"] for d in duplicate["duplicates"])
+    # 한 건씩 등록할 때와 같이 나중 행에만 중복 기록
+    assert all(d["existing_shipment_id"] != duplicate["shipment_id"] for d in first["duplicates"])
+
+    detail = client.get(f"/api/v1/shipments/{first['shipment_id']}", headers=auth_header(admin_token)).json()
+    assert len(detail["fee_details"]) == 2
+    assert any(float(fd["pre_tax_amount"] or 0) == 100.00 for fd in detail["fee_details"])
+
+
+def test_bulk_create_shipments_ndjson(client: httpx.Client, admin_token: str):
+    """NDJSON 스트림 - 파싱 실패 행만 FAILED"""
+    body = "\n".join([
+        '{"client_id": 1, "delivery_date": "2026-05-03", "invoice_no": "BULK-NDJSON-001"}',
+        '{"client_id": "not-a-number"}',
+        "",
+        '{"client_id": 1, "delivery_date": "2026-05-04", "invoice_no": "BULK-NDJSON-002"}',
+    ])
+    res = client.post(
+        "/api/v1/shipments/bulk/ndjson",
+        headers={**auth_header(admin_token), "Content-Type": "application/x-ndjson"},
+        content=body,
+    )
+    assert res.status_code == 200
+    data = res.json()
+    assert (data["total"], data["created"], data["failed"]) == (3, 2, 1)
+    assert data["results"][1]["status"] == "FAILED"
+    assert "client_id" in data["results"][1]["error"]
+
+
+def test_list_shipments_cursor_pagination(client: httpx.Client, admin_token: str):
+    """cursor 로 넘긴 결과 = offset 목록과 같은 순서 (중복/누락 없음)"""
+    full = client.get("/api/v1/shipments?limit=30", headers=auth_header(admin_token)).json()
+
+    seen, cursor = [], None
+    while len(seen) < 30:
+        url = "/api/v1/shipments?limit=3&count=none" + (f"&cursor={cursor}" if cursor else "")
+        res = client.get(url, headers=auth_header(admin_token))
+        assert res.status_code == 200
+        page = res.json()
+        assert page["total"] is None
+        seen.extend(s["shipment_id"] for s in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    expected = [s["shipment_id"] for s in full["items"]]
+    assert seen[:len(expected)] == expected
+    assert len(seen) >= min(30, full["total"])
+
+
+def test_list_shipments_count_modes(client: httpx.Client, admin_token: str):
+    exact = client.get("/api/v1/shipments?limit=1", headers=auth_header(admin_token)).json()
+    estimated = client.get("/api/v1/shipments?limit=1&count=estimated", headers=auth_header(admin_token)).json()
+    assert isinstance(estimated["total"], int)
+    assert exact["total"] >= 1
+
+    res = client.get("/api/v1/shipments?count=approx", headers=auth_header(admin_token))
+    assert res.status_code == 422
+    res = client.get("/api/v1/shipments?cursor=not-a-cursor", headers=auth_header(admin_token))
+    assert res.status_code == 400
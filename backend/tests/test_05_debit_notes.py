@@ -1,7 +1,10 @@
 """Debit Note API 테스트 (워크플로우 포함)"""
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
 import pytest
 import httpx
-from tests.conftest import auth_header
+from tests.conftest import assert_query_budget, auth_header
 
 
 def _ensure_shipment_for_period(client: httpx.Client, token: str, period_from: str):
@@ -62,6 +65,100 @@ def test_list_debit_notes(client: httpx.Client, admin_token: str):
     assert "items" in data
 
 
+def test_list_debit_notes_cursor_pagination(client: httpx.Client, admin_token: str):
+    full = client.get("/api/v1/debit-notes?limit=200", headers=auth_header(admin_token)).json()
+
+    seen, cursor = [], None
+    while True:
+        url = "/api/v1/debit-notes?limit=2&count=none" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url, headers=auth_header(admin_token)).json()
+        seen.extend(d["debit_note_id"] for d in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [d["debit_note_id"] for d in full["items"]]
+
+
+def test_list_debit_notes_summary_view(client: httpx.Client, admin_token: str):
+    """view=summary: 헤더만 (lines=None), full 과 같은 순서/합계"""
+    full = client.get("/api/v1/debit-notes?limit=20", headers=auth_header(admin_token)).json()
+    res = client.get("/api/v1/debit-notes?limit=20&view=summary", headers=auth_header(admin_token))
+    assert res.status_code == 200
+    summary = res.json()
+    assert summary["total"] == full["total"]
+    assert [d["debit_note_id"] for d in summary["items"]] == [d["debit_note_id"] for d in full["items"]]
+    for s, f in zip(summary["items"], full["items"]):
+        assert s["lines"] is None
+        assert s["client_name"]
+        assert s["grand_total_vnd"] == f["grand_total_vnd"]
+        assert s["total_lines"] == len(f["lines"])
+
+
+def test_debit_note_lines_paging(client: httpx.Client, admin_token: str):
+    """GET /{id}/lines: cursor 로 넘긴 라인 = 상세 조회 라인 (line_no 순)"""
+    res = client.post("/api/v1/shipments/bulk", headers=auth_header(admin_token), json={"items": [
+        {
+            "client_id": 1,
+            "shipment_type": "IMPORT",
+            "delivery_date": f"2026-10-0{i + 1}",
+            "invoice_no": f"DN-LINES-INV-{i}",
+            "hbl": f"DN-LINES-HBL-{i}",
+            "fee_details": [{"fee_item_id": 1, "amount_usd": 100 + i}],
+        }
+        for i in range(3)
+    ]})
+    assert res.status_code == 200, res.text
+    res = client.post("/api/v1/debit-notes", headers=auth_header(admin_token), json={
+        "client_id": 1,
+        "period_from": "2026-10-01",
+        "period_to": "2026-10-31",
+        "exchange_rate": 26446,
+    })
+    assert res.status_code == 201, res.text
+    dn_id = res.json()["debit_note_id"]
+    detail = client.get(f"/api/v1/debit-notes/{dn_id}", headers=auth_header(admin_token)).json()
+    assert detail["total_lines"] >= 3
+
+    seen, cursor = [], None
+    while True:
+        url = f"/api/v1/debit-notes/{dn_id}/lines?limit=1" + (f"&cursor={cursor}" if cursor else "")
+        res = client.get(url, headers=auth_header(admin_token))
+        assert res.status_code == 200
+        page = res.json()
+        assert page["total"] == detail["total_lines"]
+        seen.extend(l["line_id"] for l in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [l["line_id"] for l in sorted(detail["lines"], key=lambda l: (l["line_no"], l["line_id"]))]
+
+    res = client.get("/api/v1/debit-notes/999999/lines", headers=auth_header(admin_token))
+    assert res.status_code == 404
+
+
+def test_create_debit_note_resolves_exchange_rate(client: httpx.Client, admin_token: str):
+    """exchange_rate 미지정 → 거래처/period_to 기준 환율 적용"""
+    res = client.post("/api/v1/shipments/bulk", headers=auth_header(admin_token), json={"items": [{
+        "client_id": 1,
+        "shipment_type": "IMPORT",
+        "delivery_date": "2026-12-01",
+        "invoice_no": "DN-RATE-INV",
+        "hbl": "DN-RATE-HBL",
+        "fee_details": [{"fee_item_id": 1, "amount_usd": 100}],
+    }]})
+    assert res.status_code == 200, res.text
+    expected = client.get("/api/v1/exchange-rates/resolve", headers=auth_header(admin_token),
+                          params={"client_id": 1, "on_date": "2026-12-31"}).json()
+
+    res = client.post("/api/v1/debit-notes", headers=auth_header(admin_token), json={
+        "client_id": 1,
+        "period_from": "2026-12-01",
+        "period_to": "2026-12-31",
+    })
+    assert res.status_code == 201, res.text
+    assert float(res.json()["exchange_rate"]) == float(expected["rate"])
+
+
 def test_submit_for_review(client: httpx.Client, admin_token: str):
     """DRAFT → PENDING_REVIEW"""
     list_res = client.get("/api/v1/debit-notes?status=DRAFT", headers=auth_header(admin_token))
@@ -125,3 +222,243 @@ def test_workflow_history(client: httpx.Client, admin_token: str):
         )
         assert res.status_code == 200
         assert len(res.json()) >= 1
+
+
+def test_reject_restores_shipments(client: httpx.Client, admin_token: str, accountant_token: str):
+    """생성 → 라인 선적 BILLED, 거절 → ACTIVE 복원 (UPDATE 1회 - 라인 수와 무관한 쿼리 수)"""
+    res = client.post("/api/v1/shipments/bulk", headers=auth_header(admin_token), json={"items": [
+        {
+            "client_id": 1,
+            "shipment_type": "IMPORT",
+            "delivery_date": f"2027-02-{i + 1:02d}",
+            "invoice_no": f"DN-REJECT-INV-{i}",
+            "hbl": f"DN-REJECT-HBL-{i}",
+            "fee_details": [{"fee_item_id": 1, "amount_usd": 100 + i}],
+        }
+        for i in range(5)
+    ]})
+    assert res.status_code == 200, res.text
+    shipment_ids = [r["shipment_id"] for r in res.json()["results"]]
+
+    def statuses():
+        return {client.get(f"/api/v1/shipments/{sid}", headers=auth_header(admin_token)).json()["status"]
+                for sid in shipment_ids}
+
+    dn_request = {"client_id": 1, "period_from": "2027-02-01", "period_to": "2027-02-28", "exchange_rate": 26446}
+    res = client.post("/api/v1/debit-notes", headers=auth_header(admin_token), json=dn_request)
+    assert res.status_code == 201, res.text
+    dn = res.json()
+    assert {l["shipment_id"] for l in dn["lines"]} == set(shipment_ids)
+    assert statuses() == {"BILLED"}
+
+    # 같은 기간 재생성 - 남은 ACTIVE 선적 없음
+    res = client.post("/api/v1/debit-notes", headers=auth_header(admin_token), json=dn_request)
+    assert res.status_code == 400
+
+    res = client.post(f"/api/v1/debit-notes/{dn['debit_note_id']}/submit-for-review",
+                      headers=auth_header(admin_token), json={})
+    assert res.status_code == 200
+    res = client.post(f"/api/v1/debit-notes/{dn['debit_note_id']}/reject",
+                      headers=auth_header(accountant_token), json={"comment": "금액 확인 필요"})
+    assert res.status_code == 200, res.text
+    assert res.json()["status"] == "REJECTED"
+    assert_query_budget(res, 10)
+    assert statuses() == {"ACTIVE"}
+
+    # 복원된 선적으로 다시 생성
+    res = client.post("/api/v1/debit-notes", headers=auth_header(admin_token), json=dn_request)
+    assert res.status_code == 201, res.text
+    assert res.json()["total_lines"] == len(shipment_ids)
+    assert statuses() == {"BILLED"}
+
+
+def _create_dn_for_period(client: httpx.Client, token: str, month: str, count: int = 3) -> dict:
+    """month(YYYY-MM) 에 선적 count 건 등록 후 DN 생성"""
+    res = client.post("/api/v1/shipments/bulk", headers=auth_header(token), json={"items": [
+        {
+            "client_id": 1,
+            "shipment_type": "IMPORT",
+            "delivery_date": f"{month}-{i + 1:02d}",
+            "invoice_no": f"DN-WF-INV-{month}-{i}",
+            "hbl": f"DN-WF-HBL-{month}-{i}",
+            "fee_details": [{"fee_item_id": 1, "amount_usd": 100 + i}],
+        }
+        for i in range(count)
+    ]})
+    assert res.status_code == 200, res.text
+    res = client.post("/api/v1/debit-notes", headers=auth_header(token), json={
+        "client_id": 1, "period_from": f"{month}-01", "period_to": f"{month}-28", "exchange_rate": 26446,
+    })
+    assert res.status_code == 201, res.text
+    return res.json()
+
+
+def test_workflow_transition_header_only(client: httpx.Client, admin_token: str, accountant_token: str):
+    """전이 응답은 기본 헤더만 (lines=None), view=full 이면 라인 포함 / 상태 불일치 400"""
+    dn = _create_dn_for_period(client, admin_token, "2027-03")
+    dn_id = dn["debit_note_id"]
+
+    res = client.post(f"/api/v1/debit-notes/{dn_id}/submit-for-review", headers=auth_header(admin_token), json={})
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert data["status"] == "PENDING_REVIEW"
+    assert data["lines"] is None
+    assert data["total_lines"] == 3
+    assert_query_budget(res, 6)
+
+    res = client.post(f"/api/v1/debit-notes/{dn_id}/submit-for-review", headers=auth_header(admin_token), json={})
+    assert res.status_code == 400
+    assert "current status is PENDING_REVIEW" in res.json()["detail"]
+
+    res = client.post(f"/api/v1/debit-notes/{dn_id}/approve?view=full",
+                      headers=auth_header(accountant_token), json={"comment": "OK"})
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert data["status"] == "APPROVED"
+    assert data["approved_by"] is not None and data["approved_at"] is not None
+    assert [l["line_id"] for l in data["lines"]] == [l["line_id"] for l in dn["lines"]]
+
+    history = client.get(f"/api/v1/debit-notes/{dn_id}/workflows", headers=auth_header(admin_token)).json()
+    assert [(w["action"], w["from_status"], w["to_status"]) for w in history] == [
+        ("CREATED", None, "DRAFT"),
+        ("SUBMITTED", "DRAFT", "PENDING_REVIEW"),
+        ("APPROVED", "PENDING_REVIEW", "APPROVED"),
+    ]
+
+    res = client.post("/api/v1/debit-notes/999999/approve", headers=auth_header(accountant_token), json={})
+    assert res.status_code == 404
+
+
+def test_concurrent_approve_single_winner(base_url: str, admin_token: str, accountant_token: str, pic_token: str):
+    """두 승인자가 동시에 승인 → 한 명만 성공, 이력 1건"""
+    with httpx.Client(base_url=base_url, timeout=30.0) as client:
+        dn_id = _create_dn_for_period(client, admin_token, "2027-04")["debit_note_id"]
+        res = client.post(f"/api/v1/debit-notes/{dn_id}/submit-for-review", headers=auth_header(admin_token), json={})
+        assert res.status_code == 200
+
+    def approve(token: str) -> int:
+        with httpx.Client(base_url=base_url, timeout=30.0) as c:
+            return c.post(f"/api/v1/debit-notes/{dn_id}/approve", headers=auth_header(token), json={}).status_code
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        statuses = sorted(pool.map(approve, [accountant_token, pic_token]))
+    assert statuses == [200, 400]
+
+    with httpx.Client(base_url=base_url, timeout=30.0) as client:
+        history = client.get(f"/api/v1/debit-notes/{dn_id}/workflows", headers=auth_header(admin_token)).json()
+    assert [w["action"] for w in history].count("APPROVED") == 1
+
+
+def test_bulk_workflow(client: httpx.Client, admin_token: str, accountant_token: str, pic_token: str):
+    """일괄 제출/승인/거절 - DN 별 결과, 쿼리 수는 DN 수와 무관"""
+    dns = [_create_dn_for_period(client, admin_token, month, count=2) for month in ("2027-05", "2027-06", "2027-07")]
+    ids = [dn["debit_note_id"] for dn in dns]
+    url = "/api/v1/debit-notes/bulk-workflow"
+
+    res = client.post(url, headers=auth_header(pic_token), json={"debit_note_ids": ids, "action": "submit"})
+    assert res.status_code == 403
+
+    res = client.post(url, headers=auth_header(admin_token),
+                      json={"debit_note_ids": ids + [ids[0], 999999], "action": "submit"})
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert (data["total"], data["applied"], data["failed"]) == (4, 3, 1)
+    assert [r["debit_note_id"] for r in data["results"]] == ids + [999999]
+    assert data["results"][-1] == {
+        "debit_note_id": 999999, "result": "FAILED", "status": None, "error": "Debit Note not found",
+    }
+    assert_query_budget(res, 6)
+
+    # 생성자 본인 승인 불가
+    res = client.post(url, headers=auth_header(admin_token), json={"debit_note_ids": ids, "action": "approve"})
+    assert res.json()["applied"] == 0
+    assert all("Creator cannot approve" in r["error"] for r in res.json()["results"])
+
+    res = client.post(url, headers=auth_header(accountant_token),
+                      json={"debit_note_ids": ids[:2], "action": "approve", "comment": "월말 일괄 승인"})
+    assert res.json()["applied"] == 2
+    assert {r["status"] for r in res.json()["results"]} == {"APPROVED"}
+
+    res = client.post(url, headers=auth_header(accountant_token),
+                      json={"debit_note_ids": [ids[2], ids[0]], "action": "reject", "comment": "재확인"})
+    results = {r["debit_note_id"]: r for r in res.json()["results"]}
+    assert results[ids[2]]["result"] == "APPLIED"
+    assert results[ids[0]] == {
+        "debit_note_id": ids[0], "result": "FAILED", "status": "APPROVED",
+        "error": "Cannot reject: current status is APPROVED",
+    }
+    for line in dns[2]["lines"]:
+        shipment = client.get(f"/api/v1/shipments/{line['shipment_id']}", headers=auth_header(admin_token)).json()
+        assert shipment["status"] == "ACTIVE"
+
+    detail = client.get(f"/api/v1/debit-notes/{ids[2]}", headers=auth_header(admin_token)).json()
+    assert detail["status"] == "REJECTED" and detail["rejection_reason"] == "재확인"
+    history = client.get(f"/api/v1/debit-notes/{ids[0]}/workflows", headers=auth_header(admin_token)).json()
+    assert [w["action"] for w in history] == ["CREATED", "SUBMITTED", "APPROVED"]
+
+
+def _assert_header_matches_lines(client: httpx.Client, token: str, dn_id: int) -> dict:
+    """헤더 합계(delta 누적) == 라인 합계"""
+    dn = client.get(f"/api/v1/debit-notes/{dn_id}", headers=auth_header(token)).json()
+    for header_key, line_key in (("total_usd", "total_usd"), ("total_vnd", "total_vnd"),
+                                 ("total_vat", "vat_amount"), ("grand_total_vnd", "grand_total_vnd")):
+        assert Decimal(str(dn[header_key])) == sum(Decimal(str(l[line_key])) for l in dn["lines"]), header_key
+    return dn
+
+
+def test_fee_change_recalculates_draft_line(client: httpx.Client, admin_token: str, accountant_token: str):
+    """DRAFT DN 선적의 비용 수정/추가/삭제 - 해당 라인만 재계산, 헤더는 delta 반영 / 검토 요청 후 400"""
+    dn = _create_dn_for_period(client, admin_token, "2027-09")
+    dn_id = dn["debit_note_id"]
+    target, other = dn["lines"][0], dn["lines"][1]
+    shipment_id = target["shipment_id"]
+    shipment = client.get(f"/api/v1/shipments/{shipment_id}", headers=auth_header(admin_token)).json()
+    detail_id = shipment["fee_details"][0]["detail_id"]
+    url = f"/api/v1/shipments/{shipment_id}/fee-details"
+
+    res = client.put(f"{url}/{detail_id}", headers=auth_header(admin_token), json={"amount_usd": "250.00"})
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert Decimal(data["fee_detail"]["amount_usd"]) == Decimal("250.00")
+    [recalc] = data["recalculated"]
+    assert (recalc["debit_note_id"], recalc["line_id"]) == (dn_id, target["line_id"])
+    assert Decimal(recalc["delta_usd"]) == Decimal("250.00") - Decimal(str(target["total_usd"]))
+    assert_query_budget(res, 10)
+
+    updated = _assert_header_matches_lines(client, admin_token, dn_id)
+    assert Decimal(recalc["note_grand_total_vnd"]) == Decimal(str(updated["grand_total_vnd"]))
+    lines = {l["line_id"]: l for l in updated["lines"]}
+    assert Decimal(str(lines[target["line_id"]]["total_usd"])) == Decimal("250.00")
+    assert lines[other["line_id"]] == other
+
+    res = client.post(url, headers=auth_header(admin_token), json={"fee_item_id": 1, "amount_usd": "40.00"})
+    assert res.status_code == 201, res.text
+    added_id = res.json()["fee_detail"]["detail_id"]
+    assert Decimal(res.json()["recalculated"][0]["delta_usd"]) == Decimal("40.00")
+    _assert_header_matches_lines(client, admin_token, dn_id)
+
+    res = client.delete(f"{url}/{added_id}", headers=auth_header(admin_token))
+    assert res.status_code == 200, res.text
+    assert res.json()["fee_detail"] is None
+    assert Decimal(res.json()["recalculated"][0]["delta_usd"]) == Decimal("-40.00")
+    _assert_header_matches_lines(client, admin_token, dn_id)
+
+    res = client.post(url, headers=auth_header(admin_token), json={"fee_item_id": 999999, "amount_usd": "1"})
+    assert res.status_code == 400
+    res = client.put(f"{url}/999999", headers=auth_header(admin_token), json={"amount_usd": "1"})
+    assert res.status_code == 404
+
+    # null 은 쓰기 전에 422 - 저장된 값 / 선적 조회 유지
+    for field in ("amount_usd", "currency", "is_tax_inclusive"):
+        res = client.put(f"{url}/{detail_id}", headers=auth_header(admin_token), json={field: None})
+        assert res.status_code == 422, field
+    res = client.get(f"/api/v1/shipments/{shipment_id}", headers=auth_header(admin_token))
+    assert res.status_code == 200
+    fee = next(fd for fd in res.json()["fee_details"] if fd["detail_id"] == detail_id)
+    assert Decimal(fee["amount_usd"]) == Decimal("250.00")
+
+    res = client.post(f"/api/v1/debit-notes/{dn_id}/submit-for-review", headers=auth_header(admin_token), json={})
+    assert res.status_code == 200
+    res = client.put(f"{url}/{detail_id}", headers=auth_header(admin_token), json={"amount_usd": "1.00"})
+    assert res.status_code == 400
+    assert "PENDING_REVIEW" in res.json()["detail"]
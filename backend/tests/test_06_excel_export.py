@@ -1,5 +1,6 @@
 """Excel 출력 API 테스트"""
 import io
+import time
 import pytest
 import httpx
 from openpyxl import load_workbook
@@ -91,3 +92,98 @@ def test_download_latest(client: httpx.Client, admin_token: str):
     res = client.get(f"/api/v1/debit-notes/{dn_id}/download", headers=auth_header(admin_token))
     assert res.status_code == 200
     assert "spreadsheetml" in res.headers.get("content-type", "")
+
+
+def _approved_dn(client: httpx.Client, accountant_token: str, admin_token: str, period_from: str) -> int:
+    """테스트용 APPROVED DN (accountant 생성 → admin 승인)"""
+    client.post("/api/v1/shipments", headers=auth_header(accountant_token), json={
+        "client_id": 1,
+        "shipment_type": "IMPORT",
+        "delivery_date": period_from,
+        "invoice_no": f"EXPORT-JOB-INV-{period_from}",
+        "hbl": f"EXPORT-JOB-HBL-{period_from}",
+        "fee_details": [
+            {"fee_item_id": 1, "amount_usd": 400.00},
+            {"fee_item_id": 14, "amount_usd": 50.00},
+        ],
+    })
+    res = client.post("/api/v1/debit-notes", headers=auth_header(accountant_token), json={
+        "client_id": 1,
+        "period_from": period_from,
+        "period_to": period_from[:8] + "28",
+        "exchange_rate": 26446,
+        "sheet_type": "ALL",
+    })
+    assert res.status_code == 201, res.text
+    dn_id = res.json()["debit_note_id"]
+    res = client.post(f"/api/v1/debit-notes/{dn_id}/submit-for-review", headers=auth_header(accountant_token))
+    assert res.status_code == 200
+    res = client.post(f"/api/v1/debit-notes/{dn_id}/approve", headers=auth_header(admin_token))
+    assert res.status_code == 200
+    return dn_id
+
+
+def test_export_job_lifecycle(client: httpx.Client, accountant_token: str, admin_token: str):
+    """비동기 출력 작업: 등록(202) → 상태 폴링 → 다운로드, DN은 EXPORTED"""
+    dn_id = _approved_dn(client, accountant_token, admin_token, "2026-08-01")
+
+    res = client.post(f"/api/v1/debit-notes/{dn_id}/export-jobs", headers=auth_header(admin_token))
+    assert res.status_code == 202
+    job = res.json()
+    assert job["export_status"] in ("PENDING", "GENERATING", "COMPLETED")
+
+    url = f"/api/v1/debit-notes/{dn_id}/export-jobs/{job['export_id']}"
+    deadline = time.monotonic() + 30
+    while job["export_status"] in ("PENDING", "GENERATING") and time.monotonic() < deadline:
+        time.sleep(0.2)
+        job = client.get(url, headers=auth_header(admin_token)).json()
+    assert job["export_status"] == "COMPLETED", job
+    assert job["file_name"].endswith(".xlsx")
+
+    res = client.get(f"{url}/download", headers=auth_header(admin_token))
+    assert res.status_code == 200
+    assert int(res.headers["content-length"]) == job["file_size"]
+    ws = load_workbook(io.BytesIO(res.content)).active
+    assert ws["A12"].value == "DEBIT NOTE"
+
+    dn = client.get(f"/api/v1/debit-notes/{dn_id}", headers=auth_header(admin_token)).json()
+    assert dn["status"] == "EXPORTED"
+
+
+def test_export_job_requires_approved_dn(client: httpx.Client, admin_token: str):
+    list_res = client.get("/api/v1/debit-notes?status=DRAFT", headers=auth_header(admin_token))
+    drafts = list_res.json()["items"]
+    if not drafts:
+        pytest.skip("No DRAFT DN")
+    res = client.post(f"/api/v1/debit-notes/{drafts[0]['debit_note_id']}/export-jobs", headers=auth_header(admin_token))
+    assert res.status_code == 400
+
+
+def test_export_cache_and_etag(client: httpx.Client, accountant_token: str, admin_token: str):
+    """같은 내용의 재출력은 저장된 파일 재사용 (같은 ETag), If-None-Match 일치 시 304"""
+    dn_id = _approved_dn(client, accountant_token, admin_token, "2026-09-01")
+    url = f"/api/v1/debit-notes/{dn_id}/export-excel"
+
+    first = client.post(url, headers=auth_header(admin_token))
+    assert first.status_code == 200
+    assert first.headers["x-export-cache"] == "MISS"
+    etag = first.headers["etag"]
+
+    second = client.post(url, headers=auth_header(admin_token))
+    assert second.status_code == 200
+    assert second.headers["x-export-cache"] == "HIT"
+    assert second.headers["etag"] == etag
+    assert second.content == first.content
+
+    history = client.get(f"/api/v1/debit-notes/{dn_id}/exports", headers=auth_header(admin_token)).json()
+    assert len(history) == 2
+    assert {h["content_hash"] for h in history} == {etag.strip('"')}
+
+    download = f"/api/v1/debit-notes/{dn_id}/download"
+    res = client.get(download, headers={**auth_header(admin_token), "If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["etag"] == etag
+
+    res = client.get(download, headers={**auth_header(admin_token), "If-None-Match": '"stale"'})
+    assert res.status_code == 200
+    assert res.headers["etag"] == etag
@@ -0,0 +1,47 @@
+"""라인 계산 엔진 단위 테스트 (서버 불필요)"""
+from decimal import Decimal
+
+from app.services.line_calculator import FeeRow, calculate_line_totals
+
+RATE = Decimal("26446")
+
+
+def _row(amount, item_code="OCEAN_FREIGHT", is_vat=False, fee_item_id=1, shipment_id=1):
+    return FeeRow(shipment_id, Decimal(str(amount)), fee_item_id, item_code, is_vat)
+
+
+def test_freight_and_local_buckets():
+    calc = calculate_line_totals([
+        _row(500.00),
+        _row(200.00, item_code="CUSTOMS_FEE", is_vat=True, fee_item_id=14),
+    ], RATE)
+    assert calc["freight_usd"] == Decimal("500.00")
+    assert calc["local_charges_usd"] == Decimal("200.00")
+    assert calc["total_usd"] == Decimal("700.00")
+    assert calc["total_vnd"] == 18512200
+    assert calc["vat_amount"] == int(Decimal("200.00") * RATE * Decimal("0.08"))
+    assert calc["grand_total_vnd"] == calc["total_vnd"] + calc["vat_amount"]
+
+
+def test_pay_on_behalf_is_not_vat_applicable():
+    calc = calculate_line_totals([_row(100, item_code="PAY_ON_BEHALF", fee_item_id=18)], RATE)
+    assert calc["pay_on_behalf"] == Decimal("100")
+    assert calc["vat_amount"] == 0
+    assert calc["total_usd"] == Decimal("100")
+
+
+def test_truncating_rounding():
+    # 0.01 * 26446.55 = 264.4655 → 264 (int() 절사)
+    calc = calculate_line_totals([_row("0.01")], Decimal("26446.55"))
+    assert calc["total_vnd"] == 264
+
+
+def test_missing_fee_item_counts_as_local_charge():
+    calc = calculate_line_totals([FeeRow(1, Decimal("10"), None, None, None)], RATE)
+    assert calc["local_charges_usd"] == Decimal("10")
+
+
+def test_no_fee_details():
+    calc = calculate_line_totals([], RATE)
+    assert calc["total_usd"] == 0
+    assert calc["grand_total_vnd"] == 0
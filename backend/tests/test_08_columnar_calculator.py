@@ -0,0 +1,81 @@
+"""컬럼형 계산기 단위 테스트 - line_calculator와 결과 일치 검증 (서버 불필요)"""
+import random
+from decimal import Decimal
+
+import numpy as np
+
+from app.services.columnar_calculator import (
+    BUCKET_FREIGHT, BUCKET_LOCAL, BUCKET_PAY_ON_BEHALF, calculate_columnar,
+)
+from app.services.line_calculator import FeeRow, calculate_line_totals
+
+# fee_item_id → (item_code, is_vat_applicable)
+FEE_ITEMS = {
+    1: ("OCEAN_FREIGHT", False),
+    8: ("THC", True),
+    14: ("CUSTOMS_FEE", True),
+    18: ("PAY_ON_BEHALF", False),
+}
+FEE_BUCKETS = {1: BUCKET_FREIGHT, 8: BUCKET_LOCAL, 14: BUCKET_LOCAL, 18: BUCKET_PAY_ON_BEHALF}
+
+
+def _random_details(seed: int, shipments: int):
+    rng = random.Random(seed)
+    details = []
+    for sid in range(1, shipments + 1):
+        for fee_item_id in rng.sample(list(FEE_ITEMS), rng.randint(0, 4)):
+            cents = rng.randint(-5000, 500000)
+            details.append((sid, fee_item_id, cents))
+    return details
+
+
+def _scalar(details, shipment_ids, rate):
+    rows = {sid: [] for sid in shipment_ids}
+    for sid, fid, cents in details:
+        code, is_vat = FEE_ITEMS[fid]
+        rows[sid].append(FeeRow(sid, Decimal(cents).scaleb(-2), fid, code, is_vat))
+    return {sid: calculate_line_totals(r, rate) for sid, r in rows.items()}
+
+
+def test_matches_scalar_calculator():
+    for seed, rate in [(1, Decimal("26446")), (2, Decimal("26446.55")), (3, Decimal("25399.99"))]:
+        details = _random_details(seed, 300)
+        shipment_ids = list(range(1, 301))
+        expected = _scalar(details, shipment_ids, rate)
+
+        result = calculate_columnar(
+            np.array([d[0] for d in details]),
+            np.array([d[1] for d in details]),
+            np.array([d[2] for d in details]),
+            FEE_BUCKETS,
+            rate,
+            line_shipment_ids=np.array(shipment_ids),
+        )
+        assert result.line_dicts() == expected
+
+        header = result.header_totals
+        assert header["total_usd"] == sum(c["total_usd"] for c in expected.values())
+        assert header["total_vnd"] == sum(c["total_vnd"] for c in expected.values())
+        assert header["total_vat"] == sum(c["vat_amount"] for c in expected.values())
+        assert header["grand_total_vnd"] == sum(c["grand_total_vnd"] for c in expected.values())
+        assert header["total_lines"] == 300
+
+
+def test_unknown_fee_item_is_local_and_empty_lines_are_zero():
+    result = calculate_columnar(
+        np.array([5]), np.array([99]), np.array([1000]), FEE_BUCKETS, Decimal("26446"),
+        line_shipment_ids=np.array([7, 5]),
+    )
+    lines = result.line_dicts()
+    assert lines[5]["local_charges_usd"] == Decimal("10.00")
+    assert lines[7]["total_usd"] == 0
+    assert list(result.shipment_ids) == [7, 5]
+
+
+def test_overflow_falls_back_to_exact_integers():
+    huge = 10 ** 15  # 10조 USD (센트)
+    result = calculate_columnar(
+        np.array([1]), np.array([14]), np.array([huge]), FEE_BUCKETS, Decimal("26446.55"),
+    )
+    expected = calculate_line_totals([FeeRow(1, Decimal(huge).scaleb(-2), 14, "CUSTOMS_FEE", True)], Decimal("26446.55"))
+    assert result.line(0) == expected
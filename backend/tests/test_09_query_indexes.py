@@ -0,0 +1,133 @@
+"""주요 조회 패턴의 인덱스 사용 검증 (EXPLAIN) - PostgreSQL 직접 접속
+
+alembic upgrade head 가 적용된 DB(settings.DATABASE_URL_SYNC)에 1,000,000건의
+선적을 트랜잭션 안에서 생성 → ANALYZE → EXPLAIN 후 ROLLBACK 한다. (데이터 잔존 없음)
+DB에 접속할 수 없으면 skip.
+"""
+import json
+
+import pytest
+
+from app.core.config import settings
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+SEED_ROWS = 1_000_000
+SEED_CLIENTS = 31
+
+
+@pytest.fixture(scope="module")
+def seeded_cursor():
+    if not settings.DATABASE_URL_SYNC.startswith("postgresql"):
+        pytest.skip("PostgreSQL 전용 테스트")
+    try:
+        conn = psycopg2.connect(settings.DATABASE_URL_SYNC, connect_timeout=3)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"DB 접속 불가: {e}")
+
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT count(*) FROM pg_indexes WHERE indexname = 'ix_shipments_active_client_delivery'"
+        )
+        assert cur.fetchone()[0] == 1, "인덱스 마이그레이션 미적용 (alembic upgrade head)"
+
+        # 31개 거래처 x 36개월에 고르게 분포한 선적 (10% CANCELLED, 30% BILLED)
+        cur.execute(
+            """
+            INSERT INTO clients (client_code, client_name, is_active)
+            SELECT 'IDXTEST' || g, 'Index test client ' || g, true
+            FROM generate_series(1, %s) g
+            RETURNING client_id
+            """,
+            (SEED_CLIENTS,),
+        )
+        client_ids = [r[0] for r in cur.fetchall()]
+        cur.execute(
+            """
+            INSERT INTO shipments (client_id, delivery_date, invoice_no, mbl, hbl, cd_no,
+                                   shipment_type, status, is_duplicate, created_at, updated_at)
+            SELECT (%(client_ids)s)[1 + g %% %(clients)s],
+                   DATE '2024-01-01' + (g %% 1095),
+                   'IDX-INV-' || g, 'IDX-MBL-' || (g / 2), 'IDX-HBL-' || g, 'IDX-CD-' || g,
+                   CASE WHEN g %% 4 = 0 THEN 'EXPORT' ELSE 'IMPORT' END,
+                   CASE WHEN g %% 10 = 0 THEN 'CANCELLED' WHEN g %% 10 < 4 THEN 'BILLED' ELSE 'ACTIVE' END,
+                   false, now(), now()
+            FROM generate_series(1, %(rows)s) g
+            """,
+            {"client_ids": client_ids, "clients": SEED_CLIENTS, "rows": SEED_ROWS},
+        )
+        cur.execute(
+            """
+            INSERT INTO shipment_reference_keys (shipment_id, client_id, key_type, key_value)
+            SELECT shipment_id, client_id, k.key_type, k.key_value
+            FROM shipments s
+            CROSS JOIN LATERAL (VALUES ('HBL', s.hbl), ('MBL', s.mbl), ('INV', s.invoice_no), ('CD', s.cd_no))
+                AS k(key_type, key_value)
+            WHERE s.invoice_no LIKE 'IDX-INV-%'
+            """
+        )
+        cur.execute("ANALYZE shipments")
+        cur.execute("ANALYZE shipment_reference_keys")
+        yield cur, client_ids
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _plan_indexes(cur, sql: str, params) -> set[str]:
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    names = set()
+
+    def walk(node):
+        if "Index Name" in node:
+            names.add(node["Index Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return names
+
+
+def test_create_debit_note_uses_active_partial_index(seeded_cursor):
+    cur, client_ids = seeded_cursor
+    names = _plan_indexes(
+        cur,
+        """
+        SELECT * FROM shipments
+        WHERE client_id = %s AND status = 'ACTIVE'
+          AND delivery_date >= %s AND delivery_date <= %s AND shipment_type = %s
+        ORDER BY delivery_date
+        """,
+        (client_ids[0], "2025-03-01", "2025-03-31", "IMPORT"),
+    )
+    assert "ix_shipments_active_client_delivery" in names, names
+
+
+def test_duplicate_detection_uses_reference_key_index(seeded_cursor):
+    cur, client_ids = seeded_cursor
+    names = _plan_indexes(
+        cur,
+        """
+        SELECT k.client_id, k.key_type, k.key_value, k.shipment_id
+        FROM shipment_reference_keys k JOIN shipments s ON s.shipment_id = k.shipment_id
+        WHERE (k.client_id, k.key_type, k.key_value) IN ((%s, 'HBL', 'IDX-HBL-12345'), (%s, 'MBL', 'IDX-MBL-6172'))
+          AND s.status != 'CANCELLED'
+        """,
+        (client_ids[3], client_ids[3]),
+    )
+    assert "ix_shipment_reference_keys_lookup" in names, names
+
+
+def test_shipment_list_sort_uses_delivery_date_index(seeded_cursor):
+    cur, _ = seeded_cursor
+    names = _plan_indexes(
+        cur,
+        "SELECT * FROM shipments ORDER BY delivery_date DESC LIMIT 50 OFFSET 0",
+        (),
+    )
+    assert "ix_shipments_delivery_date" in names, names
@@ -0,0 +1,128 @@
+"""Excel 생성 모드 단위 테스트 - 일반 / write_only 결과 동일성 (서버 불필요, SQLite - conftest.sqlite_db)"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.excel_generator as excel_generator
+from app.models.client import Client
+from app.models.debit_note import DebitNote, DebitNoteLine
+from app.models.fee import FeeCategory, FeeItem
+from app.models.shipment import Shipment, ShipmentFeeDetail
+from app.services.reference_data import ReferenceDataCache
+
+TABLES = (
+    "fee_categories", "fee_items", "clients", "client_templates", "client_fee_mappings", "shipments",
+    "shipment_fee_details", "debit_notes", "debit_note_lines", "reference_data_versions",
+)
+
+
+async def _seed(db: AsyncSession):
+    category = FeeCategory(category_code="FREIGHT", category_name="Freight", sort_order=1)
+    client = Client(client_code="NEXCON", client_name="NEXCON VINA", address="HCM")
+    db.add_all([category, client])
+    await db.flush()
+    db.add_all([
+        FeeItem(fee_item_id=1, category_id=category.category_id, item_code="OCEAN", item_name="Ocean freight",
+                is_vat_applicable=False),
+        FeeItem(fee_item_id=8, category_id=category.category_id, item_code="THC", item_name="THC",
+                is_vat_applicable=True),
+        FeeItem(fee_item_id=14, category_id=category.category_id, item_code="CUSTOMS", item_name="Customs fee",
+                is_vat_applicable=True),
+    ])
+    dn = DebitNote(client_id=client.client_id, debit_note_number="DN-1", period_from=date(2026, 3, 1),
+                   period_to=date(2026, 3, 31), billing_date=date(2026, 4, 1), exchange_rate=26446,
+                   sheet_type="ALL", status="APPROVED")
+    db.add(dn)
+    await db.flush()
+
+    for shipment_type, count in (("IMPORT", 6), ("EXPORT", 3)):
+        for i in range(count):
+            ship = Shipment(
+                client_id=client.client_id, shipment_type=shipment_type, delivery_date=date(2026, 3, 1 + i),
+                invoice_no=f"INV-{i}", mbl=f"MBL-{i // 2}", hbl=f"HBL-{i}", term="FOB",
+                no_of_pkgs=i + 1, gross_weight=Decimal("10.5"), cd_no=f"CD-{i}", cd_type="A12",
+                origin_destination="HCM", back_to_back_invoice="BB-1" if i == 0 else None, status="BILLED",
+            )
+            db.add(ship)
+            await db.flush()
+            db.add(ShipmentFeeDetail(shipment_id=ship.shipment_id, fee_item_id=1, amount_usd=Decimal("100") + i))
+            if i % 2:
+                db.add(ShipmentFeeDetail(shipment_id=ship.shipment_id, fee_item_id=14, amount_usd=Decimal("25.50")))
+            db.add(DebitNoteLine(debit_note_id=dn.debit_note_id, shipment_id=ship.shipment_id, line_no=i + 1,
+                                 pay_on_behalf=Decimal("5") if i == 2 else Decimal("0")))
+    await db.commit()
+
+
+@pytest.fixture
+def rendered(sqlite_db, tmp_path, monkeypatch):
+    """같은 DN 을 일반 / write_only 모드로 생성 → (normal, stream) Workbook"""
+    monkeypatch.setattr(excel_generator, "reference_cache", ReferenceDataCache())
+    monkeypatch.setattr(excel_generator, "STREAM_YIELD_PER", 2)  # 라인이 배치 경계에 걸쳐도 묶임
+
+    async def render(db: AsyncSession):
+        buffer, _ = await excel_generator.generate_debit_note_excel(1, db)
+        path, _ = await excel_generator.write_debit_note_excel(1, db, str(tmp_path))
+        # 라인/선적은 스트리밍 - ORM 객체로 세션에 올리지 않음
+        loaded = {type(obj) for obj in db.identity_map.values()}
+        assert not loaded & {DebitNoteLine, Shipment, ShipmentFeeDetail}
+        return buffer, path
+
+    buffer, path = sqlite_db.run(render, seed=_seed)
+    return load_workbook(buffer), load_workbook(path)
+
+
+def _snapshot(ws):
+    cells = {
+        c.coordinate: (c.value, c.font.b, c.font.sz, c.number_format, c.fill.fill_type,
+                       c.alignment.horizontal, c.border.left.style if c.border.left else None)
+        for row in ws.iter_rows() for c in row if c.value is not None or c.has_style
+    }
+    return {
+        "cells": cells,
+        "merged": sorted(str(r) for r in ws.merged_cells.ranges),
+        "hidden_rows": sorted(k for k, d in ws.row_dimensions.items() if d.hidden),
+        "hidden_cols": sorted(k for k, d in ws.column_dimensions.items() if d.hidden),
+        "freeze": ws.freeze_panes,
+    }
+
+
+def test_write_only_matches_normal_workbook(rendered):
+    normal, stream = rendered
+    assert normal.sheetnames == stream.sheetnames == ["IMPORT NEX 032026", "EXPORT NEX 032026"]
+    for name in normal.sheetnames:
+        assert _snapshot(normal[name]) == _snapshot(stream[name])
+
+
+def test_import_sheet_layout_and_formulas(rendered):
+    ws = rendered[1]["IMPORT NEX 032026"]
+    assert ws["A1"].value == "UNI CONSULTING CO.LTD"
+    assert ws["A12"].value == "DEBIT NOTE"
+    assert "A12:BF12" in {str(r) for r in ws.merged_cells.ranges}
+    assert ws.row_dimensions[13].hidden is True
+    assert ws["BE13"].value == 26446.0
+    assert ws.freeze_panes == "A16"
+
+    # 비용 컬럼: VAT 0% 먼저 (M), 그 다음 VAT 8% (N)
+    assert ws["M14"].value == "Ocean freight"
+    assert ws["N14"].value == "Customs fee"
+    assert ws["M16"].value == 100
+    assert ws.column_dimensions["O"].hidden is True
+
+    assert ws["BC16"].value == "=SUM(M16:AT16)"
+    assert ws["BD16"].value == "=BC16*$BE$13"
+    assert ws["BE16"].value == "=SUM(Z16:AT16)*$BE$13*8%"
+    assert ws["BF16"].value == "=BD16+BE16"
+    assert ws["BA18"].value == 5
+
+    # 합계 행 + 중복 MBL 강조
+    assert ws["A22"].value == "TOTAL"
+    assert ws["BC22"].value == "=SUM(BC16:BC21)"
+    assert ws["D16"].fill.fill_type == "solid"
+    assert ws["E16"].fill.fill_type is None
+
+    # 값이 없는 사용 컬럼도 테두리 (N16: 첫 행에는 Customs fee 없음)
+    assert ws["N16"].value is None
+    assert ws["N16"].border.left.style == "thin"
@@ -0,0 +1,129 @@
+"""인증 사용자 캐시 단위 테스트 (서버 불필요)"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.core.principal_cache import Principal, PrincipalCache, PrincipalRole, principal_cache
+from app.models.user import Permission, Role, RolePermission, User
+
+ADMIN = Principal(1, "admin", "admin@example.com", "Admin", True, PrincipalRole(1, "admin"))
+
+
+def _loader(result, calls):
+    async def load():
+        calls.append(1)
+        return result
+    return load
+
+
+def test_cache_hit_skips_loader():
+    cache = PrincipalCache(ttl_seconds=30)
+    calls = []
+    for _ in range(3):
+        assert asyncio.run(cache.get_or_load(1, "token-a", _loader(ADMIN, calls))) == ADMIN
+    assert len(calls) == 1
+
+    # 토큰이 다르면 별도 항목
+    asyncio.run(cache.get_or_load(1, "token-b", _loader(ADMIN, calls)))
+    assert len(calls) == 2
+
+
+def test_inactive_or_missing_user_not_cached():
+    cache = PrincipalCache(ttl_seconds=30)
+    calls = []
+    inactive = Principal(2, "pic", "pic@example.com", "PIC", False, PrincipalRole(3, "pic"))
+    for result in (None, None, inactive, inactive):
+        asyncio.run(cache.get_or_load(2, "token", _loader(result, calls)))
+    assert len(calls) == 4
+
+
+def test_ttl_zero_disables_cache():
+    cache = PrincipalCache(ttl_seconds=0)
+    calls = []
+    for _ in range(2):
+        asyncio.run(cache.get_or_load(1, "token", _loader(ADMIN, calls)))
+    assert len(calls) == 2
+
+
+def test_invalidate_during_load_is_not_cached():
+    cache = PrincipalCache(ttl_seconds=30)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        cache.invalidate()  # DB 조회 중 다른 요청이 사용자 변경 커밋
+        return ADMIN
+
+    asyncio.run(cache.get_or_load(1, "token", load))
+    asyncio.run(cache.get_or_load(1, "token", load))
+    assert len(calls) == 2
+
+
+def test_invalidate_on_event_loop_does_not_wait_for_redis(caplog):
+    """커밋 훅(이벤트 루프 위)에서는 Redis 버전 증가를 예약만 하고, 실패는 로그로 남김"""
+    cache = PrincipalCache(ttl_seconds=30, redis_url="redis://127.0.0.1:1/0")
+
+    async def main():
+        cache.invalidate()
+        pending = list(cache._pending)
+        await asyncio.gather(*pending)
+        return pending
+
+    assert len(asyncio.run(main())) == 1
+    assert not cache._pending
+    assert "Redis version bump failed" in caplog.text
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    tables = [Base.metadata.tables[name] for name in ("roles", "users", "permissions", "role_permissions")]
+    Base.metadata.create_all(engine, tables=tables)
+    with Session(engine) as s:
+        role = Role(role_name="admin")
+        s.add(role)
+        s.flush()
+        s.add(User(username="admin", email="admin@example.com", hashed_password="x",
+                   full_name="Admin", role_id=role.role_id))
+        s.commit()
+        yield s
+    engine.dispose()
+
+
+def _generation_after(session: Session, change) -> int:
+    before = principal_cache.generation
+    change(session.query(User).one())
+    session.commit()
+    return principal_cache.generation - before
+
+
+def test_user_change_invalidates_on_commit(session):
+    assert _generation_after(session, lambda u: setattr(u, "is_active", False)) == 1
+    assert _generation_after(session, lambda u: setattr(u, "full_name", "Administrator")) == 1
+
+
+def test_last_login_does_not_invalidate(session):
+    assert _generation_after(session, lambda u: setattr(u, "last_login", datetime.utcnow())) == 0
+
+
+def test_role_permission_change_invalidates(session):
+    before = principal_cache.generation
+    permission = Permission(permission_name="debit_note.read", resource="debit_note", action="read")
+    session.add(permission)
+    session.flush()
+    session.add(RolePermission(role_id=session.query(Role).one().role_id, permission_id=permission.permission_id))
+    session.commit()
+    assert principal_cache.generation == before + 1
+
+
+def test_rollback_discards_pending_invalidation(session):
+    before = principal_cache.generation
+    session.query(User).one().is_active = False
+    session.flush()
+    session.rollback()
+    session.commit()
+    assert principal_cache.generation == before
@@ -0,0 +1,99 @@
+"""권한 비트마스크 단위 테스트 (서버 불필요, SQLite - conftest.sqlite_db)"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.core.permissions as permissions
+from app.core.permissions import PermissionRegistry, check_permission, permission_registry
+from app.core.principal_cache import Principal, PrincipalRole
+from app.models.user import Permission, Role, RolePermission
+
+TABLES = ("roles", "users", "permissions", "role_permissions")
+
+
+async def _seed(db: AsyncSession):
+    admin, pic, retired = Role(role_name="admin"), Role(role_name="pic"), Role(role_name="retired", is_active=False)
+    perms = [
+        Permission(permission_name=f"debit_note:{action}", resource="debit_note", action=action)
+        for action in ("read", "approve", "export")
+    ]
+    db.add_all([admin, pic, retired, *perms])
+    await db.flush()
+    db.add_all(
+        [RolePermission(role_id=admin.role_id, permission_id=p.permission_id) for p in perms]
+        + [RolePermission(role_id=pic.role_id, permission_id=perms[0].permission_id)]
+        + [RolePermission(role_id=retired.role_id, permission_id=p.permission_id) for p in perms]
+    )
+    await db.commit()
+
+
+def test_role_masks(sqlite_db):
+    async def check(db):
+        registry = PermissionRegistry(refresh_seconds=300)
+        await registry.load(db)
+        assert not registry.needs_reload()
+        return registry
+
+    registry = sqlite_db.run(check, seed=_seed)
+    admin, pic, retired = 1, 2, 3
+    assert registry.has_permission(admin, "debit_note:approve")
+    assert registry.has_permission(pic, "debit_note:read")
+    assert not registry.has_permission(pic, "debit_note:approve")
+    assert not registry.has_permission(retired, "debit_note:read")  # 비활성 역할
+    assert not registry.has_permission(admin, "unknown:permission")
+    assert not registry.has_permission(99, "debit_note:read")
+    assert registry.permissions_of(pic) == ["debit_note:read"]
+
+
+def test_refresh_interval():
+    registry = PermissionRegistry(refresh_seconds=0)
+    assert registry.needs_reload()
+    registry.stale = False
+    assert registry.needs_reload()  # 주기 0 → 항상 재계산
+
+
+def test_empty_registry_reloads(sqlite_db):
+    """seed 전 빈 DB 에서 로드한 레지스트리는 주기와 관계없이 다음 확인 때 다시 로드"""
+    async def check(db):
+        registry = PermissionRegistry(refresh_seconds=300)
+        await registry.load(db)
+        assert registry.needs_reload()
+        await _seed(db)
+        await registry.load(db)
+        return registry
+
+    registry = sqlite_db.run(check)
+    assert not registry.needs_reload()
+    assert registry.has_permission(1, "debit_note:approve")
+
+
+@pytest.mark.parametrize("commit", [True, False])
+def test_mapping_change_marks_registry_stale(sqlite_db, commit):
+    async def change(db):
+        permission_registry.stale = False
+        db.add(RolePermission(role_id=2, permission_id=2))
+        await db.flush()
+        if commit:
+            await db.commit()
+        else:
+            await db.rollback()
+        return permission_registry.stale
+
+    assert sqlite_db.run(change, seed=_seed) is commit
+
+
+def test_check_permission_loads_registry_and_denies(sqlite_db, monkeypatch):
+    """의존성 밖에서 직접 호출하는 권한 확인 - 필요 시 레지스트리 로드, 권한 없으면 403"""
+    monkeypatch.setattr(permissions, "permission_registry", PermissionRegistry(refresh_seconds=300))
+    pic = Principal(user_id=1, username="pic", email="pic@example.com", full_name="PIC", is_active=True,
+                    role=PrincipalRole(role_id=2, role_name="pic"))
+
+    async def check(db):
+        await check_permission(db, pic, "debit_note:read")
+        with pytest.raises(HTTPException) as denied:
+            await check_permission(db, pic, "debit_note:approve")
+        return denied.value
+
+    denied = sqlite_db.run(check, seed=_seed)
+    assert denied.status_code == 403
+    assert denied.detail == "Access denied. Required permission: debit_note:approve"
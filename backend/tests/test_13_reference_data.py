@@ -0,0 +1,122 @@
+"""기준 데이터 캐시 단위 테스트 (서버 불필요, SQLite - conftest.sqlite_db)"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit import ReferenceDataVersion
+from app.models.client import Client, ClientFeeMapping, ClientTemplate
+from app.models.fee import FeeCategory, FeeItem
+from app.services.reference_data import ReferenceDataCache, bump_versions, reference_cache
+
+TABLES = (
+    "fee_categories", "fee_items", "clients", "client_templates", "client_fee_mappings",
+    "exchange_rates", "client_exchange_rates", "reference_data_versions",
+)
+
+
+async def _seed(db: AsyncSession):
+    freight = FeeCategory(category_code="FREIGHT", category_name="Freight", sort_order=1)
+    retired = FeeCategory(category_code="OLD", category_name="Old", sort_order=2, is_active=False)
+    client = Client(client_code="NEXCON", client_name="NEXCON VINA")
+    db.add_all([freight, retired, client])
+    await db.flush()
+    ocean = FeeItem(category_id=freight.category_id, item_code="OCEAN_FREIGHT", item_name="Ocean", sort_order=2)
+    air = FeeItem(category_id=freight.category_id, item_code="AIR_FREIGHT", item_name="Air", sort_order=1)
+    legacy = FeeItem(category_id=freight.category_id, item_code="LEGACY", item_name="Legacy", sort_order=3,
+                     is_active=False)
+    db.add_all([ocean, air, legacy])
+    await db.flush()
+    db.add_all([
+        ClientTemplate(client_id=client.client_id, template_name="IMPORT", sheet_type="IMPORT"),
+        ClientTemplate(client_id=client.client_id, template_name="OLD", sheet_type="IMPORT", is_active=False),
+        ClientFeeMapping(client_id=client.client_id, fee_item_id=ocean.fee_item_id, column_letter="N",
+                         sheet_type="IMPORT", sort_order=2),
+        ClientFeeMapping(client_id=client.client_id, fee_item_id=air.fee_item_id, column_letter="M",
+                         sheet_type="IMPORT", sort_order=1),
+    ])
+    await db.commit()
+
+
+def test_snapshots_and_filters(sqlite_db):
+    async def check(db):
+        cache = ReferenceDataCache()
+        fee_items = await cache.fee_items(db)
+        categories = await cache.fee_categories(db)
+        templates = await cache.client_templates(db, 1)
+        mappings = await cache.client_fee_mappings(db, 1)
+        queries = len(sqlite_db.statements)
+
+        # 두 번째 조회부터는 DB 접근 없음
+        await cache.fee_items(db)
+        await cache.client_fee_mappings(db, 1)
+        return fee_items, categories, templates, mappings, queries, len(sqlite_db.statements)
+
+    fee_items, categories, templates, mappings, queries, after = sqlite_db.run(check, seed=_seed)
+    assert [fi.item_code for fi in fee_items] == ["AIR_FREIGHT", "OCEAN_FREIGHT"]  # 활성, sort_order 순
+    assert [c.category_code for c in categories] == ["FREIGHT"]
+    assert len(categories[0].fee_items) == 3
+    assert [t.template_name for t in templates] == ["IMPORT"]
+    assert [(m.column_letter, m.fee_item.item_code) for m in mappings] == [("M", "AIR_FREIGHT"), ("N", "OCEAN_FREIGHT")]
+    assert after == queries
+
+
+def test_write_bumps_version_and_reloads(sqlite_db):
+    async def check(db):
+        versions = await reference_cache.versions(db, max_age=0)
+        item = await db.get(FeeItem, 1)
+        item.item_name = "Ocean freight"
+        await db.commit()
+        new_versions = await reference_cache.versions(db)
+        names = [fi.item_name for fi in await reference_cache.fee_items(db)]
+        return versions, new_versions, names
+
+    versions, new_versions, names = sqlite_db.run(check, seed=_seed)
+    assert new_versions["fee_items"] == versions["fee_items"] + 1
+    assert new_versions["client_templates"] == versions["client_templates"]
+    assert "Ocean freight" in names
+
+
+def test_other_process_change_detected_on_version_check(sqlite_db):
+    async def check(db):
+        cache = ReferenceDataCache()
+        before = [fi.item_name for fi in await cache.fee_items(db)]
+        # 다른 프로세스의 변경: 이 캐시에는 invalidate 가 오지 않음
+        await db.run_sync(lambda s: bump_versions(s.connection(), ["fee_items"]))
+        await db.execute(FeeItem.__table__.update().where(FeeItem.fee_item_id == 2).values(item_name="Air cargo"))
+        await db.commit()
+        stale = [fi.item_name for fi in await cache.fee_items(db)]
+        fresh = [fi.item_name for fi in (await cache.versions(db, max_age=0), await cache.fee_items(db))[1]]
+        return before, stale, fresh
+
+    before, stale, fresh = sqlite_db.run(check, seed=_seed)
+    assert stale == before  # 확인 주기 전에는 캐시 사용
+    assert fresh == ["Air cargo", "Ocean"]
+
+
+def test_rollback_does_not_bump(sqlite_db):
+    async def check(db):
+        versions = await reference_cache.versions(db, max_age=0)
+        (await db.get(FeeItem, 1)).item_name = "Rolled back"
+        await db.flush()
+        await db.rollback()
+        return versions, await reference_cache.versions(db, max_age=0)
+
+    versions, after = sqlite_db.run(check, seed=_seed)
+    assert after == versions
+
+
+def test_bump_versions_upserts_missing_rows(sqlite_db):
+    """버전 행이 없으면 version=1 로 생성, 있으면 +1 - 한 문장(INSERT ... ON CONFLICT)으로 처리"""
+    async def check(db):
+        await db.execute(ReferenceDataVersion.__table__.delete())
+        sqlite_db.statements.clear()
+        await db.run_sync(lambda s: bump_versions(s.connection(), ["fee_items", "exchange_rates"]))
+        statements = list(sqlite_db.statements)
+        await db.run_sync(lambda s: bump_versions(s.connection(), ["fee_items"]))
+        await db.commit()
+        return statements, dict((await db.execute(
+            select(ReferenceDataVersion.table_name, ReferenceDataVersion.version)
+        )).all())
+
+    statements, versions = sqlite_db.run(check, seed=_seed)
+    assert len(statements) == 1 and "ON CONFLICT" in statements[0]
+    assert versions == {"exchange_rates": 1, "fee_items": 2}
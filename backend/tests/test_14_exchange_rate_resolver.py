@@ -0,0 +1,66 @@
+"""환율 구간 인덱스 단위 테스트 (서버 불필요)"""
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.services.exchange_rate_resolver import ExchangeRateIndex
+
+
+def _general(rate_id, rate, rate_date, is_active=True, currency_to="VND"):
+    return SimpleNamespace(rate_id=rate_id, currency_from="USD", currency_to=currency_to, rate=Decimal(rate),
+                           rate_date=rate_date, is_active=is_active)
+
+
+def _client(client_rate_id, client_id, rate, effective_from, effective_to=None):
+    return SimpleNamespace(client_rate_id=client_rate_id, client_id=client_id, currency_from="USD",
+                           currency_to="VND", rate=Decimal(rate), effective_from=effective_from,
+                           effective_to=effective_to)
+
+
+INDEX = ExchangeRateIndex(
+    [
+        _general(1, "25000", date(2026, 1, 1)),
+        _general(2, "25500", date(2026, 2, 1)),
+        _general(3, "25600", date(2026, 2, 1)),  # 같은 날짜 - 나중 등록 우선
+        _general(4, "99999", date(2026, 3, 1), is_active=False),
+        _general(5, "1", date(2026, 1, 1), currency_to="KRW"),
+    ],
+    [
+        _client(1, 7, "26000", date(2026, 1, 1)),  # 무기한
+        _client(2, 7, "26100", date(2026, 2, 1), date(2026, 2, 28)),  # 겹침 - 늦은 시작 우선
+        _client(3, 8, "27000", date(2026, 1, 10), date(2026, 1, 20)),
+    ],
+)
+
+
+def _rate(client_id, on_date, **kwargs):
+    resolved = INDEX.resolve(client_id, on_date, **kwargs)
+    return (resolved.source, resolved.rate) if resolved else None
+
+
+def test_general_rate_is_latest_on_or_before_date():
+    assert _rate(None, date(2025, 12, 31)) is None
+    assert _rate(None, date(2026, 1, 15)) == ("GENERAL", Decimal("25000"))
+    assert _rate(None, date(2026, 2, 1)) == ("GENERAL", Decimal("25600"))
+    assert _rate(None, date(2026, 3, 15)) == ("GENERAL", Decimal("25600"))  # 비활성 제외
+    assert _rate(None, date(2026, 1, 15), currency_to="KRW") == ("GENERAL", Decimal("1"))
+    assert _rate(None, date(2026, 1, 15), currency_to="EUR") is None
+
+
+def test_client_interval_precedence():
+    assert _rate(7, date(2026, 1, 15)) == ("CLIENT", Decimal("26000"))
+    assert _rate(7, date(2026, 2, 28)) == ("CLIENT", Decimal("26100"))
+    assert _rate(7, date(2026, 3, 1)) == ("CLIENT", Decimal("26000"))  # 겹친 구간 종료 후 원래 구간
+    assert _rate(7, date(2025, 12, 31)) is None
+
+
+def test_client_falls_back_to_general_outside_interval():
+    assert _rate(8, date(2026, 1, 10)) == ("CLIENT", Decimal("27000"))
+    assert _rate(8, date(2026, 1, 20)) == ("CLIENT", Decimal("27000"))
+    assert _rate(8, date(2026, 1, 21)) == ("GENERAL", Decimal("25000"))
+    assert _rate(99, date(2026, 2, 2)) == ("GENERAL", Decimal("25600"))
+
+
+def test_latest():
+    assert INDEX.latest().rate_id == 3
+    assert INDEX.latest(currency_to="EUR") is None
@@ -0,0 +1,60 @@
+"""DB 커넥션 풀 설정 / 지표 테스트"""
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import InstrumentedQueuePool, engine_options
+from tests.conftest import auth_header
+
+
+def test_engine_options_postgres():
+    options = engine_options("postgresql+asyncpg://u:p@db/x")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["echo"] is False
+    assert options["pool_pre_ping"] is True
+    assert set(options["connect_args"]) == {"statement_cache_size", "prepared_statement_cache_size"}
+    assert "connect_args" not in engine_options("postgresql+psycopg2://u:p@db/x")
+
+
+def test_engine_options_sqlite_keeps_driver_pool():
+    assert set(engine_options("sqlite+aiosqlite:///x.db")) == {"echo"}
+
+
+def test_pool_records_checkouts_and_timeouts(tmp_path):
+    async def main():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1,
+        )
+        try:
+            async with engine.connect() as held:
+                await held.execute(text("SELECT 1"))
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return engine.sync_engine.pool.stats
+        finally:
+            await engine.dispose()
+
+    stats = asyncio.run(main())
+    assert stats.checkouts == 2
+    assert stats.timeouts == 1
+    assert stats.peak_checked_out == 1
+
+
+def test_db_pool_metrics(client: httpx.Client, admin_token: str):
+    res = client.get("/api/v1/metrics/db-pool", headers=auth_header(admin_token))
+    assert res.status_code == 200
+    data = res.json()
+    assert data["pool_class"]
+    assert "status" in data
+
+
+def test_db_pool_metrics_admin_only(client: httpx.Client, pic_token: str):
+    res = client.get("/api/v1/metrics/db-pool", headers=auth_header(pic_token))
+    assert res.status_code == 403
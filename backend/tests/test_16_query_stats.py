@@ -0,0 +1,55 @@
+"""요청별 쿼리 집계 / N+1 감지 테스트"""
+import asyncio
+
+import httpx
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.query_stats import fingerprint, track_queries
+from tests.conftest import assert_query_budget, auth_header
+
+
+def test_fingerprint_normalizes_parameters_and_literals():
+    a = fingerprint("SELECT * FROM shipments WHERE shipment_id = $1 AND status = 'ACTIVE'")
+    b = fingerprint("SELECT *\n  FROM shipments WHERE shipment_id = $2 AND status = 'BILLED'")
+    assert a == b == "SELECT * FROM shipments WHERE shipment_id = ? AND status = ?"
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (?, ?, ?) LIMIT 10") == "SELECT ? FROM t WHERE id IN (?) LIMIT ?"
+    assert fingerprint("SELECT x::text, :name FROM t_1") == "SELECT x::text, ? FROM t_1"
+
+
+def test_track_queries_detects_repeated_statements():
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            with track_queries() as stats:
+                async with engine.connect() as conn:
+                    for i in range(6):
+                        await conn.execute(select(text("1")).where(text("1 = :i")), {"i": i})
+                    await conn.execute(text("SELECT 2"))
+            return stats
+        finally:
+            await engine.dispose()
+
+    stats = asyncio.run(main())
+    assert stats.count == 7
+    assert stats.db_seconds > 0
+    [(statement, count)] = stats.repeated(threshold=5)
+    assert count == 6
+    assert stats.repeated(threshold=7) == []
+
+
+def test_query_stats_headers(client: httpx.Client, admin_token: str):
+    res = client.get("/api/v1/fee-items", headers=auth_header(admin_token))
+    assert res.status_code == 200
+    assert int(res.headers["x-db-query-count"]) >= 0
+    assert float(res.headers["x-db-time-ms"]) >= 0
+    assert res.headers["x-db-repeated-queries"] == "0"
+
+
+def test_debit_note_list_query_budget(client: httpx.Client, admin_token: str):
+    """목록 조회는 페이지 크기와 무관하게 쿼리 수 일정"""
+    for view in ("summary", "full"):
+        res = client.get(f"/api/v1/debit-notes?view={view}&limit=50", headers=auth_header(admin_token))
+        assert res.status_code == 200
+        assert_query_budget(res, 6)
+        assert res.headers["x-db-repeated-queries"] == "0"
@@ -0,0 +1,51 @@
+"""Prometheus 지표 테스트"""
+import os
+
+import httpx
+import pytest
+
+from app.core.metrics import Counter, Histogram, render_metrics
+from tests.conftest import auth_header
+
+
+def test_histogram_render_is_cumulative():
+    histogram = Histogram("test_latency_seconds", "test", ("route",), buckets=(0.1, 1.0), register=False)
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, route='/a"b')
+    lines = histogram.render()
+    assert lines[:2] == ["# HELP test_latency_seconds test", "# TYPE test_latency_seconds histogram"]
+    assert lines[2:] == [
+        'test_latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'test_latency_seconds_bucket{route="/a\\"b",le="1.0"} 3',
+        'test_latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'test_latency_seconds_sum{route="/a\\"b"} 4.25',
+        'test_latency_seconds_count{route="/a\\"b"} 4',
+    ]
+
+
+def test_counter_render():
+    counter = Counter("test_requests_total", "test", ("result",), register=False)
+    counter.inc(result="hit")
+    counter.inc(2, result="hit")
+    counter.inc(result="miss")
+    assert counter.render()[2:] == ['test_requests_total{result="hit"} 3', 'test_requests_total{result="miss"} 1']
+    assert "test_requests_total" not in render_metrics()  # 등록하지 않은 지표는 출력 제외
+
+
+def test_metrics_endpoint(client: httpx.Client, admin_token: str):
+    for _ in range(2):
+        assert client.get("/api/v1/debit-notes/1", headers=auth_header(admin_token)).status_code in (200, 404)
+    res = client.get("/metrics")
+    if res.status_code == 404:
+        pytest.skip("/metrics disabled (METRICS_ENABLED + METRICS_TOKEN)")
+    assert res.status_code == 401  # 토큰 필수
+
+    res = client.get("/metrics", headers=auth_header(os.environ.get("METRICS_TOKEN", "")))
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    body = res.text
+    # 경로 템플릿 라벨 (ID 별로 늘어나지 않음)
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/debit-notes/{debit_note_id}"' in body
+    assert 'http_request_db_queries_bucket{method="GET",route="/api/v1/debit-notes/{debit_note_id}",le="+Inf"}' in body
+    assert 'cache_requests_total{cache="principal",result="hit"}' in body
+    assert "# TYPE debit_note_create_seconds histogram" in body
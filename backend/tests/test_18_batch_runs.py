@@ -0,0 +1,106 @@
+"""월말 일괄 DN 생성 API 테스트 (POST/GET /api/v1/batch-runs)"""
+import time
+import uuid
+import httpx
+from tests.conftest import auth_header
+
+MONTH = "2027-08"
+
+
+def _create_client(client: httpx.Client, token: str, batch: str) -> int:
+    code = f"BR-{uuid.uuid4().hex[:8].upper()}"
+    res = client.post("/api/v1/clients", headers=auth_header(token), json={
+        "client_code": code, "client_name": f"Batch run {code}", "batch": batch,
+    })
+    assert res.status_code in (200, 201), res.text
+    return res.json()["client_id"]
+
+
+def _add_shipments(client: httpx.Client, token: str, client_id: int, count: int):
+    res = client.post("/api/v1/shipments/bulk", headers=auth_header(token), json={"items": [
+        {
+            "client_id": client_id,
+            "shipment_type": "IMPORT",
+            "delivery_date": f"{MONTH}-{i + 1:02d}",
+            "invoice_no": f"BR-INV-{client_id}-{i}",
+            "hbl": f"BR-HBL-{client_id}-{i}",
+            "fee_details": [{"fee_item_id": 1, "amount_usd": 100 + i}],
+        }
+        for i in range(count)
+    ]})
+    assert res.status_code == 200, res.text
+
+
+def _wait_run(client: httpx.Client, token: str, run: dict) -> dict:
+    deadline = time.monotonic() + 30
+    while run["status"] in ("PENDING", "RUNNING") and time.monotonic() < deadline:
+        time.sleep(0.2)
+        run = client.get(f"/api/v1/batch-runs/{run['run_id']}", headers=auth_header(token)).json()
+    return run
+
+
+def test_batch_run_by_client_batch(client: httpx.Client, accountant_token: str):
+    """Client.batch 그룹 일괄 생성: 거래 있는 거래처 CREATED, 없는 거래처 SKIPPED, 재실행은 전부 SKIPPED"""
+    batch = f"BR {uuid.uuid4().hex[:6]}"
+    with_shipments = [_create_client(client, accountant_token, batch) for _ in range(2)]
+    without_shipments = _create_client(client, accountant_token, batch)
+    for n, client_id in enumerate(with_shipments, 2):
+        _add_shipments(client, accountant_token, client_id, n)
+
+    body = {"period_from": f"{MONTH}-01", "period_to": f"{MONTH}-28", "client_batch": batch,
+            "exchange_rate": 26446}
+    res = client.post("/api/v1/batch-runs", headers=auth_header(accountant_token), json=body)
+    assert res.status_code == 202, res.text
+    run = res.json()
+    assert run["total_clients"] == 3
+    assert len(run["items"]) == 3
+
+    run = _wait_run(client, accountant_token, run)
+    assert run["status"] == "COMPLETED", run
+    assert (run["processed_clients"], run["created_count"], run["skipped_count"], run["failed_count"]) == (3, 2, 1, 0)
+    assert run["started_at"] and run["finished_at"]
+
+    items = {item["client_id"]: item for item in run["items"]}
+    assert items[without_shipments]["status"] == "SKIPPED"
+    assert items[without_shipments]["debit_note_id"] is None
+    for n, client_id in enumerate(with_shipments, 2):
+        item = items[client_id]
+        assert item["status"] == "CREATED", item
+        assert item["total_lines"] == n
+        dn = client.get(f"/api/v1/debit-notes/{item['debit_note_id']}",
+                        headers=auth_header(accountant_token)).json()
+        assert dn["client_id"] == client_id
+        assert dn["status"] == "DRAFT"
+        assert dn["total_lines"] == n
+
+    # 선적은 이미 BILLED - 같은 기간 재실행은 DN 을 만들지 않음
+    res = client.post("/api/v1/batch-runs", headers=auth_header(accountant_token), json=body)
+    assert res.status_code == 202, res.text
+    rerun = _wait_run(client, accountant_token, res.json())
+    assert rerun["status"] == "COMPLETED", rerun
+    assert (rerun["created_count"], rerun["skipped_count"]) == (0, 3)
+
+    res = client.get("/api/v1/batch-runs", headers=auth_header(accountant_token), params={"limit": 5})
+    assert res.status_code == 200
+    listed = [r["run_id"] for r in res.json()["items"]]
+    assert listed[:2] == [rerun["run_id"], run["run_id"]]
+    assert "items" not in res.json()["items"][0]
+
+
+def test_batch_run_validation(client: httpx.Client, accountant_token: str, pic_token: str):
+    body = {"period_from": f"{MONTH}-01", "period_to": f"{MONTH}-28", "client_batch": "BR no such batch"}
+    res = client.post("/api/v1/batch-runs", headers=auth_header(accountant_token), json=body)
+    assert res.status_code == 400
+
+    body["period_from"] = f"{MONTH}-28"
+    body["period_to"] = f"{MONTH}-01"
+    res = client.post("/api/v1/batch-runs", headers=auth_header(accountant_token), json=body)
+    assert res.status_code == 400
+
+    res = client.post("/api/v1/batch-runs", headers=auth_header(pic_token), json={
+        "period_from": f"{MONTH}-01", "period_to": f"{MONTH}-28",
+    })
+    assert res.status_code == 403
+
+    res = client.get("/api/v1/batch-runs/999999", headers=auth_header(accountant_token))
+    assert res.status_code == 404
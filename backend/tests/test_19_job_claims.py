@@ -0,0 +1,106 @@
+"""비동기 작업 선점 단위 테스트 (서버 불필요, SQLite - conftest.sqlite_db) - worker 중단 후 재전달"""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.audit import DebitNoteExport
+from app.models.client import Client
+from app.models.debit_note import DebitNoteBatchRun, DebitNoteBatchRunItem
+from app.services.batch_runs import claim_batch_run, run_batch
+from app.services.export_jobs import claim_export_job
+
+TABLES = ("debit_note_exports", "debit_note_batch_runs", "debit_note_batch_run_items", "clients", "shipments")
+
+
+def test_export_job_claim_reclaims_stale_generating(sqlite_db):
+    async def scenario(db: AsyncSession):
+        stale = datetime.utcnow() - timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS + 60)
+        jobs = {
+            "pending": DebitNoteExport(debit_note_id=1, file_name="p", export_status="PENDING"),
+            "fresh": DebitNoteExport(debit_note_id=1, file_name="f", export_status="GENERATING",
+                                     claimed_at=datetime.utcnow()),
+            "stale": DebitNoteExport(debit_note_id=1, file_name="s", export_status="GENERATING", claimed_at=stale),
+            "legacy": DebitNoteExport(debit_note_id=1, file_name="l", export_status="GENERATING"),
+            "completed": DebitNoteExport(debit_note_id=1, file_name="c", export_status="COMPLETED"),
+        }
+        db.add_all(jobs.values())
+        await db.commit()
+
+        claimed = {name: await claim_export_job(db, job.export_id) for name, job in jobs.items()}
+        await db.commit()
+        # 방금 선점한 작업은 다시 선점되지 않음 (중복 전달)
+        again = await claim_export_job(db, jobs["stale"].export_id)
+        await db.refresh(jobs["stale"])
+        return claimed, again, jobs["stale"]
+
+    claimed, again, stale = sqlite_db.run(scenario)
+    assert claimed == {"pending": True, "fresh": False, "stale": True, "legacy": True, "completed": False}
+    assert again is False
+    assert stale.export_status == "GENERATING"
+    assert stale.claimed_at > datetime.utcnow() - timedelta(minutes=1)
+
+
+def _batch_run(status: str, heartbeat_at=None, **counts) -> DebitNoteBatchRun:
+    return DebitNoteBatchRun(
+        period_from=date(2027, 10, 1), period_to=date(2027, 10, 28), sheet_type="ALL", exchange_rate=26446,
+        status=status, heartbeat_at=heartbeat_at, started_at=heartbeat_at, total_clients=0, processed_clients=0,
+        created_count=0, skipped_count=0, failed_count=0, **counts,
+    )
+
+
+def test_batch_run_claim_reclaims_stale_running(sqlite_db):
+    async def scenario(db: AsyncSession):
+        stale = datetime.utcnow() - timedelta(seconds=settings.BATCH_RUN_STALE_SECONDS + 60)
+        runs = {
+            "pending": _batch_run("PENDING"),
+            "fresh": _batch_run("RUNNING", datetime.utcnow()),
+            "stale": _batch_run("RUNNING", stale),
+            "completed": _batch_run("COMPLETED", stale),
+        }
+        db.add_all(runs.values())
+        await db.commit()
+        claimed = {name: await claim_batch_run(db, run.run_id) for name, run in runs.items()}
+        await db.commit()
+        await db.refresh(runs["stale"])
+        return claimed, runs["stale"], stale
+
+    claimed, run, stale = sqlite_db.run(scenario)
+    assert claimed == {"pending": True, "fresh": False, "stale": True, "completed": False}
+    assert run.started_at == stale  # 최초 시작 시각 유지
+    assert run.heartbeat_at > stale
+
+
+def test_batch_run_resumes_pending_items_and_records_every_item(sqlite_db):
+    """중단된 실행 재선점 → 이미 기록된 항목은 그대로, 남은 PENDING 항목은 모두 CREATED/SKIPPED/FAILED 로 기록"""
+    async def scenario(db: AsyncSession):
+        quiet, done = Client(client_code="QUIET", client_name="Quiet"), Client(client_code="DONE", client_name="Done")
+        db.add_all([quiet, done])
+        stale = datetime.utcnow() - timedelta(seconds=settings.BATCH_RUN_STALE_SECONDS + 60)
+        run = _batch_run("RUNNING", stale)
+        run.total_clients, run.processed_clients, run.skipped_count = 3, 1, 1
+        db.add(run)
+        await db.flush()
+        db.add_all([
+            DebitNoteBatchRunItem(run_id=run.run_id, client_id=done.client_id, status="SKIPPED"),
+            DebitNoteBatchRunItem(run_id=run.run_id, client_id=quiet.client_id, status="PENDING"),
+            DebitNoteBatchRunItem(run_id=run.run_id, client_id=999999, status="PENDING"),  # 삭제된 거래처
+        ])
+        await db.commit()
+
+        status = await run_batch(run.run_id, sqlite_db.session_factory)
+        await db.refresh(run)
+        items = {
+            item.client_id: item
+            for item in (await db.execute(
+                DebitNoteBatchRunItem.__table__.select().where(DebitNoteBatchRunItem.run_id == run.run_id)
+            )).all()
+        }
+        return status, run, items, quiet.client_id, done.client_id
+
+    status, run, items, quiet_id, done_id = sqlite_db.run(scenario)
+    assert status == "COMPLETED"
+    assert (run.processed_clients, run.created_count, run.skipped_count, run.failed_count) == (3, 0, 2, 1)
+    assert items[done_id].finished_at is None  # 재선점 전에 기록된 항목은 다시 처리하지 않음
+    assert items[quiet_id].status == "SKIPPED"
+    assert (items[999999].status, items[999999].error) == ("FAILED", "Client not found")
@@ -0,0 +1,102 @@
+"""비용 수정 ↔ DN 생성 동시 실행 단위 테스트 (서버 불필요, SQLite - conftest.sqlite_db)
+
+SQLite 는 FOR UPDATE 를 무시하므로 실행 SQL 을 PostgreSQL 방언으로 컴파일해 잠금 순서를 확인하고,
+생성이 커밋된 뒤의 비용 수정이 새 DRAFT 라인을 재계산하는지 확인한다.
+"""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.debit_note_builder as debit_note_builder
+import app.services.line_calculator as line_calculator
+from app.api.shipments import _lock_fee_lines, update_fee_detail
+from app.models.client import Client
+from app.models.debit_note import DebitNote, DebitNoteLine
+from app.models.fee import FeeCategory, FeeItem
+from app.models.shipment import Shipment, ShipmentFeeDetail
+from app.schemas.debit_note import DebitNoteCreate
+from app.schemas.shipment import FeeDetailUpdate
+from app.services.reference_data import ReferenceDataCache
+
+TABLES = (
+    "fee_categories", "fee_items", "clients", "shipments", "shipment_fee_details",
+    "debit_notes", "debit_note_lines", "debit_note_workflows", "reference_data_versions",
+)
+
+
+async def _seed(db: AsyncSession):
+    category = FeeCategory(category_code="FREIGHT", category_name="Freight", sort_order=1)
+    client = Client(client_code="LOCK", client_name="Lock test")
+    db.add_all([category, client])
+    await db.flush()
+    fee_item = FeeItem(category_id=category.category_id, item_code="OCEAN_FREIGHT", item_name="Ocean")
+    shipment = Shipment(client_id=client.client_id, delivery_date=date(2027, 11, 3), status="ACTIVE")
+    db.add_all([fee_item, shipment])
+    await db.flush()
+    db.add(ShipmentFeeDetail(shipment_id=shipment.shipment_id, fee_item_id=fee_item.fee_item_id,
+                             amount_usd=Decimal("100")))
+    await db.commit()
+
+
+def _record_sql(db: AsyncSession, statements: list[str]):
+    """세션의 ORM 실행 SQL (PostgreSQL 방언)"""
+    event.listen(db.sync_session, "do_orm_execute",
+                 lambda state: statements.append(str(state.statement.compile(dialect=postgresql.dialect()))))
+
+
+def _is_shipment_lock(sql: str) -> bool:
+    return "FROM shipments" in sql and "FOR UPDATE" in sql
+
+
+def test_fee_edit_during_build_waits_for_shipment_lock(sqlite_db, monkeypatch):
+    """생성 중(비용 읽은 뒤 ~ 커밋 전) 비용 수정: 양쪽 모두 선적 행을 먼저 잠그고, 커밋 후 수정은 새 라인을 재계산"""
+    monkeypatch.setattr(line_calculator, "reference_cache", ReferenceDataCache())
+    build_sql, edit_sql = [], []
+    load_fee_rows = debit_note_builder.load_fee_rows
+
+    async def scenario(db: AsyncSession):
+        _record_sql(db, build_sql)
+        client = (await db.execute(select(Client))).scalar_one()
+        shipment_id = (await db.execute(select(Shipment.shipment_id))).scalar_one()
+
+        async def fee_rows_then_edit(session, shipment_ids):
+            rows = await load_fee_rows(session, shipment_ids)
+            # 생성 중인 DN 의 비용을 읽은 직후 다른 요청이 같은 선적의 비용을 고치려 함
+            async with sqlite_db.session_factory() as other:
+                _record_sql(other, edit_sql)
+                await _lock_fee_lines(other, shipment_id)
+                await other.rollback()
+            return rows
+
+        monkeypatch.setattr(debit_note_builder, "load_fee_rows", fee_rows_then_edit)
+        data = DebitNoteCreate(client_id=client.client_id, period_from=date(2027, 11, 1),
+                               period_to=date(2027, 11, 30), exchange_rate=Decimal("25000"))
+        debit_note = await debit_note_builder.build_debit_note(db, data, client, created_by=1)
+        await db.commit()
+
+        # 생성 커밋 후 비용 수정 → 새 DRAFT 라인 재계산
+        detail_id = (await db.execute(select(ShipmentFeeDetail.detail_id))).scalar_one()
+        async with sqlite_db.session_factory() as other:
+            response = await update_fee_detail(
+                shipment_id, detail_id, FeeDetailUpdate(amount_usd=Decimal("150")), db=other, current_user=None,
+            )
+        line = (await db.execute(
+            DebitNoteLine.__table__.select().where(DebitNoteLine.shipment_id == shipment_id)
+        )).one()
+        note = (await db.execute(
+            DebitNote.__table__.select().where(DebitNote.debit_note_id == debit_note.debit_note_id)
+        )).one()
+        return response, line, note
+
+    response, line, note = sqlite_db.run(scenario, seed=_seed)
+
+    fee_read = next(i for i, sql in enumerate(build_sql) if "FROM shipment_fee_details" in sql)
+    assert any(_is_shipment_lock(sql) for sql in build_sql[:fee_read])  # 생성: 비용을 읽기 전에 선적 잠금
+    assert _is_shipment_lock(edit_sql[0])  # 수정: 라인보다 먼저 선적 잠금 → 생성 커밋까지 대기
+
+    assert [r.line_id for r in response.recalculated] == [line.line_id]
+    assert line.total_usd == Decimal("150")
+    assert note.total_usd == Decimal("150")
@@ -33,7 +33,7 @@ const DebitNotesPage: React.FC = () => {
     setLoading(true);
     try {
       const [dnRes, cRes] = await Promise.all([
-        api.get('/api/v1/debit-notes?limit=100'),
+        api.get('/api/v1/debit-notes?limit=100&view=summary'),
         api.get('/api/v1/clients?limit=200'),
       ]);
       setDebitNotes(dnRes.data.items);
@@ -252,9 +252,9 @@ const DebitNotesPage: React.FC = () => {
               </Descriptions.Item>
             </Descriptions>
 
-            <Divider>라인 항목 ({selectedDN.lines.length}건)</Divider>
+            <Divider>라인 항목 ({selectedDN.total_lines}건)</Divider>
             <Table
-              dataSource={selectedDN.lines}
+              dataSource={selectedDN.lines ?? []}
               rowKey="line_id"
               size="small"
               pagination={false}
@@ -6,9 +6,11 @@ import {
 import { PlusOutlined, WarningOutlined } from '@ant-design/icons';
 import dayjs from 'dayjs';
 import api from '../services/api';
-import type { Shipment, Client, FeeItem } from '../types';
+import type { Shipment, Client, FeeItem, PaginatedResponse } from '../types';
 
-const { Title } = Typography;
+const { Title, Text } = Typography;
+
+const PAGE_SIZE = 50;
 
 const ShipmentsPage: React.FC = () => {
   const [shipments, setShipments] = useState<Shipment[]>([]);
@@ -17,28 +19,56 @@ const ShipmentsPage: React.FC = () => {
   const [loading, setLoading] = useState(true);
   const [modalOpen, setModalOpen] = useState(false);
   const [clientFilter, setClientFilter] = useState<number | undefined>();
+  // keyset 페이지네이션: cursors[i] = i 페이지 조회 cursor (0 페이지는 undefined)
+  const [cursors, setCursors] = useState<(string | undefined)[]>([undefined]);
+  const [page, setPage] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState<number | null>(null);
   const [form] = Form.useForm();
 
-  const fetchData = async () => {
+  const fetchShipments = async (pageIndex: number, pageCursors: (string | undefined)[]) => {
     setLoading(true);
     try {
-      const params = clientFilter ? `?client_id=${clientFilter}&limit=100` : '?limit=100';
-      const [sRes, cRes, fRes] = await Promise.all([
-        api.get(`/api/v1/shipments${params}`),
+      const params = new URLSearchParams({ limit: String(PAGE_SIZE), count: 'estimated' });
+      if (clientFilter) params.set('client_id', String(clientFilter));
+      const cursor = pageCursors[pageIndex];
+      if (cursor) params.set('cursor', cursor);
+      const res = await api.get<PaginatedResponse<Shipment>>(`/api/v1/shipments?${params}`);
+      setShipments(res.data.items);
+      setNextCursor(res.data.next_cursor ?? null);
+      setTotal(res.data.total);
+      setCursors(pageCursors);
+      setPage(pageIndex);
+    } catch (err: any) {
+      message.error(err.response?.data?.detail || '데이터 조회 실패');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const fetchData = async () => {
+    try {
+      const [cRes, fRes] = await Promise.all([
         api.get('/api/v1/clients?limit=200'),
         api.get('/api/v1/fee-items'),
       ]);
-      setShipments(sRes.data.items);
       setClients(cRes.data.items);
       setFeeItems(Array.isArray(fRes.data) ? fRes.data : fRes.data.items);
     } catch (err: any) {
       message.error(err.response?.data?.detail || '데이터 조회 실패');
-    } finally {
-      setLoading(false);
     }
   };
 
-  useEffect(() => { fetchData(); }, [clientFilter]);
+  useEffect(() => { fetchData(); }, []);
+  useEffect(() => { fetchShipments(0, [undefined]); }, [clientFilter]);
+
+  const goNext = () => {
+    if (!nextCursor) return;
+    fetchShipments(page + 1, [...cursors.slice(0, page + 1), nextCursor]);
+  };
+  const goPrev = () => {
+    if (page > 0) fetchShipments(page - 1, cursors);
+  };
 
   const handleCreate = async () => {
     try {
@@ -58,7 +88,7 @@ const ShipmentsPage: React.FC = () => {
       }
       setModalOpen(false);
       form.resetFields();
-      fetchData();
+      fetchShipments(0, [undefined]);
     } catch (err: any) {
       message.error(err.response?.data?.detail || '등록 실패');
     }
@@ -114,8 +144,14 @@ const ShipmentsPage: React.FC = () => {
           loading={loading}
           size="small"
           scroll={{ x: 950 }}
-          pagination={{ pageSize: 20 }}
+          pagination={false}
         />
+        <Space style={{ width: '100%', justifyContent: 'flex-end', marginTop: 12 }}>
+          {total !== null && <Text type="secondary">약 {total.toLocaleString()}건</Text>}
+          <Button size="small" disabled={page === 0 || loading} onClick={goPrev}>이전</Button>
+          <Text>{page + 1} 페이지</Text>
+          <Button size="small" disabled={!nextCursor || loading} onClick={goNext}>다음</Button>
+        </Space>
       </Card>
 
       <Modal
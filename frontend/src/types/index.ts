@@ -112,7 +112,7 @@ export interface DebitNote {
   notes?: string;
   created_at: string;
   updated_at: string;
-  lines: DebitNoteLine[];
+  lines: DebitNoteLine[] | null;  // 목록 view=summary 이면 null
 }
 
 export interface WorkflowEntry {
@@ -156,6 +156,7 @@ export interface FeeItem {
 }
 
 export interface PaginatedResponse<T> {
-  total: number;
+  total: number | null;  // count=none 이면 null, count=estimated 이면 추정값
   items: T[];
+  next_cursor?: string | null;
 }